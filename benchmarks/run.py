@@ -0,0 +1,293 @@
+"""Benchmarks of decoding, sensor state and polling against simulated devices.
+
+Run from the repository root without pytest, results are printed as JSON:
+
+    .venv/bin/python -m benchmarks.run --output bench.json
+"""
+
+import json
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from asyncio import gather, get_running_loop, run, sleep
+from contextlib import ExitStack
+from statistics import quantiles
+from threading import get_ident
+from time import monotonic, perf_counter
+from unittest.mock import MagicMock, patch
+
+# isort: off
+# Platform modules are stubbed like in the tests, the coordinator is the real one
+import tests.platform_stubs  # noqa: F401
+from tests.helpers import make_scanner_device
+from tests.simulator import Faults, SimulatedDevice
+
+from homeassistant.helpers import frame
+
+from custom_components.vivosun_thermo.aggregation import RollingWindow
+from custom_components.vivosun_thermo.const import (
+    ACQUISITION_MODE_POLL,
+    CONF_ACQUISITION_MODE,
+    DATA_SCHEDULER,
+    DOMAIN,
+    ROLLING_CAPACITY,
+    ROLLING_WINDOW,
+)
+from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
+from custom_components.vivosun_thermo.metrics import calculate_metrics, calculate_metrics_batch
+from custom_components.vivosun_thermo.protocol import calculate_vpd, decode_frames
+from custom_components.vivosun_thermo.scheduler import VivosunThermoConnectionScheduler
+from custom_components.vivosun_thermo.sensor import VivosunThermoSensor
+
+# isort: on
+
+_COORDINATOR = "custom_components.vivosun_thermo.coordinator"
+_POLL = {CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL}
+
+
+def measure(func, iterations):
+    """Run func repeatedly, returns operations per second and mean time in microseconds."""
+    started = perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = perf_counter() - started
+    return {
+        "iterations": iterations,
+        "ops_per_second": iterations / elapsed,
+        "mean_us": elapsed / iterations * 1e6,
+    }
+
+
+def percentiles(samples):
+    """Latency summary in milliseconds."""
+    if len(samples) < 2:
+        samples = samples * 2 or [0.0, 0.0]
+    cuts = quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50_ms": cuts[49] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+def last_service_info(hass, address, connectable=True):
+    """Simulated devices are always heard."""
+    return MagicMock(time=monotonic(), rssi=-60)
+
+
+def make_hass(spacing):
+    """Mock Home Assistant instance with a shared scheduler."""
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {DATA_SCHEDULER: VivosunThermoConnectionScheduler(connect_spacing=spacing)}
+    }
+    hass.async_create_task.side_effect = lambda coro: coro.close()
+    # Coordinators report their usage through the frame helper, from the loop thread
+    hass.loop_thread_id = get_ident()
+    frame.async_setup(hass)
+    return hass
+
+
+def make_entry_data(index):
+    """Config entry data of a simulated device."""
+    return {
+        "name": f"Device {index}",
+        "discovery_name": "ThermoBeacon2",
+        "discovery_address": f"AA:BB:CC:{index >> 16 & 0xFF:02X}:{index >> 8 & 0xFF:02X}:{index & 0xFF:02X}",
+    }
+
+
+def bench_decode(iterations):
+    """Single frame decoding against batch decoding of the same frames."""
+    frame = SimulatedDevice(clock=lambda: 0.0).status_frame()
+    buffer = bytes(frame) * iterations
+    batch_started = perf_counter()
+    decode_frames(buffer)
+    batch_elapsed = perf_counter() - batch_started
+    return {
+        "single": measure(
+            lambda: VivosunThermoSensorCoordinator._decode_raw_data(frame), iterations
+        ),
+        "batch": {
+            "iterations": iterations,
+            "ops_per_second": iterations / batch_elapsed,
+            "mean_us": batch_elapsed / iterations * 1e6,
+        },
+    }
+
+
+def bench_vpd(iterations):
+    """VPD alone against all derived metrics."""
+    frames = decode_frames(bytes(SimulatedDevice(clock=lambda: 0.0).status_frame()) * iterations)
+    batch_started = perf_counter()
+    calculate_metrics_batch(frames["temperature_c"], frames["humidity"], -2.0)
+    batch_elapsed = perf_counter() - batch_started
+    return {
+        "vpd": measure(lambda: calculate_vpd(22.5, 65.0), iterations),
+        "metrics": measure(lambda: calculate_metrics(22.5, 65.0, -2.0), iterations),
+        "metrics_batch": {
+            "iterations": iterations,
+            "ops_per_second": iterations / batch_elapsed,
+            "mean_us": batch_elapsed / iterations * 1e6,
+        },
+    }
+
+
+def bench_native_value(iterations):
+    """Entity state lookup as done on every state write."""
+    coordinator = VivosunThermoSensorCoordinator(make_hass(0), make_entry_data(0), _POLL)
+    coordinator.data = {
+        "main": {"temperature_c": 22.5, "humidity": 65.0, "vpd": 0.95},
+        "external": None,
+    }
+    sensor = VivosunThermoSensor(coordinator, "main", "temperature_c", MagicMock())
+    return measure(lambda: sensor.native_value, iterations)
+
+
+def bench_rolling(iterations):
+    """Rolling statistics update and lookup per sample, in a window that is always full."""
+    window = RollingWindow(
+        ["temperature_c", "humidity"], ROLLING_WINDOW.total_seconds(), ROLLING_CAPACITY
+    )
+    clock = iter(range(0, iterations * 10, 5))
+
+    def add_sample():
+        now = next(clock)
+        window.add(now, {"temperature_c": 20.0 + now % 7, "humidity": 50.0 + now % 11})
+        for statistic in ("min", "max", "mean", "trend"):
+            window.statistic("temperature_c", statistic)
+
+    return {**measure(add_sample, iterations), "bytes_per_probe": window.nbytes}
+
+
+async def bench_cycle(iterations):
+    """Full poll cycle through scheduler, connector and simulated device."""
+    device = SimulatedDevice()
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch(
+                "bleak_retry_connector.establish_connection",
+                side_effect=device.establish_connection,
+            )
+        )
+        scanner_device = make_scanner_device()
+        stack.enter_context(
+            patch(f"{_COORDINATOR}.async_scanner_devices_by_address", return_value=[scanner_device])
+        )
+        stack.enter_context(
+            patch(f"{_COORDINATOR}.async_last_service_info", side_effect=last_service_info)
+        )
+        coordinator = VivosunThermoSensorCoordinator(make_hass(0), make_entry_data(0), _POLL)
+        samples = []
+        for _ in range(iterations):
+            started = perf_counter()
+            await coordinator._read_sensor_data()
+            samples.append(perf_counter() - started)
+    return {"iterations": iterations, **percentiles(samples)}
+
+
+async def bench_scale(devices, sources, rounds, latency, spacing):
+    """Many devices polled at once through a few proxies, loop lag and memory per device."""
+    simulated = {}
+    scanners = [make_scanner_device(source=f"proxy-{index}") for index in range(sources)]
+
+    async def establish_connection(client_class, device, name, **kwargs):
+        return await simulated[name].establish_connection(client_class, device, name, **kwargs)
+
+    def scanner_devices(hass, address, connectable=True):
+        return [scanners[int(address.replace(":", ""), 16) % sources]]
+
+    lags = []
+    running = True
+
+    async def monitor_loop_lag():
+        loop = get_running_loop()
+        while running:
+            expected = loop.time() + 0.01
+            await sleep(0.01)
+            lags.append(max(loop.time() - expected, 0.0))
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch("bleak_retry_connector.establish_connection", side_effect=establish_connection)
+        )
+        stack.enter_context(
+            patch(f"{_COORDINATOR}.async_scanner_devices_by_address", side_effect=scanner_devices)
+        )
+        stack.enter_context(
+            patch(f"{_COORDINATOR}.async_last_service_info", side_effect=last_service_info)
+        )
+        hass = make_hass(spacing)
+
+        entries = [make_entry_data(index) for index in range(devices)]
+        for index, data in enumerate(entries):
+            simulated[data["name"]] = SimulatedDevice(
+                seed=index, faults=Faults(latency=latency, connect_latency=latency)
+            )
+
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+        coordinators = [VivosunThermoSensorCoordinator(hass, data, _POLL) for data in entries]
+        allocated = tracemalloc.take_snapshot().compare_to(baseline, "filename")
+        tracemalloc.stop()
+        memory = sum(stat.size_diff for stat in allocated)
+
+        async def timed_read(coordinator):
+            started = perf_counter()
+            await coordinator._read_sensor_data()
+            return perf_counter() - started
+
+        monitor = get_running_loop().create_task(monitor_loop_lag())
+        samples = []
+        started = perf_counter()
+        for _ in range(rounds):
+            samples.extend(await gather(*(timed_read(coordinator) for coordinator in coordinators)))
+        elapsed = perf_counter() - started
+        running = False
+        await monitor
+
+    return {
+        "devices": devices,
+        "sources": sources,
+        "rounds": rounds,
+        "elapsed_s": elapsed,
+        "cycle": percentiles(samples),
+        "loop_lag": percentiles(lags),
+        "memory_per_device_bytes": memory / devices,
+    }
+
+
+async def main(args):
+    """Run all benchmarks."""
+    return {
+        "python": sys.version,
+        "decode": bench_decode(args.iterations),
+        "vpd": bench_vpd(args.iterations),
+        "native_value": bench_native_value(args.iterations),
+        "rolling": bench_rolling(args.iterations),
+        "cycle": await bench_cycle(args.cycles),
+        "scale": await bench_scale(
+            args.devices, args.sources, args.rounds, args.latency, args.spacing
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--sources", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.005, help="simulated radio latency, s")
+    parser.add_argument("--spacing", type=float, default=0.0, help="connect spacing per source, s")
+    parser.add_argument("--output", help="write results to file instead of stdout")
+    args = parser.parse_args()
+
+    results = run(main(args))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
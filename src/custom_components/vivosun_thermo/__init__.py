@@ -1,25 +1,54 @@
-from typing import cast
+from typing import TYPE_CHECKING, cast
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+# Heavy Home Assistant and BLE modules are imported on setup, so protocol and metrics code
+# can be imported on its own, e.g. by tools and benchmarks
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN, ConfigEntryData
-from .coordinator import VivosunThermoSensorCoordinator
 
+async def async_setup_entry(hass: "HomeAssistant", entry: "ConfigEntry") -> bool:
+    from homeassistant.const import Platform
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    coordinator = VivosunThermoSensorCoordinator(hass, cast(ConfigEntryData, entry.data))
-    await coordinator.async_config_entry_first_refresh()
+    from .const import DOMAIN, ConfigEntryData
+    from .coordinator import VivosunThermoSensorCoordinator
+    from .history import async_get_history_store
+    from .scheduler import async_get_scheduler
+
+    coordinator = VivosunThermoSensorCoordinator(
+        hass,
+        cast(ConfigEntryData, entry.data),
+        entry.options,
+        async_get_scheduler(hass),
+        await async_get_history_store(hass),
+    )
+    # Entities start from restored state, so a slow or unreachable device doesn't hold up startup
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.title}"
+    )
+    entry.async_on_unload(coordinator.async_start())
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, [Platform.SENSOR])
     return True
 
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+async def _async_update_options(hass: "HomeAssistant", entry: "ConfigEntry") -> None:
+    from .const import DOMAIN
+
+    # Applied to the running coordinator, a reload would drop the connection and readings
+    await hass.data[DOMAIN][entry.entry_id].async_update_options(entry.options)
+
+
+async def async_unload_entry(hass: "HomeAssistant", entry: "ConfigEntry") -> bool:
+    from homeassistant.const import Platform
+
+    from .const import DATA_HISTORY, DATA_SCHEDULER, DOMAIN
+
     unloaded = await hass.config_entries.async_unload_platforms(entry, [Platform.SENSOR])
     if unloaded:
         del hass.data[DOMAIN][entry.entry_id]
-        if not hass.data[DOMAIN]:
+        # Shared scheduler and history cursors go away with the last entry
+        if hass.data[DOMAIN].keys() <= {DATA_SCHEDULER, DATA_HISTORY}:
             del hass.data[DOMAIN]
     return unloaded
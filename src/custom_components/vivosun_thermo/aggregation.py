@@ -0,0 +1,163 @@
+from array import array
+from collections import deque
+from collections.abc import Iterable, Mapping
+from math import isnan, nan
+from typing import Any, Final
+
+# Samples kept per window, older samples are overwritten when a window collects more
+WINDOW_CAPACITY: Final = 256
+
+# Indexes into the running sums of a rolling window key, times are relative to the origin
+_COUNT, _SUM_T, _SUM_V, _SUM_TT, _SUM_TV = range(5)
+
+
+# Fixed-size columns of recent samples, one float array per value key
+class SampleWindow:
+    def __init__(self, keys: Iterable[str], capacity: int = WINDOW_CAPACITY):
+        self.capacity = capacity
+        self._columns = {key: array("d", bytes(8 * capacity)) for key in keys}
+        self._count = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, values: Mapping[str, Any] | None) -> None:
+        # Missing values are stored as nan and left out of aggregates
+        for key, column in self._columns.items():
+            value = values.get(key) if values is not None else None
+            column[self._next] = nan if value is None else value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def clear(self) -> None:
+        self._count = 0
+        self._next = 0
+
+    def aggregate(self, statistic: str) -> dict[str, float | None]:
+        return {key: self._aggregate(column, statistic) for key, column in self._columns.items()}
+
+    def _aggregate(self, column: array[float], statistic: str) -> float | None:
+        if statistic == "last":
+            # Last sample wins even when it is missing, e.g. a disconnected probe
+            last = column[(self._next - 1) % self.capacity] if self._count else nan
+            return None if isnan(last) else last
+        # Filled from the start after clear, so the first count slots hold the window
+        values = [value for value in column[: self._count] if not isnan(value)]
+        if not values:
+            return None
+        if statistic == "min":
+            return min(values)
+        if statistic == "max":
+            return max(values)
+        return sum(values) / len(values)
+
+
+# Samples of the last duration seconds in fixed-size ring buffers with statistics maintained
+# incrementally: running sums give mean and least squares trend, monotonic queues of sample
+# numbers give min and max, so adding a sample and reading a statistic are O(1) amortized
+class RollingWindow:
+    def __init__(self, keys: Iterable[str], duration: float, capacity: int):
+        self.duration = duration
+        self.capacity = capacity
+        # Faster samples would push older ones out before they leave the window
+        self.spacing = duration / capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._columns = {key: array("d", bytes(8 * capacity)) for key in keys}
+        self._sums = {key: array("d", bytes(8 * 5)) for key in self._columns}
+        self._minimums: dict[str, deque[int]] = {key: deque() for key in self._columns}
+        self._maximums: dict[str, deque[int]] = {key: deque() for key in self._columns}
+        self._origin = 0.0
+        self._first = 0  # number of the oldest sample
+        self._next = 0  # number of the next sample
+
+    def __len__(self) -> int:
+        return self._next - self._first
+
+    @property
+    def nbytes(self) -> int:
+        # Memory of the sample buffers, fixed by the capacity
+        buffers = [self._times, *self._columns.values(), *self._sums.values()]
+        return sum(buffer.itemsize * len(buffer) for buffer in buffers)
+
+    def add(self, now: float, values: Mapping[str, Any]) -> bool:
+        # Returns whether the sample was kept
+        if len(self) and now - self._times[(self._next - 1) % self.capacity] < self.spacing:
+            return False
+        while len(self) and (
+            len(self) == self.capacity
+            or now - self._times[self._first % self.capacity] > self.duration
+        ):
+            self._evict()
+        if not len(self) or now - self._origin > 2 * self.duration:
+            # Keeps relative times small, so sums of squares don't lose precision
+            self._rebase(now)
+
+        slot = self._next % self.capacity
+        self._times[slot] = now
+        for key, column in self._columns.items():
+            value = values.get(key)
+            column[slot] = nan if value is None else value
+            if value is not None:
+                self._accumulate(key, now - self._origin, value, 1)
+                self._push(self._minimums[key], column, value, 1)
+                self._push(self._maximums[key], column, value, -1)
+        self._next += 1
+        return True
+
+    def statistic(self, key: str, statistic: str) -> float | None:
+        sums = self._sums[key]
+        count = sums[_COUNT]
+        if not count:
+            return None
+        if statistic == "min":
+            return self._columns[key][self._minimums[key][0] % self.capacity]
+        if statistic == "max":
+            return self._columns[key][self._maximums[key][0] % self.capacity]
+        if statistic == "trend":
+            # Least squares slope in units per hour
+            spread = count * sums[_SUM_TT] - sums[_SUM_T] ** 2
+            if count < 2 or spread <= 0:
+                return None
+            return (count * sums[_SUM_TV] - sums[_SUM_T] * sums[_SUM_V]) / spread * 3600
+        return sums[_SUM_V] / count
+
+    def _push(self, queue: deque[int], column: array[float], value: float, sign: int) -> None:
+        # Older samples that can't be the extreme while the new one is in the window leave the
+        # queue, so its head is the minimum (sign 1) or maximum (sign -1) of the window
+        while queue and sign * column[queue[-1] % self.capacity] >= sign * value:
+            queue.pop()
+        queue.append(self._next)
+
+    def _evict(self) -> None:
+        slot = self._first % self.capacity
+        time = self._times[slot] - self._origin
+        for key, column in self._columns.items():
+            value = column[slot]
+            if isnan(value):
+                continue
+            self._accumulate(key, time, value, -1)
+            for queue in (self._minimums[key], self._maximums[key]):
+                if queue and queue[0] == self._first:
+                    queue.popleft()
+        self._first += 1
+
+    def _accumulate(self, key: str, time: float, value: float, sign: int) -> None:
+        sums = self._sums[key]
+        sums[_COUNT] += sign
+        sums[_SUM_T] += sign * time
+        sums[_SUM_V] += sign * value
+        sums[_SUM_TT] += sign * time * time
+        sums[_SUM_TV] += sign * time * value
+
+    def _rebase(self, now: float) -> None:
+        # Runs about once per duration, recomputing the sums also drops accumulated rounding
+        self._origin = now
+        for key, column in self._columns.items():
+            sums = self._sums[key]
+            for index in range(len(sums)):
+                sums[index] = 0.0
+            for number in range(self._first, self._next):
+                slot = number % self.capacity
+                if not isnan(column[slot]):
+                    self._accumulate(key, self._times[slot] - self._origin, column[slot], 1)
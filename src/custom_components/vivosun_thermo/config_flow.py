@@ -1,11 +1,40 @@
 from logging import getLogger
+from typing import TYPE_CHECKING, cast
 
 import voluptuous as vol
-from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
 from homeassistant.const import ATTR_NAME
-
-from .const import DEVICE_TYPES, DOMAIN, ConfigEntryData
+from homeassistant.core import callback
+
+from .const import (
+    ACQUISITION_MODE_PASSIVE,
+    ACQUISITION_MODE_PERSISTENT,
+    ACQUISITION_MODE_POLL,
+    CONF_ACQUISITION_MODE,
+    CONF_CONNECT_ATTEMPTS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_LEAF_TEMPERATURE_OFFSET,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PRESENCE_WINDOW,
+    CONF_PUBLISH_STATISTIC,
+    CONF_PUBLISH_WINDOW,
+    CONF_READ_TIMEOUT,
+    CONF_STATE_DEADBAND,
+    CONF_STATE_HEARTBEAT,
+    DEFAULT_OPTIONS,
+    DEVICE_TYPES,
+    DOMAIN,
+    PUBLISH_STATISTIC_LAST,
+    PUBLISH_STATISTIC_MAX,
+    PUBLISH_STATISTIC_MEAN,
+    PUBLISH_STATISTIC_MIN,
+    ConfigEntryData,
+    ConfigEntryOptions,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
 
 _LOGGER = getLogger(__name__)
 
@@ -18,8 +47,13 @@ class VivosunThermoConfigFlow(ConfigFlow, domain=DOMAIN):
         self.discovery_name: str
         self.discovery_address: str
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        return VivosunThermoOptionsFlow()
+
     async def async_step_bluetooth(
-        self, discovery_info: BluetoothServiceInfoBleak
+        self, discovery_info: "BluetoothServiceInfoBleak"
     ) -> ConfigFlowResult:
         _LOGGER.debug(f"Discovered {discovery_info.name} with address {discovery_info.address}")
 
@@ -67,3 +101,79 @@ class VivosunThermoConfigFlow(ConfigFlow, domain=DOMAIN):
             step_id="confirm",
             data_schema=vol.Schema({vol.Optional(ATTR_NAME, default=self.name): str}),
         )
+
+
+class VivosunThermoOptionsFlow(OptionsFlow):
+    async def async_step_init(self, user_input=None) -> ConfigFlowResult:
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors[CONF_MAX_SCAN_INTERVAL] = "max_below_min"
+            else:
+                # The running coordinator picks the new options up without a reload
+                return self.async_create_entry(data={**self.config_entry.options, **user_input})
+
+        # Rejected input is shown again for correction
+        options = cast(
+            ConfigEntryOptions,
+            {**DEFAULT_OPTIONS, **self.config_entry.options, **(user_input or {})},
+        )
+        return self.async_show_form(
+            step_id="init",
+            errors=errors,
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_ACQUISITION_MODE, default=options[CONF_ACQUISITION_MODE]
+                    ): vol.In(
+                        [
+                            ACQUISITION_MODE_PASSIVE,
+                            ACQUISITION_MODE_POLL,
+                            ACQUISITION_MODE_PERSISTENT,
+                        ]
+                    ),
+                    vol.Required(
+                        CONF_MIN_SCAN_INTERVAL, default=options[CONF_MIN_SCAN_INTERVAL]
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                    vol.Required(
+                        CONF_MAX_SCAN_INTERVAL, default=options[CONF_MAX_SCAN_INTERVAL]
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                    vol.Required(CONF_READ_TIMEOUT, default=options[CONF_READ_TIMEOUT]): vol.All(
+                        vol.Coerce(float), vol.Range(min=0.1, max=60)
+                    ),
+                    vol.Required(
+                        CONF_CONNECT_TIMEOUT, default=options[CONF_CONNECT_TIMEOUT]
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1, max=300)),
+                    vol.Required(
+                        CONF_CONNECT_ATTEMPTS, default=options[CONF_CONNECT_ATTEMPTS]
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                    vol.Required(
+                        CONF_PRESENCE_WINDOW, default=options[CONF_PRESENCE_WINDOW]
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_PUBLISH_WINDOW, default=options[CONF_PUBLISH_WINDOW]
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_PUBLISH_STATISTIC, default=options[CONF_PUBLISH_STATISTIC]
+                    ): vol.In(
+                        [
+                            PUBLISH_STATISTIC_MEAN,
+                            PUBLISH_STATISTIC_MIN,
+                            PUBLISH_STATISTIC_MAX,
+                            PUBLISH_STATISTIC_LAST,
+                        ]
+                    ),
+                    vol.Required(
+                        CONF_STATE_DEADBAND, default=options[CONF_STATE_DEADBAND]
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                    vol.Required(
+                        CONF_STATE_HEARTBEAT, default=options[CONF_STATE_HEARTBEAT]
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_LEAF_TEMPERATURE_OFFSET,
+                        default=options[CONF_LEAF_TEMPERATURE_OFFSET],
+                    ): vol.All(vol.Coerce(float), vol.Range(min=-10, max=10)),
+                }
+            ),
+        )
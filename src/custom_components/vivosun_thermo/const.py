@@ -2,10 +2,20 @@ from datetime import timedelta
 from typing import Final, TypedDict
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
-from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTemperature
+from homeassistant.const import (
+    CONCENTRATION_GRAMS_PER_CUBIC_METER,
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 
 DOMAIN: Final = "vivosun_thermo"
 
+DATA_SCHEDULER: Final = "scheduler"
+DATA_HISTORY: Final = "history"
+
 DEVICE_TYPES: Final = {
     "ThermoBeacon2": {
         "name": "VIVOSUN AeroLab THB1S",
@@ -15,6 +25,61 @@ DEVICE_TYPES: Final = {
 }
 
 DEFAULT_SCAN_INTERVAL: Final = timedelta(seconds=60)
+PERSISTENT_SCAN_INTERVAL: Final = timedelta(seconds=10)
+
+CONF_ACQUISITION_MODE: Final = "acquisition_mode"
+CONF_CONNECT_TIMEOUT: Final = "connect_timeout"
+CONF_CONNECT_ATTEMPTS: Final = "connect_attempts"
+CONF_READ_TIMEOUT: Final = "read_timeout"
+CONF_MIN_SCAN_INTERVAL: Final = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL: Final = "max_scan_interval"
+CONF_LEAF_TEMPERATURE_OFFSET: Final = "leaf_temperature_offset"
+CONF_STATE_DEADBAND: Final = "state_deadband"
+CONF_STATE_HEARTBEAT: Final = "state_heartbeat"
+CONF_PUBLISH_WINDOW: Final = "publish_window"
+CONF_PUBLISH_STATISTIC: Final = "publish_statistic"
+CONF_PRESENCE_WINDOW: Final = "presence_window"
+
+ACQUISITION_MODE_PASSIVE: Final = "passive"
+ACQUISITION_MODE_POLL: Final = "poll"
+ACQUISITION_MODE_PERSISTENT: Final = "persistent"
+
+PUBLISH_STATISTIC_MEAN: Final = "mean"
+PUBLISH_STATISTIC_MIN: Final = "min"
+PUBLISH_STATISTIC_MAX: Final = "max"
+PUBLISH_STATISTIC_LAST: Final = "last"
+
+
+class ConfigEntryOptions(TypedDict):
+    acquisition_mode: str
+    connect_timeout: float
+    connect_attempts: int
+    read_timeout: float
+    min_scan_interval: int
+    max_scan_interval: int
+    leaf_temperature_offset: float
+    state_deadband: int
+    state_heartbeat: int
+    publish_window: int
+    publish_statistic: str
+    presence_window: int
+
+
+DEFAULT_OPTIONS: Final[ConfigEntryOptions] = {
+    CONF_ACQUISITION_MODE: ACQUISITION_MODE_PASSIVE,
+    CONF_CONNECT_TIMEOUT: 30,  # seconds, total budget for all attempts
+    CONF_CONNECT_ATTEMPTS: 3,
+    CONF_READ_TIMEOUT: 1.0,  # seconds, per command sent to the device
+    # seconds, polls speed up while readings change and back off while they are flat
+    CONF_MIN_SCAN_INTERVAL: 30,
+    CONF_MAX_SCAN_INTERVAL: 300,
+    CONF_LEAF_TEMPERATURE_OFFSET: -2.0,  # °C, leaves are usually cooler than the air
+    CONF_STATE_DEADBAND: 0,  # display steps, changes up to this many steps are not written
+    CONF_STATE_HEARTBEAT: 3600,  # seconds, unchanged states are still written this often
+    CONF_PUBLISH_WINDOW: 0,  # seconds, samples are aggregated over this window, 0 disables
+    CONF_PUBLISH_STATISTIC: PUBLISH_STATISTIC_MEAN,
+    CONF_PRESENCE_WINDOW: 600,  # seconds, devices not heard for longer are not polled, 0 disables
+}
 
 PROBE_TYPES = ["main", "external"]
 
@@ -46,8 +111,196 @@ SENSOR_TYPES = {
         "entity_category": EntityCategory.DIAGNOSTIC,
         "precision": 2,  # 0.01
     },
+    "leaf_vpd": {
+        "name": "Leaf Vapor Pressure Deficit",
+        "native_unit_of_measurement": "kPa",
+        "icon": "mdi:leaf",
+        "device_class": None,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "precision": 2,  # 0.01
+    },
+    "dew_point": {
+        "name": "Dew Point",
+        "native_unit_of_measurement": UnitOfTemperature.CELSIUS,
+        "icon": "mdi:thermometer-water",
+        "device_class": SensorDeviceClass.TEMPERATURE,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "precision": 1,  # 0.1
+    },
+    "absolute_humidity": {
+        "name": "Absolute Humidity",
+        "native_unit_of_measurement": CONCENTRATION_GRAMS_PER_CUBIC_METER,
+        "icon": "mdi:water",
+        "device_class": SensorDeviceClass.ABSOLUTE_HUMIDITY,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "precision": 1,  # 0.1
+    },
+    "enthalpy": {
+        "name": "Enthalpy",
+        "native_unit_of_measurement": "kJ/kg",
+        "icon": "mdi:heat-wave",
+        "device_class": None,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "precision": 1,  # 0.1
+    },
 }
 
+# Rolling statistics of probe readings over the last ROLLING_WINDOW, kept in memory
+ROLLING_SENSOR_TYPES = {
+    "temperature_c_min": {
+        "name": "Temperature 1h Min",
+        "key": "temperature_c",
+        "statistic": "min",
+        "native_unit_of_measurement": UnitOfTemperature.CELSIUS,
+        "icon": "mdi:thermometer",
+        "device_class": SensorDeviceClass.TEMPERATURE,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": None,
+        "precision": 1,  # 0.1
+    },
+    "temperature_c_max": {
+        "name": "Temperature 1h Max",
+        "key": "temperature_c",
+        "statistic": "max",
+        "native_unit_of_measurement": UnitOfTemperature.CELSIUS,
+        "icon": "mdi:thermometer",
+        "device_class": SensorDeviceClass.TEMPERATURE,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": None,
+        "precision": 1,  # 0.1
+    },
+    "temperature_c_mean": {
+        "name": "Temperature 1h Mean",
+        "key": "temperature_c",
+        "statistic": "mean",
+        "native_unit_of_measurement": UnitOfTemperature.CELSIUS,
+        "icon": "mdi:thermometer",
+        "device_class": SensorDeviceClass.TEMPERATURE,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": None,
+        "precision": 1,  # 0.1
+    },
+    "temperature_c_trend": {
+        "name": "Temperature 1h Trend",
+        "key": "temperature_c",
+        "statistic": "trend",
+        "native_unit_of_measurement": "°C/h",
+        "icon": "mdi:trending-up",
+        "device_class": None,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": None,
+        "precision": 2,  # 0.01
+    },
+    "humidity_min": {
+        "name": "Humidity 1h Min",
+        "key": "humidity",
+        "statistic": "min",
+        "native_unit_of_measurement": PERCENTAGE,
+        "icon": "mdi:water-percent",
+        "device_class": SensorDeviceClass.HUMIDITY,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": None,
+        "precision": 0,  # 1
+    },
+    "humidity_max": {
+        "name": "Humidity 1h Max",
+        "key": "humidity",
+        "statistic": "max",
+        "native_unit_of_measurement": PERCENTAGE,
+        "icon": "mdi:water-percent",
+        "device_class": SensorDeviceClass.HUMIDITY,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": None,
+        "precision": 0,  # 1
+    },
+    "humidity_mean": {
+        "name": "Humidity 1h Mean",
+        "key": "humidity",
+        "statistic": "mean",
+        "native_unit_of_measurement": PERCENTAGE,
+        "icon": "mdi:water-percent",
+        "device_class": SensorDeviceClass.HUMIDITY,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": None,
+        "precision": 0,  # 1
+    },
+    "humidity_trend": {
+        "name": "Humidity 1h Trend",
+        "key": "humidity",
+        "statistic": "trend",
+        "native_unit_of_measurement": "%/h",
+        "icon": "mdi:trending-up",
+        "device_class": None,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": None,
+        "precision": 1,  # 0.1
+    },
+}
+
+ROLLING_WINDOW: Final = timedelta(hours=1)
+# Samples kept per probe, samples closer than ROLLING_WINDOW / ROLLING_CAPACITY are skipped
+ROLLING_CAPACITY: Final = 720
+
+# Device level sensors backed by coordinator telemetry instead of probe readings
+DIAGNOSTIC_SENSOR_TYPES = {
+    "cycle_time": {
+        "name": "Last Cycle Time",
+        "native_unit_of_measurement": UnitOfTime.SECONDS,
+        "icon": "mdi:timer-outline",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "precision": 2,  # 0.01
+    },
+    "connect_time": {
+        "name": "Connect Time",
+        "native_unit_of_measurement": UnitOfTime.SECONDS,
+        "icon": "mdi:bluetooth-connect",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "precision": 2,  # 0.01
+    },
+    "failure_rate": {
+        "name": "Failure Rate",
+        "native_unit_of_measurement": PERCENTAGE,
+        "icon": "mdi:alert-circle-outline",
+        "device_class": None,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "precision": 0,  # 1
+    },
+}
+
+# Device level sensors gathered from advertisements and connections made for readings anyway,
+# written at most once per VITALS_INTERVAL so that they never cost radio traffic of their own
+VITAL_SENSOR_TYPES = {
+    "battery": {
+        "name": "Battery",
+        "native_unit_of_measurement": PERCENTAGE,
+        "icon": "mdi:battery",
+        "device_class": SensorDeviceClass.BATTERY,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "precision": 0,  # 1
+    },
+    "rssi": {
+        "name": "Signal Strength",
+        "native_unit_of_measurement": SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        "icon": "mdi:signal",
+        "device_class": SensorDeviceClass.SIGNAL_STRENGTH,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "precision": 0,  # 1
+    },
+}
+
+VITALS_INTERVAL: Final = timedelta(minutes=5)
+
 
 class ConfigEntryData(TypedDict):
     name: str
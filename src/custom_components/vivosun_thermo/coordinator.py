@@ -1,13 +1,64 @@
-from asyncio import Future, wait_for
+from asyncio import Task, get_running_loop, shield, timeout
+from collections.abc import AsyncIterator, Mapping
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import timedelta
 from logging import getLogger
 from struct import unpack_from
-from typing import Any, Final, TypedDict, cast
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Final, NotRequired, TypedDict, cast
 
-from bleak import BleakClient
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from bleak.exc import BleakError
+from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
+    BluetoothChange,
+    BluetoothScanningMode,
+    BluetoothServiceInfoBleak,
+    async_ble_device_from_address,
+    async_last_service_info,
+    async_register_callback,
+    async_scanner_devices_by_address,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DEFAULT_SCAN_INTERVAL, ConfigEntryData
+from .aggregation import RollingWindow, SampleWindow
+from .const import (
+    ACQUISITION_MODE_PASSIVE,
+    ACQUISITION_MODE_PERSISTENT,
+    CONF_ACQUISITION_MODE,
+    CONF_CONNECT_ATTEMPTS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_LEAF_TEMPERATURE_OFFSET,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PRESENCE_WINDOW,
+    CONF_PUBLISH_STATISTIC,
+    CONF_PUBLISH_WINDOW,
+    CONF_READ_TIMEOUT,
+    DEFAULT_OPTIONS,
+    DEFAULT_SCAN_INTERVAL,
+    PERSISTENT_SCAN_INTERVAL,
+    PROBE_TYPES,
+    ROLLING_CAPACITY,
+    ROLLING_SENSOR_TYPES,
+    ROLLING_WINDOW,
+    SENSOR_TYPES,
+    VITALS_INTERVAL,
+    ConfigEntryData,
+    ConfigEntryOptions,
+)
+from .history import VivosunThermoHistory, VivosunThermoHistoryStore
+from .metrics import calculate_metrics
+from .polling import AdaptiveInterval, CircuitBreaker, poll_phase, staggered_delay
+from .protocol import FRAME_SIZE, battery_percentage, calculate_vpd, decode_frames
+from .scheduler import VivosunThermoConnectionScheduler, async_get_scheduler
+from .session import VivosunThermoSession
+from .telemetry import PHASE_CONNECT, PHASE_CYCLE, PHASE_SERVICES, VivosunThermoTelemetry
+
+# Connection code is imported on the first connection, advertisements alone don't need it
+if TYPE_CHECKING:
+    from bleak import BleakClient
+    from bleak.backends.device import BLEDevice
 
 _LOGGER = getLogger(__name__)
 
@@ -16,21 +67,24 @@ _BLE_SENSOR_COMMAND = bytearray([0x0D])
 _BLE_COMMAND_UUID: Final = "0000fff5-0000-1000-8000-00805f9b34fb"
 _BLE_STATUS_UUID: Final = "0000fff3-0000-1000-8000-00805f9b34fb"
 
-_BLE_READ_TIMEOUT: Final = 1
-_BLE_CONNECT_TIMEOUT: Final = 30
-
-_MAIN_TEMP_OFFSET: Final = 1
-_MAIN_HUMIDITY_OFFSET: Final = 3
-_EXTERNAL_TEMP_OFFSET: Final = 7
-_EXTERNAL_HUMIDITY_OFFSET: Final = 9
+# Manufacturer data layout of ThermoBeacon family advertisements (company id stripped)
+_ADV_DATA_LENGTHS: Final = (18, 20)
+_ADV_BATTERY_OFFSET: Final = 8
+_ADV_TEMP_OFFSET: Final = 10
+_ADV_HUMIDITY_OFFSET: Final = 12
 
-_VALUE_NONE: Final = -1
+# Advertisements only carry the main probe, so poll now and then to pick up probe changes
+_PASSIVE_POLL_INTERVAL: Final = timedelta(minutes=30)
 
 
 class ProbeData(TypedDict):
     temperature_c: float
     humidity: float
     vpd: float
+    leaf_vpd: NotRequired[float]
+    dew_point: NotRequired[float | None]
+    absolute_humidity: NotRequired[float]
+    enthalpy: NotRequired[float]
 
 
 class SensorData(TypedDict):
@@ -39,52 +93,519 @@ class SensorData(TypedDict):
 
 
 class VivosunThermoSensorCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, data: ConfigEntryData):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        data: ConfigEntryData,
+        options: Mapping[str, Any] | None = None,
+        scheduler: VivosunThermoConnectionScheduler | None = None,
+        history_store: VivosunThermoHistoryStore | None = None,
+    ):
+        options = cast(ConfigEntryOptions, {**DEFAULT_OPTIONS, **(options or {})})
+        persistent = options[CONF_ACQUISITION_MODE] == ACQUISITION_MODE_PERSISTENT
+        adaptive_interval = AdaptiveInterval(
+            timedelta(seconds=options[CONF_MIN_SCAN_INTERVAL]),
+            timedelta(seconds=options[CONF_MAX_SCAN_INTERVAL]),
+            {key: sensor_type["precision"] for key, sensor_type in SENSOR_TYPES.items()},
+            DEFAULT_SCAN_INTERVAL,
+        )
         super().__init__(
             hass,
             _LOGGER,
             name=data["name"],
-            update_interval=DEFAULT_SCAN_INTERVAL,
+            update_interval=(
+                PERSISTENT_SCAN_INTERVAL
+                if persistent
+                else timedelta(seconds=adaptive_interval.interval)
+            ),
             update_method=self._read_sensor_data,
+            # Entities are notified of unchanged data too, they suppress unchanged states
+            # themselves but still write heartbeats and diagnostics
+            always_update=True,
         )
         self.discovery_name = data["discovery_name"]
         self.discovery_address = data["discovery_address"]
-        self._client = BleakClient(data["discovery_address"], conect_timeout=_BLE_CONNECT_TIMEOUT)
+        self.options = options
+        self.adaptive_interval = adaptive_interval
+        self.phase = poll_phase(self.discovery_address)
+        self.scheduler = scheduler or async_get_scheduler(hass)
+        self.history = VivosunThermoHistory(hass, self.discovery_address, self.name, history_store)
+        self.last_queue_wait: float | None = None
+        self.telemetry = VivosunThermoTelemetry()
+        self.breaker = CircuitBreaker()
+        self.present = True
+        self.refreshed = False
+        self.battery: int | None = None
+        self.battery_voltage: float | None = None
+        self._vitals_notified: float | None = None
+        self._inflight: Task[dict[str, Any]] | None = None
+        self._history_task: Task[None] | None = None
+        self._history_session: VivosunThermoSession | None = None
+        self._client: "BleakClient | None" = None
+        self._session: VivosunThermoSession | None = None
+        # Connection slot held for as long as the kept connection is open
+        self._slot: AsyncExitStack | None = None
+        self._last_advertisement: float | None = None
+        self._last_poll: float | None = None
+        self._shutting_down = False
+        # Allocated on first use, publish windows are off by default
+        self._windows: dict[str, SampleWindow] = {}
+        self._window_started: float | None = None
+        rolling_keys = {sensor_type["key"] for sensor_type in ROLLING_SENSOR_TYPES.values()}
+        self.rolling = {
+            probe: RollingWindow(rolling_keys, ROLLING_WINDOW.total_seconds(), ROLLING_CAPACITY)
+            for probe in PROBE_TYPES
+        }
+
+    async def async_update_options(self, options: Mapping[str, Any]) -> None:
+        # Options are looked up on use, so timeouts and retries apply from the next connection
+        was_persistent = self.persistent
+        mode = self.options[CONF_ACQUISITION_MODE]
+        self.options = cast(ConfigEntryOptions, {**DEFAULT_OPTIONS, **options})
+        self.adaptive_interval.set_bounds(
+            timedelta(seconds=self.options[CONF_MIN_SCAN_INTERVAL]),
+            timedelta(seconds=self.options[CONF_MAX_SCAN_INTERVAL]),
+        )
+        if self.persistent:
+            self.update_interval = PERSISTENT_SCAN_INTERVAL
+        else:
+            self.update_interval = self._staggered(
+                timedelta(seconds=self.adaptive_interval.interval), monotonic()
+            )
+        if was_persistent and not self.persistent:
+            await self._async_disconnect()
+        if self.options[CONF_ACQUISITION_MODE] != mode:
+            # Reschedules polls right away instead of after the interval of the old mode
+            await self.async_request_refresh()
+
+    @property
+    def passive(self) -> bool:
+        return self.options[CONF_ACQUISITION_MODE] == ACQUISITION_MODE_PASSIVE
+
+    @property
+    def persistent(self) -> bool:
+        return self.options[CONF_ACQUISITION_MODE] == ACQUISITION_MODE_PERSISTENT
+
+    @property
+    def vitals(self) -> dict[str, Any]:
+        return {
+            "battery": self.battery,
+            "battery_voltage": self.battery_voltage,
+            "rssi": self.telemetry.rssi,
+        }
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        # Advertisements re-arm the circuit breaker and carry vitals in every mode, and carry
+        # readings in passive mode
+        return async_register_callback(
+            self.hass,
+            self._async_handle_advertisement,
+            BluetoothCallbackMatcher(address=self.discovery_address, connectable=False),
+            BluetoothScanningMode.PASSIVE,
+        )
+
+    @callback
+    def _async_handle_advertisement(
+        self, service_info: BluetoothServiceInfoBleak, change: BluetoothChange
+    ) -> None:
+        self.breaker.rearm()
+        self.present = True
+        self._record_vitals(service_info)
+        if not (self.passive and self._async_publish_advertisement(service_info)):
+            self._async_notify_vitals()
+
+    def _record_vitals(self, service_info: BluetoothServiceInfoBleak) -> None:
+        self.telemetry.rssi = service_info.rssi
+        millivolts = self._decode_advertisement_battery(service_info.manufacturer_data)
+        if millivolts is not None:
+            self.battery = battery_percentage(millivolts)
+            self.battery_voltage = millivolts / 1000
+
+    @callback
+    def _async_notify_vitals(self) -> None:
+        # Listeners are otherwise only called with new readings, vital sensors throttle their
+        # own writes, so a call now and then is enough for them to catch up
+        now = monotonic()
+        if (
+            self._vitals_notified is not None
+            and now - self._vitals_notified < VITALS_INTERVAL.total_seconds()
+        ):
+            return
+        self._vitals_notified = now
+        self.async_update_listeners()
+
+    @callback
+    def _async_publish_advertisement(self, service_info: BluetoothServiceInfoBleak) -> bool:
+        # Returns whether listeners were called with the advertised reading
+        values = self._decode_advertisement_data(service_info.manufacturer_data)
+        if values is None:
+            return False
+        main_probe = self._probe_metrics(*values)
+        self._last_advertisement = monotonic()
+        # Keep the external probe reading from the last poll, advertisements don't have it
+        external_probe = self.data.get("external") if self.data else None
+        published = self._publish(SensorData(main=main_probe, external=external_probe), False)
+        if published is None:
+            return False
+        self.data = cast(dict, published)
+        # A reading from the device is as good as a poll, entities of a coordinator whose poll
+        # failed become available again. Not async_set_updated_data, restarting the poll timer
+        # on every advertisement would postpone the external probe poll forever
+        self.last_update_success = True
+        self.async_update_listeners()
+        return True
+
+    def _can_skip_poll(self) -> bool:
+        if not self.passive or not self.data or self.data.get("external") is not None:
+            return False
+        if self._last_advertisement is None or self._last_poll is None:
+            return False
+        now = monotonic()
+        # Polls only look for an external probe, counted from the last attempt so a device
+        # whose GATT reads fail still gets its readings from advertisements
+        return (
+            now - self._last_advertisement < self.adaptive_interval.interval
+            and now - self._last_poll < _PASSIVE_POLL_INTERVAL.total_seconds()
+        )
 
     async def _read_sensor_data(self) -> dict[str, Any]:
-        data = await self._read_raw_data(self._client)
-        return cast(dict, self._decode_raw_data(data))
+        # Scheduled polls, entity update requests and reconnects all join the read in flight,
+        # so the device sees a single BLE transaction at a time
+        if self._inflight is None:
+            self._inflight = get_running_loop().create_task(self._read_sensor_data_once())
+            self._inflight.add_done_callback(self._finish_read)
+        # A cancelled caller must not cancel the read others are waiting for
+        return await shield(self._inflight)
 
-    @staticmethod
-    async def _read_raw_data(client: BleakClient) -> bytearray:
-        async with client:
-            future = Future()
-            await client.start_notify(_BLE_STATUS_UUID, lambda _, d: future.set_result(d))
-            await client.write_gatt_char(_BLE_COMMAND_UUID, _BLE_SENSOR_COMMAND)
-            data = await wait_for(future, _BLE_READ_TIMEOUT)
-            await client.stop_notify(_BLE_STATUS_UUID)
+    def _finish_read(self, task: Task[dict[str, Any]]) -> None:
+        # Any finished attempt ends the grace period of restored entity states
+        self.refreshed = True
+        if self._inflight is task:
+            self._inflight = None
+
+    async def _read_sensor_data_once(self) -> dict[str, Any]:
+        if self._can_skip_poll():
+            _LOGGER.debug(f"Using advertised data for {self.name}, skipping poll")
+            sample = published = cast(SensorData, self.data)
+        elif not self._device_present():
+            # Unavailable right away instead of waiting out a connect timeout
+            self.present = False
+            raise UpdateFailed(f"{self.name} was not heard recently, skipping poll")
+        elif not self.breaker.allow(monotonic()):
+            # Unreachable device doesn't get to hold a connection slot
+            raise UpdateFailed(
+                f"Not connecting to {self.name}, circuit breaker is {self.breaker.state}"
+            )
+        else:
+            sample = await self._read_current_data()
+            published = self._publish(sample) or cast(SensorData, self.data)
+        if not self.persistent:
+            now = monotonic()
+            self.update_interval = self._staggered(self.adaptive_interval.update(sample, now), now)
+        return cast(dict, published)
+
+    def _staggered(self, interval: timedelta, now: float) -> timedelta:
+        # Coordinators set up together would otherwise poll together for as long as they run
+        return timedelta(seconds=staggered_delay(interval.total_seconds(), self.phase, now))
+
+    @property
+    def phase_offset(self) -> float:
+        # Seconds into the adaptive interval this device polls at
+        return self.phase * self.adaptive_interval.interval
+
+    def _device_present(self) -> bool:
+        window = self.options[CONF_PRESENCE_WINDOW]
+        # Connected devices often stop advertising, the open connection is proof enough
+        if not window or (self._client is not None and self._client.is_connected):
+            return True
+        service_info = async_last_service_info(self.hass, self.discovery_address, connectable=False)
+        return service_info is not None and monotonic() - service_info.time < window
+
+    async def _read_current_data(self) -> SensorData:
+        self._last_poll = monotonic()
+        try:
+            with self.telemetry.phase(PHASE_CYCLE):
+                if self.persistent:
+                    data = await self._read_persistent_data()
+                else:
+                    data = await self._read_polled_data()
+        except (BleakError, TimeoutError) as err:
+            self.breaker.record_failure(monotonic())
+            raise UpdateFailed(f"Failed to read {self.name}: {err}") from err
+        self.breaker.record_success()
+        self.present = True
+        return self._decode_status_frame(data)
+
+    def _publish(self, data: SensorData, external_known: bool = True) -> SensorData | None:
+        # Returns data to publish, None while the publish window is still collecting samples
+        now = monotonic()
+        # Every fresh sample passes here, rolling statistics see them before aggregation
+        self.rolling["main"].add(now, data["main"])
+        if external_known and data["external"] is not None:
+            self.rolling["external"].add(now, data["external"])
+        window = self.options[CONF_PUBLISH_WINDOW]
+        if not window:
+            return data
+        if not self._windows:
+            self._windows = {probe: SampleWindow(SENSOR_TYPES) for probe in PROBE_TYPES}
+        self._windows["main"].add(data["main"])
+        if external_known:
+            self._windows["external"].add(data["external"])
+        if self._window_started is None:
+            self._window_started = now
+        # Publish the very first sample right away so entities have a state
+        if self.data and now - self._window_started < window:
+            return None
+        published = SensorData(
+            main=self._aggregate_probe("main", data["main"]) or data["main"],
+            external=self._aggregate_probe("external", data["external"]),
+        )
+        for probe_window in self._windows.values():
+            probe_window.clear()
+        self._window_started = now
+        return published
+
+    def _aggregate_probe(self, probe: str, fallback: ProbeData | None) -> ProbeData | None:
+        window = self._windows[probe]
+        # No samples, e.g. external probe during advertisement-only windows
+        if not len(window):
+            return fallback
+        values = window.aggregate(self.options[CONF_PUBLISH_STATISTIC])
+        if values["temperature_c"] is None or values["humidity"] is None:
+            return None
+        return cast(ProbeData, values)
+
+    def _decode_status_frame(self, data: bytearray) -> SensorData:
+        # Decoded readings go straight into the derived metrics, VPD included
+        frames = decode_frames(memoryview(data)[:FRAME_SIZE])
+        decoded = SensorData(
+            main=self._probe_metrics(frames["temperature_c"][0], frames["humidity"][0]),
+            external=(
+                self._probe_metrics(
+                    frames["external_temperature_c"][0], frames["external_humidity"][0]
+                )
+                if frames["external"][0]
+                else None
+            ),
+        )
+        self.telemetry.record_frame("status", data, decoded)
+        return decoded
+
+    def _probe_metrics(self, temp_c: float, humidity: float) -> ProbeData:
+        metrics = calculate_metrics(temp_c, humidity, self.options[CONF_LEAF_TEMPERATURE_OFFSET])
+        return ProbeData(
+            temperature_c=temp_c,
+            humidity=humidity,
+            vpd=metrics["vpd"],
+            leaf_vpd=metrics["leaf_vpd"],
+            dew_point=metrics["dew_point"],
+            absolute_humidity=metrics["absolute_humidity"],
+            enthalpy=metrics["enthalpy"],
+        )
+
+    def _resolve_connection_path(self) -> tuple[str, "BLEDevice"]:
+        devices = async_scanner_devices_by_address(
+            self.hass, self.discovery_address, connectable=True
+        )
+        if not devices:
+            raise UpdateFailed(f"No connectable bluetooth adapter can reach {self.name}")
+        # Prefer adapters and proxies that still have a free connection slot
+        available = [
+            device
+            for device in devices
+            if (allocations := device.scanner.get_allocations()) is None or allocations.free > 0
+        ]
+        best = max(available or devices, key=lambda device: device.advertisement.rssi)
+        self.telemetry.rssi = best.advertisement.rssi
+        self.telemetry.source = best.scanner.source
+        return best.scanner.source, best.ble_device
+
+    def _latest_ble_device(self, ble_device: "BLEDevice") -> "BLEDevice":
+        return (
+            async_ble_device_from_address(self.hass, self.discovery_address, connectable=True)
+            or ble_device
+        )
+
+    @asynccontextmanager
+    async def _connection_slot(self) -> AsyncIterator["BLEDevice"]:
+        source, ble_device = self._resolve_connection_path()
+        async with self.scheduler.async_slot(source, self.name) as wait:
+            self.last_queue_wait = wait
+            yield ble_device
+
+    async def _connect(self) -> "BleakClient":
+        # Kept connections hold their slot until disconnected, like polled ones
+        async with AsyncExitStack() as stack:
+            ble_device = await stack.enter_async_context(self._connection_slot())
+            client = await self._establish_connection(ble_device)
+            self._slot = stack.pop_all()
+            return client
+
+    async def _release_slot(self) -> None:
+        if self._slot is not None:
+            slot, self._slot = self._slot, None
+            await slot.aclose()
+
+    async def _establish_connection(self, ble_device: "BLEDevice") -> "BleakClient":
+        from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
+
+        with self.telemetry.phase(PHASE_CONNECT):
+            async with timeout(self.options[CONF_CONNECT_TIMEOUT]):
+                return await establish_connection(
+                    BleakClientWithServiceCache,
+                    ble_device,
+                    self.name,
+                    disconnected_callback=self._handle_disconnect,
+                    max_attempts=self.options[CONF_CONNECT_ATTEMPTS],
+                    ble_device_callback=lambda: self._latest_ble_device(ble_device),
+                )
+
+    async def _invalidate_services(self, client: "BleakClient") -> None:
+        from bleak_retry_connector import BleakClientWithServiceCache
+
+        # Services cached by the backend may be stale, discover them again next time
+        if isinstance(client, BleakClientWithServiceCache):
+            await client.clear_cache()
+
+    def _open_session(self, client: "BleakClient") -> VivosunThermoSession:
+        with self.telemetry.phase(PHASE_SERVICES):
+            command = client.services.get_characteristic(_BLE_COMMAND_UUID)
+            status = client.services.get_characteristic(_BLE_STATUS_UUID)
+        if command is None or status is None:
+            raise BleakError(f"{self.name} does not have expected characteristics")
+        return VivosunThermoSession(
+            client, command, status, self.telemetry, self._handle_notification
+        )
+
+    async def _read_session(self, session: VivosunThermoSession) -> bytearray:
+        data = await session.request(_BLE_SENSOR_COMMAND, timeout=self.options[CONF_READ_TIMEOUT])
+        if len(data) < FRAME_SIZE:
+            raise BleakError(f"Truncated status frame {data.hex()}")
+        return data
+
+    def _history_due(self) -> bool:
+        return self._history_task is None and self.history.due
+
+    def _start_history(self, session: VivosunThermoSession, stack: AsyncExitStack) -> None:
+        self._history_session = session
+        self._history_task = get_running_loop().create_task(self._sync_history(session, stack))
+
+    async def _sync_history(self, session: VivosunThermoSession, stack: AsyncExitStack) -> None:
+        # Runs after the reading is published and outside the poll cycle, the stack closes
+        # the connection handed over by a polled read
+        try:
+            async with stack:
+                await self.history.async_sync(session)
+        except (BleakError, TimeoutError) as err:
+            _LOGGER.warning(f"Failed to download history of {self.name}: {err}")
+        finally:
+            self._history_task = None
+            self._history_session = None
+
+    async def _read_polled_data(self) -> bytearray:
+        if self._history_session is not None:
+            # A history download still holds the connection, the read shares its session
+            return await self._read_session(self._history_session)
+        # The slot is held until disconnected, sources limit open connections, not connects
+        async with AsyncExitStack() as stack:
+            ble_device = await stack.enter_async_context(self._connection_slot())
+            client = await self._establish_connection(ble_device)
+            stack.push_async_callback(client.disconnect)
+            try:
+                session = await stack.enter_async_context(self._open_session(client))
+                data = await self._read_session(session)
+            except (BleakError, TimeoutError):
+                await self._invalidate_services(client)
+                raise
+            if self._history_due():
+                # Connection and slot move on to the history download
+                self._start_history(session, stack.pop_all())
             return data
 
+    async def _read_persistent_data(self) -> bytearray:
+        client = self._client
+        if client is None or not client.is_connected:
+            self._session = None
+            await self._release_slot()
+            client = self._client = await self._connect()
+        try:
+            if self._session is None:
+                session = self._open_session(client)
+                await session.start()
+                self._session = session
+            session = self._session
+            data = await self._read_session(session)
+        except (BleakError, TimeoutError):
+            await self._invalidate_services(client)
+            # Subscribe again with freshly resolved services next time
+            if self._session is not None:
+                session, self._session = self._session, None
+                await session.close()
+            raise
+        if self._history_due():
+            # The kept connection stays open, the download shares its session
+            self._start_history(session, AsyncExitStack())
+        return data
+
+    def _handle_notification(self, _: Any, data: bytearray) -> None:
+        # Notification no request of the session asked for, publish it right away
+        if len(data) < FRAME_SIZE:
+            _LOGGER.debug(f"Ignoring short notification {data.hex()} from {self.name}")
+            return
+        self._last_poll = monotonic()
+        published = self._publish(self._decode_status_frame(data))
+        if published is not None:
+            self.async_set_updated_data(cast(dict, published))
+
+    def _handle_disconnect(self, _: "BleakClient") -> None:
+        if self._session is not None:
+            # Pending requests fail now instead of waiting for their timeouts
+            self._session.abort()
+            self._session = None
+        if not self.persistent or self._shutting_down:
+            return
+        _LOGGER.debug(f"Disconnected from {self.name}, reconnecting")
+        self.hass.async_create_task(self._async_reconnect())
+
+    async def _async_reconnect(self) -> None:
+        # The dropped connection gives its slot back before queueing for a new one
+        await self._release_slot()
+        await self.async_request_refresh()
+
+    async def async_shutdown(self) -> None:
+        self._shutting_down = True
+        await super().async_shutdown()
+        if self._inflight is not None:
+            self._inflight.cancel()
+        if self._history_task is not None:
+            self._history_task.cancel()
+        await self._async_disconnect()
+
+    async def _async_disconnect(self) -> None:
+        client, self._client = self._client, None
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+        if client is not None and client.is_connected:
+            await client.disconnect()
+        await self._release_slot()
+
     @staticmethod
-    def _decode_int16(data: bytearray, offset: int) -> int:
+    def _decode_int16(data: bytes | bytearray, offset: int) -> int:
         return unpack_from("<h", data, offset)[0]
 
     @staticmethod
-    def _decode_float(data: bytearray, offset: int) -> float:
+    def _decode_float(data: bytes | bytearray, offset: int) -> float:
         return unpack_from("<h", data, offset)[0] / 16
 
     @staticmethod
     def _calculate_vpd(temp_c: float, humidity: float):
-        # Calculate saturation vapor pressure (in kPa)
-        svp = 0.61078 * 10 ** ((7.5 * temp_c) / (237.3 + temp_c))
-        # Calculate actual vapor pressure (in kPa)
-        avp = svp * (humidity / 100.0)
-        # VPD is the difference
-        return svp - avp
+        return calculate_vpd(temp_c, humidity)
 
     @classmethod
     def _decode_probe_data(
-        cls, data: bytearray, temp_offset: int, humidity_offset: int
+        cls, data: bytes | bytearray, temp_offset: int, humidity_offset: int
     ) -> ProbeData:
         temp_c = cls._decode_float(data, temp_offset)
         humidity = cls._decode_float(data, humidity_offset)
@@ -92,15 +613,43 @@ class VivosunThermoSensorCoordinator(DataUpdateCoordinator):
         return ProbeData(temperature_c=temp_c, humidity=humidity, vpd=vpd)
 
     @classmethod
-    def _decode_raw_data(cls, data: bytearray) -> SensorData:
-        main_probe = cls._decode_probe_data(data, _MAIN_TEMP_OFFSET, _MAIN_HUMIDITY_OFFSET)
-        external_probe_available = (
-            cls._decode_int16(data, _EXTERNAL_TEMP_OFFSET) != _VALUE_NONE
-            and cls._decode_int16(data, _EXTERNAL_HUMIDITY_OFFSET) != _VALUE_NONE
+    def _decode_raw_data(cls, data: bytes | bytearray) -> SensorData:
+        frames = decode_frames(memoryview(data)[:FRAME_SIZE])
+        main_probe = ProbeData(
+            temperature_c=frames["temperature_c"][0],
+            humidity=frames["humidity"][0],
+            vpd=cls._calculate_vpd(frames["temperature_c"][0], frames["humidity"][0]),
         )
         external_probe = (
-            cls._decode_probe_data(data, _EXTERNAL_TEMP_OFFSET, _EXTERNAL_HUMIDITY_OFFSET)
-            if external_probe_available
+            ProbeData(
+                temperature_c=frames["external_temperature_c"][0],
+                humidity=frames["external_humidity"][0],
+                vpd=cls._calculate_vpd(
+                    frames["external_temperature_c"][0], frames["external_humidity"][0]
+                ),
+            )
+            if frames["external"][0]
             else None
         )
         return SensorData(main=main_probe, external=external_probe)
+
+    @classmethod
+    def _decode_advertisement_battery(cls, manufacturer_data: Mapping[int, bytes]) -> int | None:
+        # Battery voltage in mV, 0 when the device doesn't report it
+        for data in manufacturer_data.values():
+            if len(data) in _ADV_DATA_LENGTHS:
+                return unpack_from("<H", data, _ADV_BATTERY_OFFSET)[0] or None
+        return None
+
+    @classmethod
+    def _decode_advertisement_data(
+        cls, manufacturer_data: Mapping[int, bytes]
+    ) -> tuple[float, float] | None:
+        # Temperature and humidity only, published readings derive VPD with the other metrics
+        for data in manufacturer_data.values():
+            if len(data) in _ADV_DATA_LENGTHS:
+                return (
+                    cls._decode_float(data, _ADV_TEMP_OFFSET),
+                    cls._decode_float(data, _ADV_HUMIDITY_OFFSET),
+                )
+        return None
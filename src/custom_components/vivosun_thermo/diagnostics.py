@@ -0,0 +1,51 @@
+from time import monotonic
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import VivosunThermoSensorCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    coordinator: VivosunThermoSensorCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "options": coordinator.options,
+            "data": coordinator.data,
+            "last_queue_wait": coordinator.last_queue_wait,
+            "update_interval": (
+                coordinator.update_interval.total_seconds() if coordinator.update_interval else None
+            ),
+            "change_rate": coordinator.adaptive_interval.rate,
+            "phase": coordinator.phase,
+            "phase_offset": coordinator.phase_offset,
+            "present": coordinator.present,
+            "breaker": coordinator.breaker.as_dict(monotonic()),
+            "vitals": coordinator.vitals,
+            "rolling": {
+                probe: {"samples": len(window), "bytes": window.nbytes}
+                for probe, window in coordinator.rolling.items()
+            },
+        },
+        "history": {
+            "cursor": coordinator.history.store.get(coordinator.discovery_address),
+            "last_imported": coordinator.history.last_imported,
+        },
+        "telemetry": coordinator.telemetry.as_dict(),
+        "scheduler": coordinator.scheduler.stats(),
+        # Where every device polls within its interval, spread out devices share adapters best
+        "poll_phases": {
+            other.name: other.phase_offset
+            for other in hass.data[DOMAIN].values()
+            if isinstance(other, VivosunThermoSensorCoordinator)
+        },
+    }
@@ -0,0 +1,298 @@
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from logging import getLogger
+from struct import Struct
+from time import monotonic
+from typing import TYPE_CHECKING, Final, TypedDict
+
+from bleak.exc import BleakError
+from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from .const import DATA_HISTORY, DOMAIN
+from .session import VivosunThermoSession
+
+# Recorder is only needed once there is history to import
+if TYPE_CHECKING:
+    from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+
+_LOGGER = getLogger(__name__)
+
+_STORAGE_VERSION: Final = 1
+_STORAGE_KEY: Final = f"{DOMAIN}.history"
+_SAVE_DELAY: Final = 10
+
+# ThermoBeacon family log protocol: 0x01 answers with the number of stored records,
+# 0x07 <index:u24> <count:u8> streams records back, a few per notification
+_HISTORY_COUNT_COMMAND: Final = 0x01
+_HISTORY_DUMP_COMMAND: Final = 0x07
+_HISTORY_COUNT: Final = Struct("<BI")
+_HISTORY_FRAME_HEADER_SIZE: Final = 5
+_HISTORY_RECORD: Final = Struct("<hh")
+
+# Largest dump request, the count is a single byte
+_HISTORY_CHUNK_SIZE: Final = 255
+# About a week of records per sync, a longer log is caught up over the next syncs
+_HISTORY_MAX_RECORDS: Final = 4 * _HISTORY_CHUNK_SIZE
+_HISTORY_FRAME_TIMEOUT: Final = 2
+# Unanswered count requests in a row until a device is taken for one without a log
+_HISTORY_COUNT_ATTEMPTS: Final = 3
+
+# Records carry no timestamp, the device logs at a fixed interval
+_HISTORY_LOG_INTERVAL: Final = timedelta(minutes=10)
+_HISTORY_SYNC_INTERVAL: Final = timedelta(hours=1)
+
+_HOUR: Final = timedelta(hours=1)
+
+
+class HistoryCursor(TypedDict):
+    index: int  # next record to download
+    hour: float  # start of the last imported hour, utc timestamp
+
+
+class HistoryRecords(TypedDict):
+    start: int
+    temperature_c: list[float]
+    humidity: list[float]
+
+
+class VivosunThermoHistoryStore:
+    def __init__(self, store: Store[dict[str, HistoryCursor]] | None = None):
+        self._store = store
+        self._cursors: dict[str, HistoryCursor] = {}
+
+    async def async_load(self) -> None:
+        if self._store is not None:
+            self._cursors = await self._store.async_load() or {}
+
+    def get(self, address: str) -> HistoryCursor:
+        return self._cursors.get(address) or HistoryCursor(index=0, hour=0.0)
+
+    def set(self, address: str, cursor: HistoryCursor) -> None:
+        self._cursors[address] = cursor
+        if self._store is not None:
+            self._store.async_delay_save(lambda: self._cursors, _SAVE_DELAY)
+
+
+class VivosunThermoHistory:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        name: str,
+        store: VivosunThermoHistoryStore | None = None,
+    ):
+        self.hass = hass
+        self.address = address
+        self.name = name
+        self.store = store or VivosunThermoHistoryStore()
+        self.last_sync: float | None = None
+        self.last_imported = 0
+        self.supported = True
+        self._count_timeouts = 0
+
+    @property
+    def due(self) -> bool:
+        if not self.supported or "recorder" not in self.hass.config.components:
+            return False
+        return (
+            self.last_sync is None
+            or monotonic() - self.last_sync >= _HISTORY_SYNC_INTERVAL.total_seconds()
+        )
+
+    async def async_sync(self, session: VivosunThermoSession) -> None:
+        self.last_sync = monotonic()
+        cursor = self.store.get(self.address)
+
+        try:
+            total = await self._read_count(session)
+        except TimeoutError:
+            # A single lost notification is retried next sync
+            self._count_timeouts += 1
+            if self._count_timeouts < _HISTORY_COUNT_ATTEMPTS:
+                _LOGGER.debug(f"{self.name} didn't answer history count, retrying next sync")
+                return
+            total = None
+        if total is None:
+            self.supported = False
+            _LOGGER.debug(f"{self.name} doesn't answer history requests, no longer syncing")
+            return
+        self._count_timeouts = 0
+        if total < cursor["index"]:
+            _LOGGER.debug(f"History of {self.name} was cleared on the device")
+            cursor = HistoryCursor(index=0, hour=cursor["hour"])
+        if total == cursor["index"]:
+            return
+
+        raw_frames: list[bytearray] = []
+        end = min(total, cursor["index"] + _HISTORY_MAX_RECORDS)
+        for start in range(cursor["index"], end, _HISTORY_CHUNK_SIZE):
+            count = min(_HISTORY_CHUNK_SIZE, end - start)
+            frames = await self._read_chunk(session, start, count)
+            raw_frames.extend(frames)
+            if _records(frames) < count:
+                # Stalled stream, what arrived up to the first gap is imported
+                break
+
+        records = decode_history_frames(raw_frames, cursor["index"])
+        # The newest record was logged just now, older ones one interval apart each
+        first = dt_util.utcnow() - (total - 1 - records["start"]) * _HISTORY_LOG_INTERVAL
+        self.store.set(self.address, self._import(records, first, total, cursor))
+
+    async def _read_count(self, session: VivosunThermoSession) -> int | None:
+        # Returns None for a malformed reply, history requests stay out of the telemetry
+        frame = await session.request(
+            bytes([_HISTORY_COUNT_COMMAND]),
+            _HISTORY_COUNT_COMMAND,
+            _HISTORY_FRAME_TIMEOUT,
+            timed=False,
+        )
+        if len(frame) < _HISTORY_COUNT.size:
+            _LOGGER.debug(f"Malformed history count {frame.hex()} from {self.name}")
+            return None
+        return _HISTORY_COUNT.unpack_from(frame)[1]
+
+    async def _read_chunk(
+        self, session: VivosunThermoSession, start: int, count: int
+    ) -> list[bytearray]:
+        def complete(frames: list[bytearray]) -> bool:
+            return _records(frames) >= count
+
+        command = bytes([_HISTORY_DUMP_COMMAND, *start.to_bytes(3, "little"), count])
+        # Each frame is allowed the same time as a single response
+        frames = await session.request_stream(
+            command, _HISTORY_DUMP_COMMAND, complete, _HISTORY_FRAME_TIMEOUT, timed=False
+        )
+        return [frame for frame in frames if _frame_count(frame)]
+
+    def _import(
+        self, records: HistoryRecords, first: datetime, total: int, cursor: HistoryCursor
+    ) -> HistoryCursor:
+        temperatures = records["temperature_c"]
+        humidities = records["humidity"]
+        last = first + (len(temperatures) - 1) * _HISTORY_LOG_INTERVAL
+
+        temperature_stats: list["StatisticData"] = []
+        humidity_stats: list["StatisticData"] = []
+        next_index = records["start"]
+        last_hour = cursor["hour"]
+        # Only complete hours are imported, the rest is downloaded again next time
+        for hour, begin, end in _group_by_hour(first, len(temperatures)):
+            if hour + _HOUR > last:
+                break
+            next_index = records["start"] + end
+            if hour.timestamp() <= cursor["hour"]:
+                continue
+            temperature_stats.append(_statistic(hour, temperatures[begin:end]))
+            humidity_stats.append(_statistic(hour, humidities[begin:end]))
+            last_hour = hour.timestamp()
+
+        if temperature_stats:
+            from homeassistant.components.recorder.statistics import (
+                async_add_external_statistics,
+            )
+
+            slug = slugify(self.address)
+            async_add_external_statistics(
+                self.hass,
+                _metadata(
+                    f"{DOMAIN}:{slug}_temperature",
+                    f"{self.name} Temperature",
+                    UnitOfTemperature.CELSIUS,
+                    TemperatureConverter.UNIT_CLASS,
+                ),
+                temperature_stats,
+            )
+            async_add_external_statistics(
+                self.hass,
+                _metadata(f"{DOMAIN}:{slug}_humidity", f"{self.name} Humidity", PERCENTAGE),
+                humidity_stats,
+            )
+        self.last_imported = len(temperature_stats)
+        _LOGGER.debug(f"Imported {len(temperature_stats)} hours of {self.name} history")
+        return HistoryCursor(index=min(next_index, total), hour=last_hour)
+
+
+def decode_history_frames(frames: Iterable[bytes | bytearray], start: int) -> HistoryRecords:
+    # Frames may arrive duplicated or out of order, place records by their index
+    records: dict[int, tuple[int, int]] = {}
+    for frame in frames:
+        index = int.from_bytes(frame[1:4], "little")
+        count = frame[4]
+        payload = frame[
+            _HISTORY_FRAME_HEADER_SIZE : _HISTORY_FRAME_HEADER_SIZE + count * _HISTORY_RECORD.size
+        ]
+        for offset, record in enumerate(_HISTORY_RECORD.iter_unpack(payload)):
+            records[index + offset] = record
+    if not records:
+        raise BleakError("Device returned no history records")
+
+    # Stop at the first gap so that missing records are downloaded again next time
+    temperatures: list[float] = []
+    humidities: list[float] = []
+    index = start
+    while (record := records.get(index)) is not None:
+        temperatures.append(record[0] / 16)
+        humidities.append(record[1] / 16)
+        index += 1
+    return HistoryRecords(start=start, temperature_c=temperatures, humidity=humidities)
+
+
+def _frame_count(frame: bytearray) -> int:
+    # Records in a dump frame, truncated frames carry none
+    return frame[4] if len(frame) >= _HISTORY_FRAME_HEADER_SIZE else 0
+
+
+def _records(frames: list[bytearray]) -> int:
+    return sum(_frame_count(frame) for frame in frames)
+
+
+def _group_by_hour(first: datetime, count: int) -> Iterable[tuple[datetime, int, int]]:
+    begin = 0
+    hour = first.replace(minute=0, second=0, microsecond=0)
+    while begin < count:
+        end = begin
+        while end < count and first + end * _HISTORY_LOG_INTERVAL < hour + _HOUR:
+            end += 1
+        if end > begin:
+            yield hour, begin, end
+        begin = end
+        hour += _HOUR
+
+
+def _statistic(hour: datetime, values: list[float]) -> "StatisticData":
+    from homeassistant.components.recorder.models import StatisticData
+
+    return StatisticData(
+        start=hour, mean=sum(values) / len(values), min=min(values), max=max(values)
+    )
+
+
+def _metadata(
+    statistic_id: str, name: str, unit: str, unit_class: str | None = None
+) -> "StatisticMetaData":
+    from homeassistant.components.recorder.models import StatisticMeanType, StatisticMetaData
+
+    return StatisticMetaData(
+        mean_type=StatisticMeanType.ARITHMETIC,
+        has_sum=False,
+        name=name,
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_class=unit_class,
+        unit_of_measurement=unit,
+    )
+
+
+async def async_get_history_store(hass: HomeAssistant) -> VivosunThermoHistoryStore:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_HISTORY not in domain_data:
+        store = VivosunThermoHistoryStore(Store(hass, _STORAGE_VERSION, _STORAGE_KEY))
+        await store.async_load()
+        # Another entry might have finished loading the store meanwhile
+        domain_data.setdefault(DATA_HISTORY, store)
+    return domain_data[DATA_HISTORY]
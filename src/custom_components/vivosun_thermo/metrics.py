@@ -0,0 +1,97 @@
+from array import array
+from collections.abc import Sequence
+from math import log10, nan
+from typing import Final, TypedDict
+
+# Magnus-Tetens coefficients, saturation vapor pressure in kPa
+_SVP_A: Final = 0.61078
+_SVP_B: Final = 7.5
+_SVP_C: Final = 237.3
+
+_KELVIN: Final = 273.15
+# Absolute humidity in g/m³ from vapor pressure in kPa, 1e6 / water vapor gas constant
+_ABSOLUTE_HUMIDITY_FACTOR: Final = 2166.8
+# Moist air enthalpy at sea level pressure
+_PRESSURE: Final = 101.325
+_MOLAR_RATIO: Final = 0.622
+_CP_AIR: Final = 1.006
+_CP_VAPOR: Final = 1.86
+_LATENT_HEAT: Final = 2501.0
+
+
+class DerivedMetrics(TypedDict):
+    vpd: float
+    dew_point: float | None  # None when there is no moisture at all
+    absolute_humidity: float
+    enthalpy: float
+    leaf_vpd: float
+
+
+class DerivedMetricColumns(TypedDict):
+    vpd: array[float]
+    dew_point: array[float]  # nan when there is no moisture at all
+    absolute_humidity: array[float]
+    enthalpy: array[float]
+    leaf_vpd: array[float]
+
+
+def saturation_vapor_pressure(temp_c: float) -> float:
+    return _SVP_A * 10 ** ((_SVP_B * temp_c) / (_SVP_C + temp_c))
+
+
+def _dew_point(avp: float) -> float | None:
+    if avp <= 0:
+        return None
+    ratio = log10(avp / _SVP_A)
+    return _SVP_C * ratio / (_SVP_B - ratio)
+
+
+def _absolute_humidity(temp_c: float, avp: float) -> float:
+    return _ABSOLUTE_HUMIDITY_FACTOR * avp / (temp_c + _KELVIN)
+
+
+def _enthalpy(temp_c: float, avp: float) -> float:
+    mixing_ratio = _MOLAR_RATIO * avp / (_PRESSURE - avp)
+    return _CP_AIR * temp_c + mixing_ratio * (_LATENT_HEAT + _CP_VAPOR * temp_c)
+
+
+def calculate_metrics(temp_c: float, humidity: float, leaf_offset: float = 0.0) -> DerivedMetrics:
+    # Everything but leaf VPD derives from a single saturation pressure evaluation
+    svp = saturation_vapor_pressure(temp_c)
+    avp = svp * (humidity / 100.0)
+    return DerivedMetrics(
+        vpd=svp - avp,
+        dew_point=_dew_point(avp),
+        absolute_humidity=_absolute_humidity(temp_c, avp),
+        enthalpy=_enthalpy(temp_c, avp),
+        leaf_vpd=saturation_vapor_pressure(temp_c + leaf_offset) - avp,
+    )
+
+
+def calculate_metrics_batch(
+    temperatures: Sequence[float], humidities: Sequence[float], leaf_offset: float = 0.0
+) -> DerivedMetricColumns:
+    # Takes the columns of decode_frames, each sample is derived like calculate_metrics does
+    count = len(temperatures)
+    columns = DerivedMetricColumns(
+        vpd=array("d", bytes(8 * count)),
+        dew_point=array("d", bytes(8 * count)),
+        absolute_humidity=array("d", bytes(8 * count)),
+        enthalpy=array("d", bytes(8 * count)),
+        leaf_vpd=array("d", bytes(8 * count)),
+    )
+    vpds = columns["vpd"]
+    dew_points = columns["dew_point"]
+    absolute_humidities = columns["absolute_humidity"]
+    enthalpies = columns["enthalpy"]
+    leaf_vpds = columns["leaf_vpd"]
+
+    for index, (temp_c, humidity) in enumerate(zip(temperatures, humidities)):
+        svp = saturation_vapor_pressure(temp_c)
+        avp = svp * (humidity / 100.0)
+        vpds[index] = svp - avp
+        dew_points[index] = nan if (dew_point := _dew_point(avp)) is None else dew_point
+        absolute_humidities[index] = _absolute_humidity(temp_c, avp)
+        enthalpies[index] = _enthalpy(temp_c, avp)
+        leaf_vpds[index] = saturation_vapor_pressure(temp_c + leaf_offset) - avp
+    return columns
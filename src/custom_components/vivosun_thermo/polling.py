@@ -0,0 +1,136 @@
+from collections.abc import Mapping
+from datetime import timedelta
+from random import Random
+from typing import Any, Final
+from zlib import crc32
+
+# Weight of the newest rate of change sample, older samples fade out geometrically
+_RATE_SMOOTHING: Final = 0.5
+# Flat readings stretch the interval gradually, changes shrink it right away
+_MAX_GROWTH: Final = 2.0
+
+# Delay after the first failed connection, doubled with every further failure
+DEFAULT_BACKOFF_BASE: Final = 30.0
+DEFAULT_BACKOFF_MAX: Final = 1800.0
+# Consecutive failures after which connection attempts stop until the device advertises again
+DEFAULT_BREAKER_THRESHOLD: Final = 5
+
+# Polls closer than this fraction of the interval to the last one wait for the next slot
+_MIN_SLOT_DELAY: Final = 0.5
+
+BREAKER_CLOSED: Final = "closed"
+BREAKER_BACKOFF: Final = "backoff"
+BREAKER_OPEN: Final = "open"
+BREAKER_HALF_OPEN: Final = "half_open"
+
+
+def poll_phase(key: str) -> float:
+    # Fraction of the poll interval, stable across restarts unlike the salted built-in hash
+    return crc32(key.encode()) / 2**32
+
+
+def staggered_delay(interval: float, phase: float, now: float) -> float:
+    # Delay to the next slot at phase of the interval, slots of devices sharing the interval
+    # are spread evenly instead of all of them polling at once
+    delay = (phase * interval - now) % interval
+    return delay + interval if delay < interval * _MIN_SLOT_DELAY else delay
+
+
+# Picks the poll interval so that about one display step of change happens per poll
+class AdaptiveInterval:
+    def __init__(
+        self,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        precisions: Mapping[str, int],
+        initial: timedelta | None = None,
+    ):
+        self.steps = {key: 10.0**-precision for key, precision in precisions.items()}
+        self.interval = (initial or min_interval).total_seconds()
+        self.set_bounds(min_interval, max_interval)
+        self.rate = 0.0  # display steps per second
+        self._last: Mapping[str, Any] | None = None
+        self._last_time: float | None = None
+
+    def set_bounds(self, min_interval: timedelta, max_interval: timedelta) -> None:
+        # Learned rate of change is kept, only the interval is clamped into the new bounds
+        self.min_interval = min_interval.total_seconds()
+        self.max_interval = max(max_interval.total_seconds(), self.min_interval)
+        self.interval = min(max(self.interval, self.min_interval), self.max_interval)
+
+    def update(self, data: Mapping[str, Any], now: float) -> timedelta:
+        if self._last is not None and self._last_time is not None and now > self._last_time:
+            changed_steps = self._changed_steps(self._last, data)
+            sample_rate = changed_steps / (now - self._last_time)
+            self.rate = _RATE_SMOOTHING * sample_rate + (1 - _RATE_SMOOTHING) * self.rate
+
+            target = 1 / self.rate if self.rate > 0 else self.max_interval
+            target = min(target, self.interval * _MAX_GROWTH)
+            self.interval = min(max(target, self.min_interval), self.max_interval)
+        self._last = data
+        self._last_time = now
+        return timedelta(seconds=self.interval)
+
+    def _changed_steps(self, previous: Mapping[str, Any], current: Mapping[str, Any]) -> float:
+        # Largest change across probes and sensors, in display steps of that sensor
+        changed = 0.0
+        for probe, values in current.items():
+            previous_values = previous.get(probe)
+            if values is None or previous_values is None:
+                continue
+            for key, step in self.steps.items():
+                # Derived values may be undefined, e.g. dew point at 0% humidity
+                value, previous_value = values.get(key), previous_values.get(key)
+                if value is not None and previous_value is not None:
+                    changed = max(changed, abs(value - previous_value) / step)
+        return changed
+
+
+# Spaces out connection attempts to an unreachable device and stops them altogether after
+# repeated failures, an advertisement from the device re-arms a single attempt
+class CircuitBreaker:
+    def __init__(
+        self,
+        base: float = DEFAULT_BACKOFF_BASE,
+        max_delay: float = DEFAULT_BACKOFF_MAX,
+        threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        random: Random | None = None,
+    ):
+        self.base = base
+        self.max_delay = max_delay
+        self.threshold = threshold
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.retry_at: float | None = None
+        self._random = random or Random()
+
+    def allow(self, now: float) -> bool:
+        if self.state == BREAKER_OPEN:
+            return False
+        return self.retry_at is None or now >= self.retry_at
+
+    def record_success(self) -> None:
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.retry_at = None
+
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        # An open breaker still keeps the longest backoff, so a device that advertises but
+        # can't be connected is retried at most once per max delay after re-arming
+        if self.failures >= self.threshold:
+            self.state = BREAKER_OPEN
+            delay = self.max_delay
+        else:
+            self.state = BREAKER_BACKOFF
+            delay = min(self.base * 2 ** (self.failures - 1), self.max_delay)
+        # Equal jitter keeps devices that failed together from retrying in lockstep
+        self.retry_at = now + delay / 2 + self._random.uniform(0, delay / 2)
+
+    def rearm(self) -> None:
+        if self.state == BREAKER_OPEN:
+            self.state = BREAKER_HALF_OPEN
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        retry_in = max(self.retry_at - now, 0.0) if self.retry_at is not None else None
+        return {"state": self.state, "failures": self.failures, "retry_in": retry_in}
@@ -0,0 +1,68 @@
+from array import array
+from math import nan
+from struct import Struct
+from typing import Final, TypedDict
+
+from .metrics import saturation_vapor_pressure
+
+# Status frame: main temp @1, main humidity @3, external temp @7, external humidity @9,
+# values are int16 in 1/16 units, -1 when the external probe is not connected
+FRAME: Final = Struct("<xhhxxhh")
+FRAME_SIZE: Final = FRAME.size
+
+_VALUE_NONE: Final = -1
+
+# Advertised battery voltage is mapped linearly onto the usable range of the cells
+BATTERY_EMPTY_MV: Final = 2200
+BATTERY_FULL_MV: Final = 3000
+
+
+class DecodedFrames(TypedDict):
+    temperature_c: array[float]
+    humidity: array[float]
+    external: array[int]  # 1 when the external probe is connected
+    external_temperature_c: array[float]  # nan when the external probe is not connected
+    external_humidity: array[float]
+
+
+def calculate_vpd(temp_c: float, humidity: float) -> float:
+    # Calculate saturation vapor pressure (in kPa)
+    svp = saturation_vapor_pressure(temp_c)
+    # Calculate actual vapor pressure (in kPa)
+    avp = svp * (humidity / 100.0)
+    # VPD is the difference
+    return svp - avp
+
+
+def battery_percentage(millivolts: int) -> int:
+    level = (millivolts - BATTERY_EMPTY_MV) / (BATTERY_FULL_MV - BATTERY_EMPTY_MV)
+    return round(min(max(level, 0.0), 1.0) * 100)
+
+
+def decode_frames(buffer: bytes | bytearray | memoryview) -> DecodedFrames:
+    # Buffer holds back to back frames, each column is filled in a single pass, a trailing
+    # partial frame is ignored. Derived metrics are left to calculate_metrics_batch
+    count = len(buffer) // FRAME_SIZE
+    frames = DecodedFrames(
+        temperature_c=array("d", bytes(8 * count)),
+        humidity=array("d", bytes(8 * count)),
+        external=array("b", bytes(count)),
+        external_temperature_c=array("d", [nan]) * count,
+        external_humidity=array("d", [nan]) * count,
+    )
+    temperatures = frames["temperature_c"]
+    humidities = frames["humidity"]
+    external = frames["external"]
+    external_temperatures = frames["external_temperature_c"]
+    external_humidities = frames["external_humidity"]
+
+    for index, (temp, humidity, external_temp, external_humidity) in enumerate(
+        FRAME.iter_unpack(memoryview(buffer)[: count * FRAME_SIZE])
+    ):
+        temperatures[index] = temp / 16
+        humidities[index] = humidity / 16
+        if external_temp != _VALUE_NONE and external_humidity != _VALUE_NONE:
+            external[index] = 1
+            external_temperatures[index] = external_temp / 16
+            external_humidities[index] = external_humidity / 16
+    return frames
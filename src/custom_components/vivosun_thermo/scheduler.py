@@ -0,0 +1,98 @@
+from asyncio import Semaphore, sleep
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from logging import getLogger
+from time import monotonic
+from typing import Final
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_SCHEDULER, DOMAIN
+
+_LOGGER = getLogger(__name__)
+
+# ESPHome proxies allow 3 connections, keep one free for other integrations
+DEFAULT_MAX_CONNECTIONS: Final = 2
+# Minimal delay between two connection attempts through the same source
+DEFAULT_CONNECT_SPACING: Final = 0.5
+
+
+@dataclass
+class SourceStats:
+    queued: int = 0
+    active: int = 0
+    jobs: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    last_wait: float = 0.0
+
+
+class VivosunThermoConnectionScheduler:
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        connect_spacing: float = DEFAULT_CONNECT_SPACING,
+    ):
+        self.max_connections = max_connections
+        self.connect_spacing = connect_spacing
+        self._semaphores: dict[str, Semaphore] = {}
+        self._next_start: dict[str, float] = {}
+        self._stats: dict[str, SourceStats] = {}
+
+    @asynccontextmanager
+    async def async_slot(self, source: str, name: str) -> AsyncIterator[float]:
+        # Waits for a free connection slot on the source, yields the queue wait time
+        semaphore = self._semaphores.setdefault(source, Semaphore(self.max_connections))
+        stats = self._stats.setdefault(source, SourceStats())
+
+        queued_at = monotonic()
+        stats.queued += 1
+        dequeued = False
+        try:
+            async with semaphore:
+                # Reserve a start time synchronously so concurrent jobs are spread out
+                now = monotonic()
+                start_at = max(now, self._next_start.get(source, now))
+                self._next_start[source] = start_at + self.connect_spacing
+                if start_at > now:
+                    await sleep(start_at - now)
+
+                wait = monotonic() - queued_at
+                stats.queued -= 1
+                dequeued = True
+                stats.active += 1
+                stats.jobs += 1
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+                stats.last_wait = wait
+                _LOGGER.debug(f"Connection slot on {source} for {name} after {wait:.2f}s")
+                try:
+                    yield wait
+                finally:
+                    stats.active -= 1
+        finally:
+            # Cancelled while still waiting in the queue
+            if not dequeued:
+                stats.queued -= 1
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {
+            source: {
+                "queued": stats.queued,
+                "active": stats.active,
+                "jobs": stats.jobs,
+                "avg_wait": stats.total_wait / stats.jobs if stats.jobs else 0.0,
+                "max_wait": stats.max_wait,
+                "last_wait": stats.last_wait,
+            }
+            for source, stats in self._stats.items()
+        }
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> VivosunThermoConnectionScheduler:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_SCHEDULER not in domain_data:
+        domain_data[DATA_SCHEDULER] = VivosunThermoConnectionScheduler()
+    return domain_data[DATA_SCHEDULER]
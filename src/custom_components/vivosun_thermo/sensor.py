@@ -1,17 +1,34 @@
 from datetime import date, datetime
 from decimal import Decimal
-from typing import override
+from time import monotonic
+from typing import Any, cast, override
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import RestoreSensor, SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DEVICE_TYPES, DOMAIN, PROBE_TYPES, SENSOR_TYPES
+from .const import (
+    CONF_STATE_DEADBAND,
+    CONF_STATE_HEARTBEAT,
+    DEVICE_TYPES,
+    DIAGNOSTIC_SENSOR_TYPES,
+    DOMAIN,
+    PROBE_TYPES,
+    ROLLING_SENSOR_TYPES,
+    SENSOR_TYPES,
+    VITAL_SENSOR_TYPES,
+    VITALS_INTERVAL,
+)
 from .coordinator import VivosunThermoSensorCoordinator
+from .telemetry import PHASE_CONNECT, PHASE_CYCLE
+
+# Telemetry phases behind time sensors, their rolling percentiles go into attributes
+_DIAGNOSTIC_PHASES = {"cycle_time": PHASE_CYCLE, "connect_time": PHASE_CONNECT}
 
 
 async def async_setup_entry(
@@ -19,17 +36,69 @@ async def async_setup_entry(
 ) -> None:
     coordinator: VivosunThermoSensorCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities = [
-        VivosunThermoSensor(coordinator, probe_type, sensor_type, entry)
-        for sensor_type in SENSOR_TYPES
-        for probe_type in PROBE_TYPES
-        if coordinator.data.get(probe_type) is not None
+    # First read runs in the background, probes seen before are known from the entity registry
+    probes = {"main"} | _registered_probes(hass, entry) | _probes_with_data(coordinator)
+
+    def probe_entities(probe_types: set[str]) -> list[SensorEntity]:
+        return [
+            sensor_class(coordinator, probe_type, sensor_type, entry)
+            for sensor_class in (VivosunThermoSensor, VivosunThermoRollingSensor)
+            for sensor_type in sensor_class.sensor_types
+            for probe_type in PROBE_TYPES
+            if probe_type in probe_types
+        ]
+
+    entities = probe_entities(probes)
+    entities += [
+        VivosunThermoDiagnosticSensor(coordinator, sensor_type)
+        for sensor_type in DIAGNOSTIC_SENSOR_TYPES
+    ]
+    entities += [
+        VivosunThermoVitalSensor(coordinator, sensor_type) for sensor_type in VITAL_SENSOR_TYPES
     ]
 
     async_add_entities(entities)
 
+    @callback
+    def _async_add_new_probes() -> None:
+        # External probe plugged in for the first time
+        new_probes = _probes_with_data(coordinator) - probes
+        if new_probes:
+            probes.update(new_probes)
+            async_add_entities(probe_entities(new_probes))
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_probes))
+
+
+def _registered_probes(hass: HomeAssistant, entry: ConfigEntry) -> set[str]:
+    entity_registry = er.async_get(hass)
+    return {
+        probe_type
+        for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id)
+        for probe_type in PROBE_TYPES
+        if f"-{probe_type}-" in (entity.unique_id or "")
+    }
+
+
+def _probes_with_data(coordinator: VivosunThermoSensorCoordinator) -> set[str]:
+    data = coordinator.data or {}
+    return {probe_type for probe_type in PROBE_TYPES if data.get(probe_type) is not None}
+
+
+def _device_info(coordinator: VivosunThermoSensorCoordinator) -> DeviceInfo:
+    device_info = DEVICE_TYPES.get(coordinator.discovery_name, {})
+    return DeviceInfo(
+        identifiers={(DOMAIN, coordinator.discovery_address)},
+        name=device_info.get("name", coordinator.discovery_name),
+        manufacturer=device_info.get("manufacturer"),
+        model=device_info.get("model"),
+    )
+
+
+class VivosunThermoSensor(CoordinatorEntity, RestoreSensor):
+    coordinator: VivosunThermoSensorCoordinator
+    sensor_types: dict[str, dict[str, Any]] = SENSOR_TYPES
 
-class VivosunThermoSensor(CoordinatorEntity, SensorEntity):
     def __init__(
         self,
         coordinator: VivosunThermoSensorCoordinator,
@@ -42,12 +111,7 @@ class VivosunThermoSensor(CoordinatorEntity, SensorEntity):
         self.probe_type: str = probe_type
         self.sensor_type: str = sensor_type
 
-        sensor_info = SENSOR_TYPES[sensor_type]
-        device_info = DEVICE_TYPES.get(coordinator.discovery_name, {})
-
-        device_name = device_info.get("name", coordinator.discovery_name)
-        device_manufacturer = device_info.get("manufacturer")
-        device_model = device_info.get("model")
+        sensor_info = self.sensor_types[sensor_type]
 
         self._attr_name = f"{coordinator.name} {probe_type.capitalize()} {sensor_info['name']}"
         self._attr_icon = sensor_info["icon"]
@@ -58,20 +122,179 @@ class VivosunThermoSensor(CoordinatorEntity, SensorEntity):
         self._attr_suggested_display_precision = sensor_info["precision"]
         self._attr_unique_id = f"{coordinator.discovery_name}-{coordinator.discovery_address}-{probe_type}-{sensor_type}"
         self._attr_should_poll = False
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.discovery_address)},
-            name=device_name,
-            manufacturer=device_manufacturer,
-            model=device_model,
-        )
+        self._attr_device_info = _device_info(coordinator)
+
+        self._written_value: float | None = None
+        self._written_available: bool | None = None
+        self._written_at = 0.0
+        self._restored_value: float | None = None
+
+    @override
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last_sensor_data = await self.async_get_last_sensor_data()
+        if last_sensor_data is not None:
+            self._restored_value = cast(float | None, last_sensor_data.native_value)
 
     @property
     @override
     def native_value(self) -> StateType | date | datetime | Decimal:  # type: ignore
-        probe_data = self.coordinator.data.get(self.probe_type, {})
+        # Last known value is shown until the first reading arrives
+        if not self.coordinator.data:
+            return self._restored_value
+        probe_data = self.coordinator.data.get(self.probe_type) or {}
         return probe_data.get(self.sensor_type)
 
+    @callback
+    @override
+    def _handle_coordinator_update(self) -> None:
+        if self._state_changed():
+            super()._handle_coordinator_update()
+
+    def _state_changed(self) -> bool:
+        # Only changes visible at display precision beyond the deadband reach the state machine
+        value = cast(float | None, self.native_value)
+        available = self.available
+        now = monotonic()
+        heartbeat = self.coordinator.options[CONF_STATE_HEARTBEAT]
+        written = self._written_value
+        changed = (
+            available != self._written_available
+            or value is None
+            or written is None
+            or (heartbeat > 0 and now - self._written_at >= heartbeat)
+            or self._steps_between(value, written) > self.coordinator.options[CONF_STATE_DEADBAND]
+        )
+        if changed:
+            self._written_value = value
+            self._written_available = available
+            self._written_at = now
+        return changed
+
+    def _steps_between(self, value: float, written: float) -> int:
+        precision = self._attr_suggested_display_precision or 0
+        return abs(round(value * 10**precision) - round(written * 10**precision))
+
     @property
     @override
     def available(self) -> bool:  # type: ignore
+        if not self.coordinator.present:
+            return False
+        if not self.coordinator.data:
+            # Restored state only stands in until the first refresh attempt finishes
+            return self._restored_value is not None and not self.coordinator.refreshed
+        if not self.coordinator.last_update_success:
+            return False
         return self.coordinator.data.get(self.probe_type) is not None
+
+
+class VivosunThermoRollingSensor(VivosunThermoSensor):
+    sensor_types = ROLLING_SENSOR_TYPES
+
+    def __init__(
+        self,
+        coordinator: VivosunThermoSensorCoordinator,
+        probe_type: str,
+        sensor_type: str,
+        entry: ConfigEntry,
+    ) -> None:
+        super().__init__(coordinator, probe_type, sensor_type, entry)
+
+        sensor_info = ROLLING_SENSOR_TYPES[sensor_type]
+        self.key: str = sensor_info["key"]
+        self.statistic: str = sensor_info["statistic"]
+        # Several per reading, most setups only need a few of them
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    @override
+    def native_value(self) -> StateType | date | datetime | Decimal:  # type: ignore
+        if not self.coordinator.data:
+            return self._restored_value
+        return self.coordinator.rolling[self.probe_type].statistic(self.key, self.statistic)
+
+
+class VivosunThermoDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    coordinator: VivosunThermoSensorCoordinator
+    sensor_types: dict[str, dict[str, Any]] = DIAGNOSTIC_SENSOR_TYPES
+
+    def __init__(self, coordinator: VivosunThermoSensorCoordinator, sensor_type: str) -> None:
+        super().__init__(coordinator)
+
+        self.sensor_type: str = sensor_type
+
+        sensor_info = self.sensor_types[sensor_type]
+
+        self._attr_name = f"{coordinator.name} {sensor_info['name']}"
+        self._attr_icon = sensor_info["icon"]
+        self._attr_device_class = sensor_info["device_class"]
+        self._attr_state_class = sensor_info["state_class"]
+        self._attr_entity_category = sensor_info["entity_category"]
+        self._attr_native_unit_of_measurement = sensor_info["native_unit_of_measurement"]
+        self._attr_suggested_display_precision = sensor_info["precision"]
+        self._attr_unique_id = (
+            f"{coordinator.discovery_name}-{coordinator.discovery_address}-{sensor_type}"
+        )
+        self._attr_should_poll = False
+        self._attr_device_info = _device_info(coordinator)
+
+    @property
+    @override
+    def native_value(self) -> StateType | date | datetime | Decimal:  # type: ignore
+        return getattr(self.coordinator.telemetry, self.sensor_type)
+
+    @property
+    @override
+    def available(self) -> bool:  # type: ignore
+        return self.native_value is not None
+
+    @property
+    @override
+    def extra_state_attributes(self) -> dict[str, Any] | None:  # type: ignore
+        if self.sensor_type == "failure_rate":
+            breaker = self.coordinator.breaker.as_dict(monotonic())
+            return {f"breaker_{key}": value for key, value in breaker.items()}
+        phase = _DIAGNOSTIC_PHASES.get(self.sensor_type)
+        stats = self.coordinator.telemetry.phases.get(phase) if phase else None
+        if stats is None:
+            return None
+        return {"p50": stats.percentile(50), "p95": stats.percentile(95), "count": stats.count}
+
+
+class VivosunThermoVitalSensor(VivosunThermoDiagnosticSensor):
+    sensor_types = VITAL_SENSOR_TYPES
+
+    def __init__(self, coordinator: VivosunThermoSensorCoordinator, sensor_type: str) -> None:
+        super().__init__(coordinator, sensor_type)
+
+        self._written_value: StateType = None
+        self._written_at: float | None = None
+
+    @property
+    @override
+    def native_value(self) -> StateType | date | datetime | Decimal:  # type: ignore
+        return self.coordinator.vitals[self.sensor_type]
+
+    @property
+    @override
+    def extra_state_attributes(self) -> dict[str, Any] | None:  # type: ignore
+        if self.sensor_type == "battery":
+            return {"voltage": self.coordinator.battery_voltage}
+        return None
+
+    @callback
+    @override
+    def _handle_coordinator_update(self) -> None:
+        # Vitals change with every advertisement, readings must not drag their writes along
+        value = cast(StateType, self.native_value)
+        now = monotonic()
+        if value == self._written_value or (
+            self._written_at is not None
+            and self._written_value is not None
+            and value is not None
+            and now - self._written_at < VITALS_INTERVAL.total_seconds()
+        ):
+            return
+        self._written_value = value
+        self._written_at = now
+        super()._handle_coordinator_update()
@@ -0,0 +1,172 @@
+from asyncio import Event, Future, Lock, get_running_loop, wait_for
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractContextManager, asynccontextmanager, nullcontext
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import TYPE_CHECKING, Any, Final
+
+from bleak.exc import BleakError
+
+from .telemetry import PHASE_NOTIFY, PHASE_SUBSCRIBE, PHASE_WRITE, VivosunThermoTelemetry
+
+if TYPE_CHECKING:
+    from bleak import BleakClient
+    from bleak.backends.characteristic import BleakGATTCharacteristic
+
+_LOGGER = getLogger(__name__)
+
+DEFAULT_REQUEST_TIMEOUT: Final = 1.0
+
+NotificationCallback = Callable[[Any, bytearray], None]
+
+
+@dataclass
+class _Request:
+    opcode: int | None
+    complete: Callable[[list[bytearray]], bool] | None
+    future: Future[list[bytearray]]
+    frames: list[bytearray] = field(default_factory=list)
+    arrived: Event = field(default_factory=Event)
+
+
+# Commands and their notifications over one subscription of an open connection. Responses
+# go to the pending request with a matching opcode, frames without a known opcode go to the
+# oldest request that didn't ask for one, e.g. status reads
+class VivosunThermoSession:
+    def __init__(
+        self,
+        client: "BleakClient",
+        command_char: "BleakGATTCharacteristic | str",
+        status_char: "BleakGATTCharacteristic | str",
+        telemetry: VivosunThermoTelemetry | None = None,
+        unsolicited: NotificationCallback | None = None,
+    ):
+        self.client = client
+        self.command_char = command_char
+        self.status_char = status_char
+        self.telemetry = telemetry or VivosunThermoTelemetry()
+        self.unsolicited = unsolicited
+        self._pending: list[_Request] = []
+        self._opcodes: set[int] = set()
+        self._write_lock = Lock()
+        self._started = False
+
+    async def __aenter__(self) -> "VivosunThermoSession":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        with self.telemetry.phase(PHASE_SUBSCRIBE):
+            await self.client.start_notify(self.status_char, self._handle_notification)
+        self._started = True
+
+    async def close(self) -> None:
+        self.abort()
+        if not self._started:
+            return
+        self._started = False
+        if not self.client.is_connected:
+            return
+        try:
+            await self.client.stop_notify(self.status_char)
+        except BleakError as err:
+            # The session is over either way, a failed unsubscribe must not hide the result
+            _LOGGER.debug(f"Failed to unsubscribe: {err}")
+
+    def abort(self) -> None:
+        # Fail pending requests right away, e.g. when the connection dropped
+        for request in self._pending:
+            if not request.future.done():
+                request.future.set_exception(BleakError("Session closed"))
+            request.arrived.set()
+        self._pending.clear()
+
+    async def request(
+        self,
+        command: bytes | bytearray,
+        opcode: int | None = None,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        timed: bool = True,
+    ) -> bytearray:
+        frames = await self.request_frames(command, opcode, None, timeout, timed)
+        return frames[0]
+
+    async def request_frames(
+        self,
+        command: bytes | bytearray,
+        opcode: int | None = None,
+        complete: Callable[[list[bytearray]], bool] | None = None,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        timed: bool = True,
+    ) -> list[bytearray]:
+        # Without a completion check the first matching frame completes the request
+        request = _Request(opcode, complete, get_running_loop().create_future())
+        async with self._send(command, request, timed):
+            with self._phase(PHASE_NOTIFY, timed):
+                return await wait_for(request.future, timeout)
+
+    async def request_stream(
+        self,
+        command: bytes | bytearray,
+        opcode: int | None,
+        complete: Callable[[list[bytearray]], bool],
+        frame_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        timed: bool = True,
+    ) -> list[bytearray]:
+        # The timeout restarts with every frame, a stream that stalls returns the frames that
+        # arrived so far instead of failing
+        request = _Request(opcode, complete, get_running_loop().create_future())
+        async with self._send(command, request, timed):
+            with self._phase(PHASE_NOTIFY, timed):
+                while not request.future.done():
+                    try:
+                        await wait_for(request.arrived.wait(), frame_timeout)
+                    except TimeoutError:
+                        return request.frames
+                    request.arrived.clear()
+                return request.future.result()
+
+    @asynccontextmanager
+    async def _send(
+        self, command: bytes | bytearray, request: _Request, timed: bool
+    ) -> AsyncIterator[None]:
+        try:
+            # Requests are queued in the order the device receives their commands
+            async with self._write_lock:
+                if request.opcode is not None:
+                    self._opcodes.add(request.opcode)
+                self._pending.append(request)
+                with self._phase(PHASE_WRITE, timed):
+                    await self.client.write_gatt_char(self.command_char, command)
+            yield
+        finally:
+            if request in self._pending:
+                self._pending.remove(request)
+
+    def _phase(self, name: str, timed: bool) -> AbstractContextManager[None]:
+        return self.telemetry.phase(name) if timed else nullcontext()
+
+    def _handle_notification(self, sender: Any, data: bytearray) -> None:
+        request = self._match(data)
+        if request is None:
+            if data and data[0] in self._opcodes:
+                _LOGGER.debug(f"Dropping late response {data.hex()}")
+            elif self.unsolicited is not None:
+                self.unsolicited(sender, data)
+            return
+        request.frames.append(data)
+        request.arrived.set()
+        if request.complete is None or request.complete(request.frames):
+            self._pending.remove(request)
+            # Request may have just timed out
+            if not request.future.done():
+                request.future.set_result(request.frames)
+
+    def _match(self, data: bytearray) -> _Request | None:
+        opcode = data[0] if data else None
+        if opcode in self._opcodes:
+            return next((request for request in self._pending if request.opcode == opcode), None)
+        return next((request for request in self._pending if request.opcode is None), None)
@@ -0,0 +1,155 @@
+from bisect import bisect_left
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from time import monotonic
+from typing import Any, Final
+
+# Upper bounds of histogram buckets in seconds, the last bucket catches everything slower
+HISTOGRAM_BUCKETS: Final = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Number of most recent samples kept per phase
+WINDOW_SIZE: Final = 100
+# Number of most recent frames, cycle traces and errors kept for diagnostics
+TRACE_SIZE: Final = 20
+
+PHASE_CYCLE: Final = "cycle"
+PHASE_CONNECT: Final = "connect"
+PHASE_SERVICES: Final = "services"
+PHASE_SUBSCRIBE: Final = "subscribe"
+PHASE_WRITE: Final = "write"
+PHASE_NOTIFY: Final = "notify"
+
+
+# Durations and outcomes of the last WINDOW_SIZE runs of a phase with bucket counts
+# maintained incrementally, so recording a sample is O(1) regardless of uptime
+class PhaseStats:
+    def __init__(self, window_size: int = WINDOW_SIZE):
+        self.count = 0
+        self.failures = 0
+        self.last: float | None = None
+        self.last_failed = False
+        self._samples: deque[tuple[float, bool]] = deque(maxlen=window_size)
+        self._buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self._window_failures = 0
+
+    def record(self, duration: float, failed: bool) -> None:
+        if len(self._samples) == self._samples.maxlen:
+            evicted, evicted_failed = self._samples[0]
+            self._buckets[bisect_left(HISTOGRAM_BUCKETS, evicted)] -= 1
+            self._window_failures -= evicted_failed
+        self._samples.append((duration, failed))
+        self._buckets[bisect_left(HISTOGRAM_BUCKETS, duration)] += 1
+        self._window_failures += failed
+        self.count += 1
+        self.failures += failed
+        self.last = duration
+        self.last_failed = failed
+
+    @property
+    def failure_rate(self) -> float | None:
+        return self._window_failures / len(self._samples) if self._samples else None
+
+    @property
+    def histogram(self) -> dict[str, int]:
+        labels = [f"le_{bound}" for bound in HISTOGRAM_BUCKETS] + ["inf"]
+        return dict(zip(labels, self._buckets))
+
+    def percentile(self, percent: float) -> float | None:
+        if not self._samples:
+            return None
+        durations = sorted(duration for duration, _ in self._samples)
+        return durations[min(int(len(durations) * percent / 100), len(durations) - 1)]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "last": self.last,
+            "last_failed": self.last_failed,
+            "failure_rate": self.failure_rate,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "histogram": self.histogram,
+        }
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+class VivosunThermoTelemetry:
+    def __init__(self, trace_size: int = TRACE_SIZE):
+        self.phases: dict[str, PhaseStats] = {}
+        self.rssi: int | None = None
+        self.source: str | None = None
+        # Bounded so that the memory cost is fixed regardless of uptime
+        self.frames: deque[dict[str, Any]] = deque(maxlen=trace_size)
+        self.cycles: deque[dict[str, Any]] = deque(maxlen=trace_size)
+        self.errors: deque[dict[str, Any]] = deque(maxlen=trace_size)
+        self._cycle: dict[str, Any] | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stats = self.phases.setdefault(name, PhaseStats())
+        if name == PHASE_CYCLE:
+            self._cycle = {"time": _now(), "phases": {}}
+        started = monotonic()
+        try:
+            yield
+        except Exception as err:
+            self._end_phase(name, stats, monotonic() - started, err)
+            raise
+        self._end_phase(name, stats, monotonic() - started, None)
+
+    def _end_phase(
+        self, name: str, stats: PhaseStats, duration: float, err: Exception | None
+    ) -> None:
+        stats.record(duration, err is not None)
+        cycle = self._cycle
+        if cycle is None:
+            return
+        cycle["phases"][name] = duration
+        # Innermost phase fails first, that is where the error belongs
+        if err is not None and "failed_phase" not in cycle:
+            cycle["failed_phase"] = name
+            cycle["error"] = repr(err)
+            self.errors.append({"time": cycle["time"], "phase": name, "error": repr(err)})
+        if name == PHASE_CYCLE:
+            cycle["source"] = self.source
+            cycle["rssi"] = self.rssi
+            self.cycles.append(cycle)
+            self._cycle = None
+
+    def record_frame(self, kind: str, data: bytes | bytearray, decoded: Any) -> None:
+        self.frames.append({"time": _now(), "kind": kind, "hex": data.hex(), "decoded": decoded})
+
+    def last(self, name: str) -> float | None:
+        stats = self.phases.get(name)
+        return stats.last if stats is not None else None
+
+    @property
+    def cycle_time(self) -> float | None:
+        return self.last(PHASE_CYCLE)
+
+    @property
+    def connect_time(self) -> float | None:
+        return self.last(PHASE_CONNECT)
+
+    @property
+    def failure_rate(self) -> float | None:
+        # Percentage of failed cycles among the recent ones
+        stats = self.phases.get(PHASE_CYCLE)
+        rate = stats.failure_rate if stats is not None else None
+        return rate * 100 if rate is not None else None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rssi": self.rssi,
+            "source": self.source,
+            "phases": {name: stats.as_dict() for name, stats in self.phases.items()},
+            "sources": dict(Counter(cycle["source"] for cycle in self.cycles)),
+            "recent_frames": list(self.frames),
+            "recent_cycles": list(self.cycles),
+            "recent_errors": list(self.errors),
+        }
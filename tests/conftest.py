@@ -1,64 +1,95 @@
 """Test fixtures for vivosun_thermo integration."""
 
 import sys
-import types
-from pathlib import Path
+from time import monotonic
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
-# Mock pycares for python 3.13 (works fine as is on 3.14)
-pycares = types.ModuleType("pycares")
-pycares.ares_query_a_result = object  # type: ignore
-pycares.ares_query_aaaa_result = object  # type: ignore
-pycares.ares_query_cname_result = object  # type: ignore
-pycares.ares_query_mx_result = object  # type: ignore
-pycares.ares_query_ns_result = object  # type: ignore
-pycares.ares_query_ptr_result = object  # type: ignore
-pycares.ares_query_srv_result = object  # type: ignore
-pycares.ares_query_txt_result = object  # type: ignore
-sys.modules["pycares"] = pycares
+from . import platform_stubs  # noqa: F401
 
 
 # Mock DataUpdateCoordinator to avoid event loop issues
 class MockDataUpdateCoordinator:
     """Mock DataUpdateCoordinator that doesn't require event loop."""
 
-    def __init__(self, hass, logger, *, name, update_interval, update_method):
+    def __init__(self, hass, logger, *, name, update_interval, update_method, always_update=True):
         self.hass = hass
         self.logger = logger
         self.name = name
         self.update_interval = update_interval
         self._update_method = update_method
+        self.always_update = always_update
         self.data = {}
+        self.last_update_success = True
+        self._listeners = []
 
     async def async_config_entry_first_refresh(self):
         """Mock first refresh."""
         self.data = await self._update_method()
 
     async def async_refresh(self):
-        """Mock refresh."""
-        self.data = await self._update_method()
+        """Mock refresh, keeping data of a failed update like the real coordinator."""
+        previous_data, previous_success = self.data, self.last_update_success
+        try:
+            self.data = await self._update_method()
+        except MockUpdateFailed:
+            self.last_update_success = False
+        else:
+            self.last_update_success = True
+        # Without always_update, unchanged data of a successful update notifies nobody
+        if (
+            not self.always_update
+            and previous_success
+            and self.last_update_success
+            and self.data == previous_data
+        ):
+            return
+        self.async_update_listeners()
+
+    async def async_request_refresh(self):
+        """Mock refresh request."""
+        await self.async_refresh()
+
+    async def async_shutdown(self):
+        """Mock shutdown."""
+
+    def async_set_updated_data(self, data):
+        """Mock manual data update."""
+        self.data = data
+        self.last_update_success = True
+        self.async_update_listeners()
+
+    def async_add_listener(self, update_callback):
+        """Mock listener registration."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    def async_update_listeners(self):
+        """Mock listeners update."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+class MockUpdateFailed(Exception):
+    """Mock UpdateFailed."""
 
+    def __init__(self, *args, retry_after=None):
+        super().__init__(*args)
+        self.retry_after = retry_after
 
-# Mock hardware-specific modules before HA imports them
-serial_mock = Mock()
-serial_tools_mock = Mock()
-serial_tools_mock.__path__ = []  # Make it a package
-sys.modules["serial"] = serial_mock
-sys.modules["serial.tools"] = serial_tools_mock
-sys.modules["serial.tools.list_ports"] = Mock()
-sys.modules["serial.tools.list_ports_common"] = Mock()
-sys.modules["aiousbwatcher"] = Mock()
-sys.modules["usb_devices"] = Mock()
 
 # Mock HA helpers modules
 update_coordinator_mock = Mock()
 update_coordinator_mock.DataUpdateCoordinator = MockDataUpdateCoordinator
+update_coordinator_mock.UpdateFailed = MockUpdateFailed
 update_coordinator_mock.CoordinatorEntity = type(
     "CoordinatorEntity",
     (),
-    {"__init__": lambda self, coordinator: setattr(self, "coordinator", coordinator)},
+    {
+        "__init__": lambda self, coordinator: setattr(self, "coordinator", coordinator),
+        "_handle_coordinator_update": lambda self: self.async_write_ha_state(),
+    },
 )
 sys.modules["homeassistant.helpers.update_coordinator"] = update_coordinator_mock
 sys.modules["homeassistant.helpers.frame"] = Mock()
@@ -83,25 +114,105 @@ class BluetoothServiceInfoBleak:
             setattr(self, key, value)
 
 
-# Add src directory to path for imports
-src_path = Path(__file__).parent.parent / "src"
-sys.path.insert(0, str(src_path))
+from custom_components.vivosun_thermo.const import (  # noqa: E402
+    DATA_SCHEDULER,
+    DOMAIN,
+    ConfigEntryData,
+)
+from custom_components.vivosun_thermo.coordinator import (  # noqa: E402
+    _BLE_COMMAND_UUID,
+    _BLE_STATUS_UUID,
+)
+from custom_components.vivosun_thermo.scheduler import (  # noqa: E402
+    VivosunThermoConnectionScheduler,
+)
+
+from .helpers import make_characteristic, make_scanner_device  # noqa: E402
 
-from custom_components.vivosun_thermo.const import ConfigEntryData  # noqa: E402
+
+@pytest.fixture(autouse=True)
+def mock_bluetooth():
+    """Mock HA bluetooth lookups, the device is heard by a single local adapter."""
+    scanner_device = make_scanner_device()
+    with (
+        patch(
+            "custom_components.vivosun_thermo.coordinator.async_scanner_devices_by_address",
+            return_value=[scanner_device],
+        ) as mock_devices,
+        patch(
+            "custom_components.vivosun_thermo.coordinator.async_ble_device_from_address",
+            return_value=scanner_device.ble_device,
+        ),
+        patch(
+            "custom_components.vivosun_thermo.coordinator.async_last_service_info",
+            side_effect=lambda *args, **kwargs: MagicMock(time=monotonic(), rssi=-60),
+        ),
+    ):
+        yield mock_devices
+
+
+@pytest.fixture(autouse=True)
+def mock_entity_registry():
+    """Mock HA entity registry, yields entries registered for the config entry."""
+    entries = []
+    with (
+        patch("custom_components.vivosun_thermo.sensor.er.async_get"),
+        patch(
+            "custom_components.vivosun_thermo.sensor.er.async_entries_for_config_entry",
+            return_value=entries,
+        ),
+    ):
+        yield entries
+
+
+@pytest.fixture
+def mock_establish_connection():
+    """Mock retrying connector."""
+    with patch(
+        "bleak_retry_connector.establish_connection",
+        new_callable=AsyncMock,
+    ) as mock:
+        yield mock
 
 
 @pytest.fixture
-def mock_bleak_client():
-    """Mock BleakClient."""
-    with patch("custom_components.vivosun_thermo.coordinator.BleakClient") as mock:
-        client = MagicMock()
-        client.__aenter__ = AsyncMock(return_value=client)
-        client.__aexit__ = AsyncMock(return_value=None)
-        client.start_notify = AsyncMock()
-        client.stop_notify = AsyncMock()
-        client.write_gatt_char = AsyncMock()
-        mock.return_value = client
-        yield client
+def simulated_device(mock_establish_connection):
+    """Simulated device behind the retrying connector."""
+    from .simulator import SimulatedDevice
+
+    device = SimulatedDevice()
+    mock_establish_connection.side_effect = device.establish_connection
+    yield device
+
+
+@pytest.fixture
+def mock_bleak_client(mock_establish_connection):
+    """Mock connected BleakClient."""
+    characteristics = {}
+    for uuid, handle in ((_BLE_COMMAND_UUID, 0x10), (_BLE_STATUS_UUID, 0x0C)):
+        characteristics[uuid] = characteristics[handle] = make_characteristic(uuid, handle)
+
+    client = MagicMock()
+    client.is_connected = True
+    client.services.get_characteristic.side_effect = characteristics.get
+    client.clear_cache = AsyncMock()
+    client.disconnect = AsyncMock()
+    client.stop_notify = AsyncMock()
+    # Every command is answered with the frames in responses through the subscribed callback
+    client.responses = []
+    handlers = {}
+
+    async def start_notify(char, callback):
+        handlers["status"] = callback
+
+    async def write_gatt_char(char, data, response=None):
+        for frame in client.responses:
+            handlers["status"](None, frame)
+
+    client.start_notify = AsyncMock(side_effect=start_notify)
+    client.write_gatt_char = AsyncMock(side_effect=write_gatt_char)
+    mock_establish_connection.return_value = client
+    yield client
 
 
 @pytest.fixture
@@ -181,11 +292,21 @@ def valid_sensor_data_main_only():
     )
 
 
+@pytest.fixture
+def valid_advertisement_data():
+    """Valid manufacturer data from advertisement (company id stripped)."""
+    data = bytearray(18)
+    data[10:12] = bytes([0x68, 0x01])  # 10-11: Main temp = 360 (22.5°C)
+    data[12:14] = bytes([0x10, 0x04])  # 12-13: Main humidity = 1040 (65.0%)
+    return bytes(data)
+
+
 @pytest.fixture
 def hass():
     """Create mock Home Assistant instance."""
     hass = MagicMock()
-    hass.data = {}
+    # No spacing between connections to keep tests fast
+    hass.data = {DOMAIN: {DATA_SCHEDULER: VivosunThermoConnectionScheduler(connect_spacing=0)}}
     hass.config_entries = MagicMock()
     hass.config_entries.async_forward_entry_setups = AsyncMock(return_value=True)
     hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
@@ -0,0 +1,23 @@
+"""Helpers shared by tests and benchmarks, usable without pytest."""
+
+from unittest.mock import MagicMock
+
+
+def make_scanner_device(source="local", rssi=-60, free_slots=None):
+    """Create a device as seen by a bluetooth adapter or proxy."""
+    device = MagicMock()
+    device.scanner.source = source
+    device.scanner.get_allocations.return_value = (
+        None if free_slots is None else MagicMock(free=free_slots)
+    )
+    device.advertisement.rssi = rssi
+    device.ble_device.address = "AA:BB:CC:DD:EE:FF"
+    return device
+
+
+def make_characteristic(uuid, handle):
+    """Create a GATT characteristic."""
+    characteristic = MagicMock()
+    characteristic.uuid = uuid
+    characteristic.handle = handle
+    return characteristic
@@ -0,0 +1,38 @@
+"""Stubs of platform modules Home Assistant imports, shared by tests and benchmarks.
+
+Importing this module replaces them in sys.modules, so it has to come before any Home
+Assistant import. Home Assistant itself is left alone.
+"""
+
+import sys
+import types
+from pathlib import Path
+from unittest.mock import Mock
+
+# Mock pycares for python 3.13 (works fine as is on 3.14)
+pycares = types.ModuleType("pycares")
+pycares.ares_query_a_result = object  # type: ignore
+pycares.ares_query_aaaa_result = object  # type: ignore
+pycares.ares_query_cname_result = object  # type: ignore
+pycares.ares_query_mx_result = object  # type: ignore
+pycares.ares_query_ns_result = object  # type: ignore
+pycares.ares_query_ptr_result = object  # type: ignore
+pycares.ares_query_srv_result = object  # type: ignore
+pycares.ares_query_txt_result = object  # type: ignore
+sys.modules["pycares"] = pycares
+
+
+# Mock hardware-specific modules before HA imports them
+serial_mock = Mock()
+serial_tools_mock = Mock()
+serial_tools_mock.__path__ = []  # Make it a package
+sys.modules["serial"] = serial_mock
+sys.modules["serial.tools"] = serial_tools_mock
+sys.modules["serial.tools.list_ports"] = Mock()
+sys.modules["serial.tools.list_ports_common"] = Mock()
+sys.modules["aiousbwatcher"] = Mock()
+sys.modules["usb_devices"] = Mock()
+
+# Add src directory to path for imports
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
@@ -0,0 +1,225 @@
+"""Simulated VIVOSUN THB1S device speaking the GATT protocol through a fake BleakClient."""
+
+from asyncio import Task, get_running_loop, sleep
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from math import pi, sin
+from random import Random
+from struct import pack
+from unittest.mock import MagicMock
+
+from bleak.exc import BleakError
+
+from custom_components.vivosun_thermo.coordinator import (
+    _BLE_COMMAND_UUID,
+    _BLE_SENSOR_COMMAND,
+    _BLE_STATUS_UUID,
+)
+
+from .helpers import make_characteristic
+
+COMMAND_HANDLE = 0x10
+STATUS_HANDLE = 0x0C
+
+_HISTORY_COUNT_COMMAND = 0x01
+_HISTORY_DUMP_COMMAND = 0x07
+_HISTORY_RECORDS_PER_FRAME = 3
+
+
+@dataclass
+class Trace:
+    """Day cycle with noise, value = base + amplitude * sin(2 pi t / period) + noise."""
+
+    base: float
+    amplitude: float
+    period: float = 86400.0
+    noise: float = 0.0
+    phase: float = 0.0
+
+    def value(self, time: float, random: Random) -> float:
+        """Value at given time in seconds."""
+        cycle = sin(2 * pi * (time / self.period + self.phase))
+        return self.base + self.amplitude * cycle + random.gauss(0, self.noise)
+
+
+@dataclass
+class Faults:
+    """Faults injected into the simulated radio link."""
+
+    latency: float = 0.0  # seconds before each notification
+    connect_latency: float = 0.0  # seconds to establish a connection
+    loss: float = 0.0  # probability a notification is dropped
+    duplicate: float = 0.0  # probability a notification is sent twice
+    disconnect: float = 0.0  # probability the link drops on a write
+    connect_failure: float = 0.0  # probability a connection attempt fails
+
+
+def main_traces():
+    """Traces of a grow tent with lights on during the day."""
+    return Trace(24.0, 3.0, noise=0.05), Trace(60.0, -10.0, noise=0.3)
+
+
+@dataclass
+class SimulatedDevice:
+    """THB1S answering status and history commands with plausible readings."""
+
+    address: str = "AA:BB:CC:DD:EE:FF"
+    temperature: Trace = field(default_factory=lambda: main_traces()[0])
+    humidity: Trace = field(default_factory=lambda: main_traces()[1])
+    external_temperature: Trace | None = None
+    external_humidity: Trace | None = None
+    faults: Faults = field(default_factory=Faults)
+    history: list[tuple[float, float]] = field(default_factory=list)
+    seed: int = 0
+    clock: Callable[[], float] | None = None
+
+    def __post_init__(self):
+        """Initialize counters."""
+        self.random = Random(self.seed)
+        self.connections = 0
+        self.active_connections = 0
+        self.max_active_connections = 0
+        self.commands: list[bytes] = []
+        self.notifications = 0
+        self.clients: list["SimulatedBleakClient"] = []
+
+    def now(self) -> float:
+        """Simulated time in seconds."""
+        return self.clock() if self.clock else get_running_loop().time()
+
+    def status_frame(self) -> bytearray:
+        """Encode current readings as a status frame."""
+        now = self.now()
+        temp = round(self.temperature.value(now, self.random) * 16)
+        humidity = round(min(max(self.humidity.value(now, self.random), 0), 100) * 16)
+        external_temp = external_humidity = -1
+        if self.external_temperature is not None and self.external_humidity is not None:
+            external_temp = round(self.external_temperature.value(now, self.random) * 16)
+            external_humidity = round(
+                min(max(self.external_humidity.value(now, self.random), 0), 100) * 16
+            )
+        return bytearray(pack("<xhhxxhh", temp, humidity, external_temp, external_humidity))
+
+    def history_frames(self, start: int, count: int) -> list[bytearray]:
+        """Encode stored records the way the device streams them."""
+        records = self.history[start : start + count]
+        frames = []
+        for offset in range(0, len(records), _HISTORY_RECORDS_PER_FRAME):
+            chunk = records[offset : offset + _HISTORY_RECORDS_PER_FRAME]
+            frame = bytearray([_HISTORY_DUMP_COMMAND, *(start + offset).to_bytes(3, "little")])
+            frame.append(len(chunk))
+            for temp, humidity in chunk:
+                frame += pack("<hh", round(temp * 16), round(humidity * 16))
+            frames.append(frame)
+        return frames
+
+    def responses(self, command: bytes) -> list[bytearray]:
+        """Notifications the device sends in response to a command."""
+        if command == bytes(_BLE_SENSOR_COMMAND):
+            return [self.status_frame()]
+        if command[0] == _HISTORY_COUNT_COMMAND:
+            return [bytearray([_HISTORY_COUNT_COMMAND, *len(self.history).to_bytes(4, "little")])]
+        if command[0] == _HISTORY_DUMP_COMMAND:
+            return self.history_frames(int.from_bytes(command[1:4], "little"), command[4])
+        return []
+
+    async def establish_connection(
+        self, client_class, device, name, disconnected_callback=None, **kwargs
+    ):
+        """Drop-in replacement of bleak_retry_connector.establish_connection."""
+        if self.faults.connect_latency:
+            await sleep(self.faults.connect_latency)
+        if self.random.random() < self.faults.connect_failure:
+            raise BleakError(f"Failed to connect to {name}")
+        client = SimulatedBleakClient(self, disconnected_callback)
+        self.connections += 1
+        self.active_connections += 1
+        self.max_active_connections = max(self.max_active_connections, self.active_connections)
+        self.clients.append(client)
+        return client
+
+
+class SimulatedBleakClient:
+    """Connected client of a simulated device."""
+
+    def __init__(self, device: SimulatedDevice, disconnected_callback=None):
+        """Initialize client."""
+        self.device = device
+        self.disconnected_callback = disconnected_callback
+        self.is_connected = True
+        self._handlers: dict[str, Callable] = {}
+        self._tasks: set[Task] = set()
+        characteristics = {}
+        for uuid, handle in (
+            (_BLE_COMMAND_UUID, COMMAND_HANDLE),
+            (_BLE_STATUS_UUID, STATUS_HANDLE),
+        ):
+            characteristics[uuid] = characteristics[handle] = make_characteristic(uuid, handle)
+        self.services = MagicMock()
+        self.services.get_characteristic.side_effect = characteristics.get
+
+    @staticmethod
+    def _uuid(char) -> str:
+        return char if isinstance(char, str) else char.uuid
+
+    def _check_connected(self):
+        if not self.is_connected:
+            raise BleakError("Not connected")
+
+    async def start_notify(self, char, callback):
+        """Subscribe to notifications."""
+        self._check_connected()
+        self._handlers[self._uuid(char)] = callback
+
+    async def stop_notify(self, char):
+        """Unsubscribe from notifications."""
+        self._check_connected()
+        self._handlers.pop(self._uuid(char), None)
+
+    async def write_gatt_char(self, char, data, response=None):
+        """Write a command, the device answers through status notifications."""
+        self._check_connected()
+        device = self.device
+        device.commands.append(bytes(data))
+        if device.random.random() < device.faults.disconnect:
+            self.simulate_disconnect()
+            raise BleakError("Disconnected during write")
+        task = get_running_loop().create_task(self._notify(device.responses(bytes(data))))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _notify(self, frames):
+        device = self.device
+        for frame in frames:
+            if device.faults.latency:
+                await sleep(device.faults.latency)
+            handler = self._handlers.get(_BLE_STATUS_UUID)
+            if not self.is_connected or handler is None:
+                return
+            if device.random.random() < device.faults.loss:
+                continue
+            copies = 2 if device.random.random() < device.faults.duplicate else 1
+            for _ in range(copies):
+                device.notifications += 1
+                handler(None, bytearray(frame))
+
+    async def disconnect(self):
+        """Disconnect on request."""
+        self._disconnected()
+
+    async def clear_cache(self):
+        """Clear services cache."""
+        return True
+
+    def simulate_disconnect(self):
+        """Drop the link from the device side."""
+        if self._disconnected() and self.disconnected_callback is not None:
+            self.disconnected_callback(self)
+
+    def _disconnected(self) -> bool:
+        if not self.is_connected:
+            return False
+        self.is_connected = False
+        self._handlers.clear()
+        self.device.active_connections -= 1
+        return True
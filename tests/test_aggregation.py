@@ -0,0 +1,317 @@
+"""Tests for vivosun_thermo sample aggregation."""
+
+from random import Random
+from struct import pack
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.vivosun_thermo.aggregation import RollingWindow, SampleWindow
+from custom_components.vivosun_thermo.const import (
+    ACQUISITION_MODE_PASSIVE,
+    ACQUISITION_MODE_PERSISTENT,
+    CONF_ACQUISITION_MODE,
+    CONF_PUBLISH_STATISTIC,
+    CONF_PUBLISH_WINDOW,
+    PUBLISH_STATISTIC_LAST,
+    PUBLISH_STATISTIC_MAX,
+)
+from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
+
+_MONOTONIC = "custom_components.vivosun_thermo.coordinator.monotonic"
+
+
+def make_frame(temp, humidity, external_temp=None, external_humidity=None):
+    """Encode a status frame."""
+    if external_temp is None or external_humidity is None:
+        external = (-1, -1)
+    else:
+        external = (round(external_temp * 16), round(external_humidity * 16))
+    return bytearray(pack("<xhhxxhh", round(temp * 16), round(humidity * 16), *external))
+
+
+class TestSampleWindow:
+    """Test SampleWindow."""
+
+    async def test_statistics(self):
+        """Test window aggregates each key with the requested statistic."""
+        window = SampleWindow(["temperature_c", "humidity"])
+        for temp, humidity in ((20.0, 50.0), (22.0, 40.0), (24.0, 45.0)):
+            window.add({"temperature_c": temp, "humidity": humidity})
+
+        assert len(window) == 3
+        assert window.aggregate("mean") == {"temperature_c": 22.0, "humidity": 45.0}
+        assert window.aggregate("min") == {"temperature_c": 20.0, "humidity": 40.0}
+        assert window.aggregate("max") == {"temperature_c": 24.0, "humidity": 50.0}
+        assert window.aggregate("last") == {"temperature_c": 24.0, "humidity": 45.0}
+
+    async def test_missing_values_skipped(self):
+        """Test missing samples are left out of aggregates but count for last."""
+        window = SampleWindow(["temperature_c"])
+        window.add({"temperature_c": 20.0})
+        window.add(None)
+
+        assert window.aggregate("mean") == {"temperature_c": 20.0}
+        assert window.aggregate("last") == {"temperature_c": None}
+
+    async def test_empty(self):
+        """Test empty window has no aggregates."""
+        window = SampleWindow(["temperature_c"])
+
+        assert window.aggregate("mean") == {"temperature_c": None}
+        assert window.aggregate("last") == {"temperature_c": None}
+
+    async def test_capacity(self):
+        """Test oldest samples are overwritten once the window is full."""
+        window = SampleWindow(["temperature_c"], capacity=3)
+        for temp in (10.0, 20.0, 30.0, 40.0):
+            window.add({"temperature_c": temp})
+
+        assert len(window) == 3
+        assert window.aggregate("min") == {"temperature_c": 20.0}
+        assert window.aggregate("last") == {"temperature_c": 40.0}
+
+    async def test_clear(self):
+        """Test clear starts a new window."""
+        window = SampleWindow(["temperature_c"])
+        window.add({"temperature_c": 10.0})
+        window.clear()
+        window.add({"temperature_c": 30.0})
+
+        assert len(window) == 1
+        assert window.aggregate("mean") == {"temperature_c": 30.0}
+
+
+def reference_statistics(samples):
+    """Compute min, max, mean and trend per hour of (time, value) samples from scratch."""
+    values = [value for _, value in samples]
+    count = len(samples)
+    mean_time = sum(time for time, _ in samples) / count
+    mean_value = sum(values) / count
+    spread = sum((time - mean_time) ** 2 for time, _ in samples)
+    slope = sum((time - mean_time) * (value - mean_value) for time, value in samples) / spread
+    return {"min": min(values), "max": max(values), "mean": mean_value, "trend": slope * 3600}
+
+
+class TestRollingWindow:
+    """Test RollingWindow."""
+
+    async def test_statistics(self):
+        """Test statistics of a steadily rising reading."""
+        window = RollingWindow(["temperature_c"], duration=3600, capacity=720)
+        for minute in range(31):
+            window.add(minute * 60.0, {"temperature_c": 20.0 + minute / 10})
+
+        assert len(window) == 31
+        assert window.statistic("temperature_c", "min") == 20.0
+        assert window.statistic("temperature_c", "max") == 23.0
+        assert window.statistic("temperature_c", "mean") == pytest.approx(21.5)
+        assert window.statistic("temperature_c", "trend") == pytest.approx(6.0)
+
+    async def test_matches_reference(self):
+        """Test incremental statistics match recomputing over the window after every sample."""
+        random = Random(1)
+        window = RollingWindow(["humidity"], duration=600, capacity=50)
+        samples = []
+        now = 1_000_000.0
+        for _ in range(2000):
+            now += random.uniform(5, 40)
+            value = 50 + random.gauss(0, 5)
+            if not window.add(now, {"humidity": value}):
+                continue
+            samples.append((now, value))
+            samples = [(time, value) for time, value in samples if now - time <= 600][-50:]
+
+            expected = reference_statistics(samples) if len(samples) > 1 else None
+            if expected is None:
+                continue
+            for statistic, value in expected.items():
+                assert window.statistic("humidity", statistic) == pytest.approx(value, abs=1e-6)
+
+    async def test_window_expires(self):
+        """Test samples older than the window are dropped."""
+        window = RollingWindow(["temperature_c"], duration=3600, capacity=720)
+        window.add(0.0, {"temperature_c": 30.0})
+        window.add(1800.0, {"temperature_c": 20.0})
+        window.add(3700.0, {"temperature_c": 22.0})
+
+        assert len(window) == 2
+        assert window.statistic("temperature_c", "max") == 22.0
+        assert window.statistic("temperature_c", "min") == 20.0
+
+    async def test_fast_samples_skipped(self):
+        """Test samples closer than the spacing don't push older samples out."""
+        window = RollingWindow(["temperature_c"], duration=3600, capacity=720)
+
+        assert window.add(0.0, {"temperature_c": 20.0})
+        assert not window.add(1.0, {"temperature_c": 21.0})
+        assert window.add(5.0, {"temperature_c": 22.0})
+        assert len(window) == 2
+
+    async def test_missing_values(self):
+        """Test missing values are left out and a single sample has no trend."""
+        window = RollingWindow(["temperature_c", "humidity"], duration=3600, capacity=720)
+        window.add(0.0, {"temperature_c": 20.0, "humidity": None})
+        window.add(60.0, {"temperature_c": 21.0, "humidity": 50.0})
+
+        assert window.statistic("humidity", "mean") == 50.0
+        assert window.statistic("humidity", "trend") is None
+        assert window.statistic("temperature_c", "trend") == pytest.approx(60.0)
+
+    async def test_empty(self):
+        """Test empty window has no statistics."""
+        window = RollingWindow(["temperature_c"], duration=3600, capacity=720)
+
+        for statistic in ("min", "max", "mean", "trend"):
+            assert window.statistic("temperature_c", statistic) is None
+
+    async def test_memory_bounded(self):
+        """Test memory of the buffers is fixed up front regardless of samples added."""
+        window = RollingWindow(["temperature_c", "humidity"], duration=3600, capacity=720)
+        nbytes = window.nbytes
+        for index in range(10_000):
+            window.add(index * 5.0, {"temperature_c": 20.0, "humidity": 50.0})
+
+        assert len(window) == 720
+        assert window.nbytes == nbytes
+        assert all(len(queue) <= 720 for queue in window._minimums.values())
+
+
+class TestCoordinatorPublishWindow:
+    """Test coordinator publishing aggregates of fast samples."""
+
+    def make_coordinator(self, hass, config_entry_data, **options):
+        """Create a persistent mode coordinator with a 60 second publish window."""
+        return VivosunThermoSensorCoordinator(
+            hass,
+            config_entry_data,
+            {
+                CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT,
+                CONF_PUBLISH_WINDOW: 60,
+                **options,
+            },
+        )
+
+    async def test_disabled_by_default(self, hass, config_entry_data):
+        """Test every sample is published without a publish window."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+        coordinator._handle_notification(None, make_frame(20.0, 50.0))
+        coordinator._handle_notification(None, make_frame(21.0, 50.0))
+
+        assert coordinator.data["main"]["temperature_c"] == 21.0
+        assert coordinator._windows == {}
+
+    async def test_unchanged_poll_notifies_entities(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test polls within a window notify entities, they need it for heartbeats."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_PUBLISH_WINDOW: 600}
+        )
+        listener = MagicMock()
+        coordinator.async_add_listener(listener)
+
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+
+        assert listener.call_count == 2
+        assert len(coordinator._windows["main"]) == 1
+
+    async def test_publishes_mean_after_window(self, hass, config_entry_data):
+        """Test samples within a window are published once as their mean."""
+        coordinator = self.make_coordinator(hass, config_entry_data)
+
+        with patch(_MONOTONIC, return_value=0.0):
+            coordinator._handle_notification(None, make_frame(20.0, 50.0))
+        assert coordinator.data["main"]["temperature_c"] == 20.0
+
+        for now, temp in ((20.0, 21.0), (40.0, 22.0)):
+            with patch(_MONOTONIC, return_value=now):
+                coordinator._handle_notification(None, make_frame(temp, 50.0))
+        assert coordinator.data["main"]["temperature_c"] == 20.0
+
+        with patch(_MONOTONIC, return_value=60.0):
+            coordinator._handle_notification(None, make_frame(23.0, 50.0))
+
+        main = coordinator.data["main"]
+        assert main["temperature_c"] == pytest.approx(22.0)
+        assert main["humidity"] == 50.0
+        assert main["vpd"] == pytest.approx(1.32, abs=0.01)
+        assert coordinator.data["external"] is None
+
+    async def test_publishes_statistic_option(self, hass, config_entry_data):
+        """Test configured statistic is used for aggregates."""
+        coordinator = self.make_coordinator(
+            hass, config_entry_data, **{CONF_PUBLISH_STATISTIC: PUBLISH_STATISTIC_MAX}
+        )
+        for now, temp in ((0.0, 20.0), (10.0, 26.0), (60.0, 22.0)):
+            with patch(_MONOTONIC, return_value=now):
+                coordinator._handle_notification(None, make_frame(temp, 50.0))
+
+        assert coordinator.data["main"]["temperature_c"] == 26.0
+
+    async def test_last_statistic_drops_disconnected_probe(self, hass, config_entry_data):
+        """Test external probe is unavailable when it was unplugged by the end of a window."""
+        coordinator = self.make_coordinator(
+            hass, config_entry_data, **{CONF_PUBLISH_STATISTIC: PUBLISH_STATISTIC_LAST}
+        )
+        with patch(_MONOTONIC, return_value=0.0):
+            coordinator._handle_notification(None, make_frame(20.0, 50.0, 18.0, 70.0))
+        assert coordinator.data["external"]["temperature_c"] == 18.0
+
+        with patch(_MONOTONIC, return_value=60.0):
+            coordinator._handle_notification(None, make_frame(20.0, 50.0))
+
+        assert coordinator.data["external"] is None
+
+    async def test_advertisements_keep_external_probe(
+        self, hass, config_entry_data, valid_advertisement_data
+    ):
+        """Test windows of advertisements only keep the last published external probe."""
+        coordinator = self.make_coordinator(
+            hass, config_entry_data, **{CONF_ACQUISITION_MODE: ACQUISITION_MODE_PASSIVE}
+        )
+        with patch(_MONOTONIC, return_value=0.0):
+            coordinator._handle_notification(None, make_frame(20.0, 50.0, 18.0, 70.0))
+
+        service_info = MagicMock(manufacturer_data={0x0010: valid_advertisement_data})
+        with patch(_MONOTONIC, return_value=60.0):
+            coordinator._async_handle_advertisement(service_info, MagicMock())
+
+        assert coordinator.data["main"]["temperature_c"] == 22.5
+        assert coordinator.data["external"]["temperature_c"] == 18.0
+
+
+class TestCoordinatorRollingStatistics:
+    """Test coordinator feeding rolling statistics."""
+
+    async def test_fed_before_publish_window(self, hass, config_entry_data):
+        """Test every fresh sample reaches rolling statistics, also within a publish window."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass,
+            config_entry_data,
+            {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT, CONF_PUBLISH_WINDOW: 600},
+        )
+        for now, temp in ((0.0, 20.0), (60.0, 21.0), (120.0, 22.0)):
+            with patch(_MONOTONIC, return_value=now):
+                coordinator._handle_notification(None, make_frame(temp, 50.0, 18.0, 70.0))
+
+        main = coordinator.rolling["main"]
+        assert len(main) == 3
+        assert main.statistic("temperature_c", "max") == 22.0
+        assert main.statistic("temperature_c", "trend") == pytest.approx(60.0)
+        assert coordinator.rolling["external"].statistic("humidity", "mean") == 70.0
+
+    async def test_advertisements_skip_external(
+        self, hass, config_entry_data, valid_advertisement_data
+    ):
+        """Test advertisements only feed the main probe."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        service_info = MagicMock(manufacturer_data={0x0010: valid_advertisement_data})
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+
+        assert coordinator.rolling["main"].statistic("temperature_c", "mean") == 22.5
+        assert len(coordinator.rolling["external"]) == 0
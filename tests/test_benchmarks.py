@@ -0,0 +1,23 @@
+"""Smoke test of the benchmark suite."""
+
+from argparse import Namespace
+
+from benchmarks.run import main
+
+
+class TestBenchmarks:
+    """Test benchmarks run end to end."""
+
+    async def test_main(self):
+        """Test all benchmarks produce results with a tiny workload."""
+        results = await main(
+            Namespace(
+                iterations=10, cycles=3, devices=5, sources=2, rounds=1, latency=0.0, spacing=0.0
+            )
+        )
+
+        assert results["decode"]["batch"]["iterations"] == 10
+        assert results["rolling"]["iterations"] == 10
+        assert results["cycle"]["iterations"] == 3
+        assert results["scale"]["devices"] == 5
+        assert results["scale"]["memory_per_device_bytes"] > 0
@@ -1,11 +1,36 @@
 """Tests for vivosun_thermo config flow."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
+import pytest
+import voluptuous as vol
 from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
 from homeassistant.const import ATTR_NAME
-
-from custom_components.vivosun_thermo.config_flow import VivosunThermoConfigFlow
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.vivosun_thermo.config_flow import (
+    VivosunThermoConfigFlow,
+    VivosunThermoOptionsFlow,
+)
+from custom_components.vivosun_thermo.const import (
+    ACQUISITION_MODE_PASSIVE,
+    ACQUISITION_MODE_PERSISTENT,
+    CONF_ACQUISITION_MODE,
+    CONF_CONNECT_ATTEMPTS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_LEAF_TEMPERATURE_OFFSET,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PRESENCE_WINDOW,
+    CONF_PUBLISH_STATISTIC,
+    CONF_PUBLISH_WINDOW,
+    CONF_READ_TIMEOUT,
+    CONF_STATE_DEADBAND,
+    CONF_STATE_HEARTBEAT,
+    DEFAULT_OPTIONS,
+    PUBLISH_STATISTIC_MAX,
+    PUBLISH_STATISTIC_MEAN,
+)
 
 # pyright: reportTypedDictNotRequiredAccess=false
 
@@ -241,3 +266,98 @@ class TestVivosunThermoConfigFlow:
         # Verify different unique IDs
         mock_set_id1.assert_called_once_with("ThermoBeacon2-AA:BB:CC:DD:EE:01")
         mock_set_id2.assert_called_once_with("ThermoBeacon2-AA:BB:CC:DD:EE:02")
+
+
+class TestVivosunThermoOptionsFlow:
+    """Test VivosunThermoOptionsFlow."""
+
+    @pytest.fixture
+    def flow(self, mock_config_entry):
+        """Options flow of an entry with a publish window set."""
+        mock_config_entry.options = {CONF_PUBLISH_WINDOW: 60}
+        flow = VivosunThermoOptionsFlow()
+        flow.hass = MagicMock()
+        with patch.object(
+            VivosunThermoOptionsFlow,
+            "config_entry",
+            new_callable=PropertyMock,
+            return_value=mock_config_entry,
+        ):
+            yield flow
+
+    async def test_options_flow_registered(self, mock_config_entry):
+        """Test config flow provides the options flow."""
+        flow = VivosunThermoConfigFlow.async_get_options_flow(mock_config_entry)
+        assert isinstance(flow, VivosunThermoOptionsFlow)
+
+    async def test_form_defaults(self, flow):
+        """Test form is prefilled with current options."""
+        result = await flow.async_step_init()
+
+        assert result["step_id"] == "init"
+        values = result["data_schema"]({})
+        assert values == {
+            CONF_ACQUISITION_MODE: ACQUISITION_MODE_PASSIVE,
+            CONF_MIN_SCAN_INTERVAL: 30,
+            CONF_MAX_SCAN_INTERVAL: 300,
+            CONF_READ_TIMEOUT: 1.0,
+            CONF_CONNECT_TIMEOUT: 30.0,
+            CONF_CONNECT_ATTEMPTS: 3,
+            CONF_PRESENCE_WINDOW: 600,
+            CONF_PUBLISH_WINDOW: 60,
+            CONF_PUBLISH_STATISTIC: PUBLISH_STATISTIC_MEAN,
+            CONF_STATE_DEADBAND: 0,
+            CONF_STATE_HEARTBEAT: 3600,
+            CONF_LEAF_TEMPERATURE_OFFSET: -2.0,
+        }
+
+    async def test_form_validation(self, flow):
+        """Test out of range values and unknown modes are rejected."""
+        schema = (await flow.async_step_init())["data_schema"]
+
+        with pytest.raises(vol.Invalid):
+            schema({CONF_ACQUISITION_MODE: "burst"})
+        with pytest.raises(vol.Invalid):
+            schema({CONF_CONNECT_ATTEMPTS: 0})
+        with pytest.raises(vol.Invalid):
+            schema({CONF_PUBLISH_STATISTIC: "median"})
+        with pytest.raises(vol.Invalid):
+            schema({CONF_STATE_DEADBAND: -1})
+
+    async def test_form_covers_all_options(self, flow):
+        """Test every option can be changed in the form."""
+        schema = (await flow.async_step_init())["data_schema"]
+
+        assert {str(key) for key in schema.schema} == set(DEFAULT_OPTIONS)
+
+    async def test_max_below_min_rejected(self, flow):
+        """Test a maximum scan interval below the minimum shows the form again."""
+        user_input = {
+            **DEFAULT_OPTIONS,
+            CONF_MIN_SCAN_INTERVAL: 600,
+            CONF_MAX_SCAN_INTERVAL: 60,
+        }
+
+        result = await flow.async_step_init(user_input)
+
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {CONF_MAX_SCAN_INTERVAL: "max_below_min"}
+        assert result["data_schema"]({})[CONF_MIN_SCAN_INTERVAL] == 600
+
+    async def test_create_entry_keeps_other_options(self, flow, mock_config_entry):
+        """Test saved options keep options the form doesn't show."""
+        mock_config_entry.options = {CONF_PUBLISH_WINDOW: 60, "legacy": True}
+        user_input = {
+            CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT,
+            CONF_MIN_SCAN_INTERVAL: 60,
+            CONF_MAX_SCAN_INTERVAL: 600,
+            CONF_READ_TIMEOUT: 2.5,
+            CONF_CONNECT_TIMEOUT: 15.0,
+            CONF_CONNECT_ATTEMPTS: 5,
+            CONF_PUBLISH_WINDOW: 120,
+            CONF_PUBLISH_STATISTIC: PUBLISH_STATISTIC_MAX,
+        }
+
+        result = await flow.async_step_init(user_input)
+
+        assert result["data"] == {"legacy": True, **user_input}
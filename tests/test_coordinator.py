@@ -1,11 +1,33 @@
 """Tests for vivosun_thermo coordinator."""
 
-from asyncio import TimeoutError as AsyncTimeoutError
-from unittest.mock import AsyncMock
+from asyncio import sleep
+from datetime import timedelta
+from time import monotonic
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-
+from bleak.exc import BleakError
+from bleak_retry_connector import BleakClientWithServiceCache
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.vivosun_thermo.const import (
+    ACQUISITION_MODE_PERSISTENT,
+    ACQUISITION_MODE_POLL,
+    CONF_ACQUISITION_MODE,
+    CONF_CONNECT_ATTEMPTS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PRESENCE_WINDOW,
+    PERSISTENT_SCAN_INTERVAL,
+)
 from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
+from custom_components.vivosun_thermo.polling import BREAKER_HALF_OPEN, BREAKER_OPEN
+
+from .helpers import make_scanner_device
+
+_MONOTONIC = "custom_components.vivosun_thermo.coordinator.monotonic"
+_LAST_SERVICE_INFO = "custom_components.vivosun_thermo.coordinator.async_last_service_info"
 
 
 class TestVivosunThermoSensorCoordinator:
@@ -116,43 +138,11 @@ class TestVivosunThermoSensorCoordinator:
         assert result["main"]["humidity"] == 0.0
         assert result["external"] is None
 
-    async def test_read_raw_data(self, mock_bleak_client, valid_sensor_data_both_probes):
-        """Test reading raw data from BLE device."""
-
-        async def mock_notify(uuid, callback):
-            # Simulate notification callback
-            callback(None, valid_sensor_data_both_probes)
-
-        mock_bleak_client.start_notify = AsyncMock(side_effect=mock_notify)
-
-        data = await VivosunThermoSensorCoordinator._read_raw_data(mock_bleak_client)
-
-        assert data == valid_sensor_data_both_probes
-        mock_bleak_client.start_notify.assert_called_once()
-        mock_bleak_client.write_gatt_char.assert_called_once()
-        mock_bleak_client.stop_notify.assert_called_once()
-
-    async def test_read_raw_data_timeout(self, mock_bleak_client):
-        """Test timeout when reading from BLE device."""
-
-        async def mock_notify_timeout(uuid, callback):
-            # Don't call callback to simulate timeout
-            pass
-
-        mock_bleak_client.start_notify = AsyncMock(side_effect=mock_notify_timeout)
-
-        with pytest.raises(AsyncTimeoutError):
-            await VivosunThermoSensorCoordinator._read_raw_data(mock_bleak_client)
-
     async def test_read_sensor_data(
         self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_both_probes
     ):
         """Test reading and decoding sensor data."""
-
-        async def mock_notify(uuid, callback):
-            callback(None, valid_sensor_data_both_probes)
-
-        mock_bleak_client.start_notify = AsyncMock(side_effect=mock_notify)
+        mock_bleak_client.responses = [valid_sensor_data_both_probes]
 
         coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
         data = await coordinator._read_sensor_data()
@@ -174,14 +164,512 @@ class TestVivosunThermoSensorCoordinator:
         self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
     ):
         """Test coordinator update method integration."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        await coordinator.async_refresh()
+
+        assert coordinator.data["main"]["temperature_c"] == 22.5
+        assert coordinator.data["external"] is None
+
+    async def test_decode_advertisement_data(self, valid_advertisement_data):
+        """Test decoding main probe readings from advertisement manufacturer data."""
+        values = VivosunThermoSensorCoordinator._decode_advertisement_data(
+            {0x0010: valid_advertisement_data}
+        )
+
+        assert values == (22.5, 65.0)
+
+    async def test_decode_advertisement_data_unknown_layout(self):
+        """Test advertisements with unexpected payload are ignored."""
+        assert VivosunThermoSensorCoordinator._decode_advertisement_data({}) is None
+        assert VivosunThermoSensorCoordinator._decode_advertisement_data({0x0010: bytes(5)}) is None
+
+    async def test_handle_advertisement_keeps_external_probe(
+        self, hass, config_entry_data, valid_advertisement_data
+    ):
+        """Test advertisement updates main probe and keeps last polled external probe."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        external = {"temperature_c": 18.0, "humidity": 70.0, "vpd": 0.62}
+        coordinator.data = {"main": None, "external": external}
+
+        service_info = MagicMock(manufacturer_data={0x0010: valid_advertisement_data})
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+
+        assert coordinator.data["main"]["temperature_c"] == 22.5
+        assert coordinator.data["external"] == external
+
+    async def test_handle_advertisement_records_vitals(
+        self, hass, config_entry_data, valid_advertisement_data
+    ):
+        """Test battery and signal strength are taken from advertisements in any mode."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL}
+        )
+        data = bytearray(valid_advertisement_data)
+        data[8:10] = (2600).to_bytes(2, "little")
+        listener = MagicMock()
+        coordinator.async_add_listener(listener)
+
+        service_info = MagicMock(manufacturer_data={0x0010: bytes(data)}, rssi=-72)
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+
+        assert coordinator.vitals == {"battery": 50, "battery_voltage": 2.6, "rssi": -72}
+        assert coordinator.data == {}
+        listener.assert_called_once()
+
+        # Further advertisements don't call listeners until the vitals interval has passed
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+        listener.assert_called_once()
+        with patch(_MONOTONIC, return_value=monotonic() + 301):
+            coordinator._async_handle_advertisement(service_info, MagicMock())
+        assert listener.call_count == 2
+
+    async def test_handle_advertisement_without_battery(
+        self, hass, config_entry_data, valid_advertisement_data
+    ):
+        """Test advertisements without battery voltage keep the battery unknown."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
 
-        async def mock_notify(uuid, callback):
-            callback(None, valid_sensor_data_main_only)
+        service_info = MagicMock(manufacturer_data={0x0010: valid_advertisement_data}, rssi=-72)
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+
+        assert coordinator.battery is None
+        assert coordinator.telemetry.rssi == -72
+
+    async def test_async_start_registers_passive_callback(self, hass, config_entry_data):
+        """Test passive mode registers for advertisements of the device."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
 
-        mock_bleak_client.start_notify = AsyncMock(side_effect=mock_notify)
+        with patch(
+            "custom_components.vivosun_thermo.coordinator.async_register_callback"
+        ) as mock_register:
+            coordinator.async_start()
+
+        mock_register.assert_called_once()
+        matcher = mock_register.call_args[0][2]
+        assert matcher["address"] == "AA:BB:CC:DD:EE:FF"
+
+    async def test_async_start_poll_mode(self, hass, config_entry_data, valid_advertisement_data):
+        """Test poll mode listens for advertisements only to re-arm the circuit breaker."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL}
+        )
+
+        with patch(
+            "custom_components.vivosun_thermo.coordinator.async_register_callback"
+        ) as mock_register:
+            coordinator.async_start()
+
+        mock_register.assert_called_once()
+        coordinator.breaker.state = BREAKER_OPEN
+        service_info = MagicMock(manufacturer_data={0x0010: valid_advertisement_data})
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+
+        assert coordinator.breaker.state == BREAKER_HALF_OPEN
+        assert coordinator.data == {}
+
+    async def test_read_sensor_data_skips_poll_with_fresh_advertisement(
+        self,
+        hass,
+        config_entry_data,
+        mock_bleak_client,
+        valid_sensor_data_main_only,
+        valid_advertisement_data,
+    ):
+        """Test GATT poll is skipped while advertisements keep data fresh."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
 
         coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
         await coordinator.async_refresh()
+        assert mock_bleak_client.write_gatt_char.call_count == 1
+
+        service_info = MagicMock(manufacturer_data={0x0010: valid_advertisement_data})
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+        await coordinator.async_refresh()
+
+        assert mock_bleak_client.write_gatt_char.call_count == 1
+        assert coordinator.data["main"]["temperature_c"] == 22.5
+
+    async def test_advertisement_recovers_failed_poll(
+        self, hass, config_entry_data, mock_establish_connection, valid_advertisement_data
+    ):
+        """Test advertisements publish readings and skip polls when GATT reads fail."""
+        mock_establish_connection.side_effect = BleakError("out of slots")
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+
+        service_info = MagicMock(manufacturer_data={0x0010: valid_advertisement_data})
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+        assert coordinator.last_update_success
+        assert coordinator.data["main"]["temperature_c"] == 22.5
+
+        await coordinator.async_refresh()
+
+        assert coordinator.last_update_success
+        assert mock_establish_connection.call_count == 1
+
+    async def test_read_sensor_data_polls_with_external_probe(
+        self,
+        hass,
+        config_entry_data,
+        mock_bleak_client,
+        valid_sensor_data_both_probes,
+        valid_advertisement_data,
+    ):
+        """Test GATT poll still happens when external probe needs refreshing."""
+        mock_bleak_client.responses = [valid_sensor_data_both_probes]
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        await coordinator.async_refresh()
+
+        service_info = MagicMock(manufacturer_data={0x0010: valid_advertisement_data})
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+        await coordinator.async_refresh()
+
+        assert mock_bleak_client.write_gatt_char.call_count == 2
+
+    async def test_persistent_mode_connects_once(
+        self,
+        hass,
+        config_entry_data,
+        mock_establish_connection,
+        mock_bleak_client,
+        valid_sensor_data_both_probes,
+    ):
+        """Test persistent mode keeps connection and subscription between polls."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+        assert coordinator.update_interval == PERSISTENT_SCAN_INTERVAL
+
+        mock_bleak_client.responses = [valid_sensor_data_both_probes]
+
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+
+        assert coordinator.data["main"]["temperature_c"] == 22.5
+        mock_establish_connection.assert_called_once()
+        mock_bleak_client.disconnect.assert_not_called()
+        mock_bleak_client.start_notify.assert_called_once()
+        mock_bleak_client.stop_notify.assert_not_called()
+        assert mock_bleak_client.write_gatt_char.call_count == 2
+
+    async def test_persistent_mode_publishes_pushed_data(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test unsolicited notifications are published immediately."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+
+        coordinator._handle_notification(None, valid_sensor_data_main_only)
 
         assert coordinator.data["main"]["temperature_c"] == 22.5
         assert coordinator.data["external"] is None
+
+    async def test_persistent_mode_ignores_short_notification(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test notifications shorter than a status frame are not decoded."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+
+        coordinator._handle_notification(None, valid_sensor_data_main_only[:5])
+
+        assert coordinator.data == {}
+
+    async def test_read_sensor_data_short_response(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test a truncated status frame fails the update."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only[:5]]
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        with pytest.raises(UpdateFailed, match="Truncated status frame"):
+            await coordinator._read_sensor_data()
+
+    async def test_read_sensor_data_missing_characteristics(
+        self, hass, config_entry_data, mock_bleak_client
+    ):
+        """Test a device without the expected characteristics fails the update."""
+        mock_bleak_client.services.get_characteristic.side_effect = None
+        mock_bleak_client.services.get_characteristic.return_value = None
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        with pytest.raises(UpdateFailed, match="does not have expected characteristics"):
+            await coordinator._read_sensor_data()
+
+    async def test_failed_read_clears_backend_service_cache(
+        self, hass, config_entry_data, mock_bleak_client
+    ):
+        """Test failed reads make the backend discover services again."""
+        mock_bleak_client.__class__ = BleakClientWithServiceCache
+        mock_bleak_client.write_gatt_char = AsyncMock(side_effect=TimeoutError())
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._read_sensor_data()
+
+        mock_bleak_client.clear_cache.assert_awaited_once()
+
+    async def test_persistent_mode_reconnects_on_disconnect(
+        self, hass, config_entry_data, mock_bleak_client
+    ):
+        """Test disconnect schedules a refresh which reconnects."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+        session = coordinator._session = MagicMock()
+
+        coordinator._handle_disconnect(mock_bleak_client)
+
+        session.abort.assert_called_once()
+        assert coordinator._session is None
+        hass.async_create_task.assert_called_once()
+        hass.async_create_task.call_args[0][0].close()
+
+    async def test_persistent_mode_no_reconnect_on_shutdown(
+        self, hass, config_entry_data, mock_bleak_client
+    ):
+        """Test shutdown disconnects without scheduling a reconnect."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+        coordinator._client = mock_bleak_client
+        mock_bleak_client.disconnect = AsyncMock(
+            side_effect=lambda: coordinator._handle_disconnect(mock_bleak_client)
+        )
+
+        await coordinator.async_shutdown()
+
+        mock_bleak_client.disconnect.assert_called_once()
+        hass.async_create_task.assert_not_called()
+
+    async def test_update_options_applied_live(
+        self, hass, config_entry_data, mock_establish_connection, mock_bleak_client
+    ):
+        """Test new timeouts, retries and scan intervals apply to the running coordinator."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL}
+        )
+        coordinator.async_request_refresh = AsyncMock()
+
+        await coordinator.async_update_options(
+            {
+                CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL,
+                CONF_CONNECT_ATTEMPTS: 5,
+                CONF_MIN_SCAN_INTERVAL: 120,
+                CONF_MAX_SCAN_INTERVAL: 600,
+            }
+        )
+
+        assert coordinator.adaptive_interval.interval == 120
+        assert timedelta(seconds=60) <= coordinator.update_interval < timedelta(seconds=180)
+        coordinator.async_request_refresh.assert_not_awaited()
+        await coordinator._connect()
+        assert mock_establish_connection.call_args.kwargs["max_attempts"] == 5
+
+    async def test_update_options_mode_change(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test leaving persistent mode drops the connection and polls on the new schedule."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+        await coordinator._read_sensor_data()
+        assert coordinator._client is mock_bleak_client
+
+        coordinator.async_request_refresh = AsyncMock()
+        await coordinator.async_update_options({CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL})
+
+        assert coordinator._client is None
+        assert coordinator._session is None
+        mock_bleak_client.disconnect.assert_awaited_once()
+        assert coordinator.update_interval != PERSISTENT_SCAN_INTERVAL
+        coordinator.async_request_refresh.assert_awaited_once()
+
+        await coordinator.async_update_options({CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT})
+        assert coordinator.update_interval == PERSISTENT_SCAN_INTERVAL
+
+    async def test_resolve_connection_path_best_rssi_with_free_slots(
+        self, hass, config_entry_data, mock_bluetooth
+    ):
+        """Test connection goes through the strongest source with a free slot."""
+        full = make_scanner_device("proxy1", rssi=-50, free_slots=0)
+        weak = make_scanner_device("proxy2", rssi=-80, free_slots=2)
+        best = make_scanner_device("proxy3", rssi=-65, free_slots=1)
+        mock_bluetooth.return_value = [full, weak, best]
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        source, ble_device = coordinator._resolve_connection_path()
+
+        assert source == "proxy3"
+        assert ble_device is best.ble_device
+
+    async def test_resolve_connection_path_all_slots_busy(
+        self, hass, config_entry_data, mock_bluetooth
+    ):
+        """Test strongest source is used when no source has a free slot."""
+        mock_bluetooth.return_value = [
+            make_scanner_device("proxy1", rssi=-70, free_slots=0),
+            make_scanner_device("proxy2", rssi=-60, free_slots=0),
+        ]
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        source, _ = coordinator._resolve_connection_path()
+
+        assert source == "proxy2"
+
+    async def test_read_sensor_data_unreachable(
+        self, hass, config_entry_data, mock_bluetooth, mock_establish_connection
+    ):
+        """Test polling fails fast when no adapter hears the device."""
+        mock_bluetooth.return_value = []
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        with pytest.raises(UpdateFailed):
+            await coordinator._read_sensor_data()
+
+        mock_establish_connection.assert_not_called()
+
+    async def test_circuit_breaker_stops_connection_attempts(
+        self, hass, config_entry_data, mock_establish_connection, valid_advertisement_data
+    ):
+        """Test an unreachable device stops getting connection attempts until it advertises."""
+        mock_establish_connection.side_effect = BleakError("Out of range")
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL}
+        )
+        coordinator.breaker.threshold = 2
+
+        for _ in range(2):
+            coordinator.breaker.retry_at = None
+            with pytest.raises(UpdateFailed):
+                await coordinator._read_sensor_data()
+        assert coordinator.breaker.state == BREAKER_OPEN
+
+        with pytest.raises(UpdateFailed, match="circuit breaker is open"):
+            await coordinator._read_sensor_data()
+        assert mock_establish_connection.call_count == 2
+
+        # Advertisements re-arm the breaker, but attempts still wait for the longest backoff
+        service_info = MagicMock(manufacturer_data={0x0010: valid_advertisement_data})
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+        with pytest.raises(UpdateFailed, match="circuit breaker is half_open"):
+            await coordinator._read_sensor_data()
+        assert mock_establish_connection.call_count == 2
+
+        coordinator.breaker.retry_at = None
+        with pytest.raises(UpdateFailed, match="Out of range"):
+            await coordinator._read_sensor_data()
+        assert mock_establish_connection.call_count == 3
+
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+        with pytest.raises(UpdateFailed, match="circuit breaker is half_open"):
+            await coordinator._read_sensor_data()
+        assert mock_establish_connection.call_count == 3
+
+    @pytest.mark.parametrize("service_info", [None, MagicMock(time=float("-inf"))])
+    async def test_read_sensor_data_not_present(
+        self, hass, config_entry_data, mock_establish_connection, service_info
+    ):
+        """Test devices not heard within the presence window are not connected to."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL}
+        )
+        with (
+            patch(_LAST_SERVICE_INFO, return_value=service_info),
+            pytest.raises(UpdateFailed, match="not heard recently"),
+        ):
+            await coordinator._read_sensor_data()
+
+        mock_establish_connection.assert_not_called()
+        assert coordinator.present is False
+        assert coordinator.breaker.failures == 0
+
+    async def test_presence_window_disabled(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test presence gate is skipped when the window is 0."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+        coordinator = VivosunThermoSensorCoordinator(
+            hass,
+            config_entry_data,
+            {CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL, CONF_PRESENCE_WINDOW: 0},
+        )
+        coordinator.present = False
+        with patch(_LAST_SERVICE_INFO, return_value=None):
+            data = await coordinator._read_sensor_data()
+
+        assert data["main"]["temperature_c"] == 22.5
+        assert coordinator.present is True
+
+    async def test_presence_ignored_while_connected(self, hass, config_entry_data):
+        """Test an open connection counts as presence, connected devices may stop advertising."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+        coordinator._client = MagicMock(is_connected=True)
+
+        with patch(_LAST_SERVICE_INFO, return_value=None):
+            assert coordinator._device_present()
+
+    async def test_advertisement_marks_present(
+        self, hass, config_entry_data, valid_advertisement_data
+    ):
+        """Test an advertisement makes a device present again."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.present = False
+
+        service_info = MagicMock(manufacturer_data={0x0010: valid_advertisement_data})
+        coordinator._async_handle_advertisement(service_info, MagicMock())
+
+        assert coordinator.present is True
+
+    async def test_connect_uses_retry_budget(
+        self,
+        hass,
+        config_entry_data,
+        mock_establish_connection,
+        mock_bleak_client,
+        valid_sensor_data_main_only,
+    ):
+        """Test retrying connector is used with configured attempts and disconnects after."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_CONNECT_ATTEMPTS: 5}
+        )
+        await coordinator._read_sensor_data()
+
+        assert mock_establish_connection.call_args.kwargs["max_attempts"] == 5
+        mock_bleak_client.disconnect.assert_called_once()
+
+    async def test_connect_timeout_budget(self, hass, config_entry_data, mock_establish_connection):
+        """Test connect timeout covers all attempts of the retrying connector."""
+
+        async def mock_connect(*args, **kwargs):
+            await sleep(1)
+
+        mock_establish_connection.side_effect = mock_connect
+
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_CONNECT_TIMEOUT: 0.01}
+        )
+        with pytest.raises(UpdateFailed):
+            await coordinator._read_sensor_data()
+
+    async def test_read_sensor_data_bleak_error(
+        self, hass, config_entry_data, mock_establish_connection
+    ):
+        """Test bleak errors are reported as failed updates."""
+        mock_establish_connection.side_effect = BleakError("out of slots")
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        with pytest.raises(UpdateFailed):
+            await coordinator._read_sensor_data()
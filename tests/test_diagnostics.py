@@ -0,0 +1,47 @@
+"""Tests for vivosun_thermo diagnostics."""
+
+from custom_components.vivosun_thermo.const import DOMAIN
+from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
+from custom_components.vivosun_thermo.diagnostics import async_get_config_entry_diagnostics
+
+
+class TestDiagnostics:
+    """Test config entry diagnostics."""
+
+    async def test_config_entry_diagnostics(self, hass, config_entry_data, mock_config_entry):
+        """Test diagnostics include entry, cache and scheduler details."""
+        mock_config_entry.options = {}
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.data = {
+            "main": {"temperature_c": 22.5, "humidity": 65.0, "vpd": 0.95},
+            "external": None,
+        }
+        hass.data[DOMAIN][mock_config_entry.entry_id] = coordinator
+
+        result = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+        assert result["entry"]["data"]["discovery_address"] == "AA:BB:CC:DD:EE:FF"
+        assert result["coordinator"]["data"]["main"]["temperature_c"] == 22.5
+        assert result["scheduler"] == {}
+        assert result["telemetry"]["recent_frames"] == []
+        assert result["telemetry"]["recent_errors"] == []
+
+    async def test_poll_phases(self, hass, config_entry_data, mock_config_entry):
+        """Test diagnostics show where each device polls within its interval."""
+        mock_config_entry.options = {}
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        other = VivosunThermoSensorCoordinator(
+            hass, {**config_entry_data, "name": "Other", "discovery_address": "AA:BB:CC:DD:EE:00"}
+        )
+        hass.data[DOMAIN][mock_config_entry.entry_id] = coordinator
+        hass.data[DOMAIN]["other"] = other
+
+        result = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+        assert result["coordinator"]["phase"] == coordinator.phase
+        assert 0 <= result["coordinator"]["phase_offset"] < 60
+        assert result["poll_phases"] == {
+            coordinator.name: coordinator.phase_offset,
+            "Other": other.phase_offset,
+        }
+        assert coordinator.phase_offset != other.phase_offset
@@ -0,0 +1,322 @@
+"""Tests for vivosun_thermo history download."""
+
+from asyncio import Event
+from datetime import datetime, timezone
+from time import monotonic
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bleak.exc import BleakError
+
+from custom_components.vivosun_thermo.coordinator import (
+    _BLE_COMMAND_UUID,
+    _BLE_SENSOR_COMMAND,
+    _BLE_STATUS_UUID,
+    VivosunThermoSensorCoordinator,
+)
+from custom_components.vivosun_thermo.history import (
+    HistoryCursor,
+    VivosunThermoHistory,
+    VivosunThermoHistoryStore,
+    decode_history_frames,
+)
+from custom_components.vivosun_thermo.session import VivosunThermoSession
+from custom_components.vivosun_thermo.telemetry import PHASE_CYCLE
+
+from .simulator import SimulatedDevice
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+NOW = datetime(2025, 1, 1, 12, 5, tzinfo=timezone.utc)
+
+
+def make_frames(records, start=0):
+    """Encode records the way the device streams them."""
+    return SimulatedDevice(history=[(0.0, 0.0)] * start + records).history_frames(
+        start, len(records)
+    )
+
+
+@pytest.fixture
+def mock_statistics():
+    """Mock recorder statistics import."""
+    with (
+        patch(
+            "homeassistant.components.recorder.statistics.async_add_external_statistics"
+        ) as mock_add,
+        patch("custom_components.vivosun_thermo.history.dt_util.utcnow", return_value=NOW),
+    ):
+        yield mock_add
+
+
+@pytest.fixture
+def recorder_hass(hass):
+    """Mock Home Assistant instance with recorder loaded."""
+    hass.config.components = {"recorder"}
+    return hass
+
+
+async def sync(history, device):
+    """Run history sync in a session of the simulated device."""
+    client = await device.establish_connection(None, None, "Test")
+    async with VivosunThermoSession(client, _BLE_COMMAND_UUID, _BLE_STATUS_UUID) as session:
+        await history.async_sync(session)
+
+
+async def finish_history(coordinator):
+    """Wait for a history download the coordinator started in the background."""
+    if (task := coordinator._history_task) is not None:
+        await task
+
+
+class TestDecodeHistoryFrames:
+    """Test batch decoding of history frames."""
+
+    async def test_decode(self):
+        """Test records are decoded in index order."""
+        frames = make_frames([(20.0, 50.0), (20.5, 51.0), (21.0, 52.0), (21.5, 53.0)], 10)
+
+        records = decode_history_frames(reversed(frames), 10)
+
+        assert records["start"] == 10
+        assert records["temperature_c"] == [20.0, 20.5, 21.0, 21.5]
+        assert records["humidity"] == [50.0, 51.0, 52.0, 53.0]
+
+    async def test_decode_duplicates_and_gap(self):
+        """Test duplicate frames are ignored and decoding stops at a gap."""
+        frames = make_frames([(20.0, 50.0)] * 9)
+        records = decode_history_frames([frames[0], frames[0], frames[2]], 0)
+
+        assert len(records["temperature_c"]) == 3
+
+    async def test_decode_empty(self):
+        """Test no records raises bleak error."""
+        with pytest.raises(BleakError):
+            decode_history_frames([], 0)
+
+
+class TestVivosunThermoHistory:
+    """Test VivosunThermoHistory."""
+
+    async def test_due_requires_recorder(self, hass):
+        """Test sync is only due when recorder is loaded."""
+        history = VivosunThermoHistory(hass, ADDRESS, "Test")
+        hass.config.components = set()
+        assert not history.due
+
+        hass.config.components = {"recorder"}
+        assert history.due
+
+    async def test_sync_imports_complete_hours(self, recorder_hass, mock_statistics):
+        """Test records are downloaded in chunks and imported as hourly statistics."""
+        # 300 records, 10 minutes apart, the newest one logged at 12:05
+        device = SimulatedDevice(history=[(20.0 + i % 6, 50.0) for i in range(300)])
+        history = VivosunThermoHistory(recorder_hass, ADDRESS, "Test")
+
+        await sync(history, device)
+
+        dump_commands = [command for command in device.commands if command[0] == 0x07]
+        assert dump_commands == [bytes([0x07, 0, 0, 0, 255]), bytes([0x07, 255, 0, 0, 45])]
+
+        temperature_call, humidity_call = mock_statistics.call_args_list
+        metadata, statistics = temperature_call.args[1:]
+        assert metadata["statistic_id"] == "vivosun_thermo:aa_bb_cc_dd_ee_ff_temperature"
+        assert humidity_call.args[1]["statistic_id"] == "vivosun_thermo:aa_bb_cc_dd_ee_ff_humidity"
+        # Last hour 12:00 is incomplete and is left for the next sync
+        assert statistics[-1]["start"] == datetime(2025, 1, 1, 11, tzinfo=timezone.utc)
+        assert statistics[-1]["min"] == 20.0
+        assert statistics[-1]["max"] == 25.0
+        assert statistics[-1]["mean"] == 22.5
+        assert history.store.get(ADDRESS)["index"] == 299
+        assert history.last_imported == len(statistics)
+
+    async def test_sync_capped(self, recorder_hass, mock_statistics):
+        """Test a long log is downloaded over several syncs."""
+        device = SimulatedDevice(history=[(20.0, 50.0)] * 2000)
+        history = VivosunThermoHistory(recorder_hass, ADDRESS, "Test")
+
+        await sync(history, device)
+
+        dump_commands = [command for command in device.commands if command[0] == 0x07]
+        assert sum(command[4] for command in dump_commands) == 1020
+        assert history.store.get(ADDRESS)["index"] <= 1020
+
+    async def test_sync_malformed_count(self, recorder_hass, mock_statistics):
+        """Test a device answering the count request with garbage is not synced again."""
+        device = SimulatedDevice()
+        device.responses = lambda command: [bytearray([0x01])]
+        history = VivosunThermoHistory(recorder_hass, ADDRESS, "Test")
+
+        await sync(history, device)
+
+        assert not history.supported
+        assert not history.due
+
+    async def test_sync_count_timeout_retried(self, recorder_hass, mock_statistics):
+        """Test an unanswered count request is retried before giving up on the device."""
+        device = SimulatedDevice()
+        device.responses = lambda command: []
+        history = VivosunThermoHistory(recorder_hass, ADDRESS, "Test")
+
+        with patch("custom_components.vivosun_thermo.history._HISTORY_FRAME_TIMEOUT", 0.01):
+            await sync(history, device)
+            assert history.supported
+            history.last_sync = None
+            assert history.due
+
+            await sync(history, device)
+            await sync(history, device)
+
+        assert not history.supported
+
+    async def test_sync_stalled_stream_imports_partial(self, recorder_hass, mock_statistics):
+        """Test records that arrived before a stream stalled are imported."""
+        device = SimulatedDevice(history=[(20.0, 50.0)] * 300)
+        responses = device.responses
+        # Device stops streaming after 30 frames of 3 records
+        device.responses = lambda command: responses(command)[:30]
+        history = VivosunThermoHistory(recorder_hass, ADDRESS, "Test")
+
+        with patch("custom_components.vivosun_thermo.history._HISTORY_FRAME_TIMEOUT", 0.01):
+            await sync(history, device)
+
+        dump_commands = [command for command in device.commands if command[0] == 0x07]
+        assert dump_commands == [bytes([0x07, 0, 0, 0, 255])]
+        mock_statistics.assert_called()
+        assert 0 < history.store.get(ADDRESS)["index"] <= 90
+
+    async def test_sync_incremental(self, recorder_hass, mock_statistics):
+        """Test only new records are downloaded."""
+        device = SimulatedDevice(history=[(20.0, 50.0)] * 20)
+        history = VivosunThermoHistory(recorder_hass, ADDRESS, "Test")
+        history.store.set(ADDRESS, HistoryCursor(index=12, hour=0.0))
+
+        await sync(history, device)
+
+        assert bytes([0x07, 12, 0, 0, 8]) in device.commands
+
+    async def test_sync_nothing_new(self, recorder_hass, mock_statistics):
+        """Test no records are downloaded when cursor is up to date."""
+        device = SimulatedDevice(history=[(20.0, 50.0)] * 20)
+        history = VivosunThermoHistory(recorder_hass, ADDRESS, "Test")
+        history.store.set(ADDRESS, HistoryCursor(index=20, hour=0.0))
+
+        await sync(history, device)
+
+        assert device.commands == [bytes([0x01])]
+        mock_statistics.assert_not_called()
+
+    async def test_sync_cleared_log(self, recorder_hass, mock_statistics):
+        """Test cursor restarts when device log was cleared."""
+        device = SimulatedDevice(history=[(20.0, 50.0)] * 20)
+        history = VivosunThermoHistory(recorder_hass, ADDRESS, "Test")
+        history.store.set(ADDRESS, HistoryCursor(index=500, hour=0.0))
+
+        await sync(history, device)
+
+        assert bytes([0x07, 0, 0, 0, 20]) in device.commands
+
+    async def test_sync_skips_imported_hours(self, recorder_hass, mock_statistics):
+        """Test hours imported before are not imported again."""
+        device = SimulatedDevice(history=[(20.0, 50.0)] * 20)
+        history = VivosunThermoHistory(recorder_hass, ADDRESS, "Test")
+        imported = datetime(2025, 1, 1, 11, tzinfo=timezone.utc).timestamp()
+        history.store.set(ADDRESS, HistoryCursor(index=0, hour=imported))
+
+        await sync(history, device)
+
+        mock_statistics.assert_not_called()
+        assert history.store.get(ADDRESS)["hour"] == imported
+
+    async def test_store_persistence(self):
+        """Test cursors are loaded from and saved to the store."""
+        store = MagicMock()
+        store.async_load = AsyncMock(return_value={ADDRESS: {"index": 5, "hour": 0.0}})
+        history_store = VivosunThermoHistoryStore(store)
+
+        await history_store.async_load()
+        assert history_store.get(ADDRESS)["index"] == 5
+
+        history_store.set(ADDRESS, HistoryCursor(index=6, hour=0.0))
+        assert store.async_delay_save.call_args[0][0]()[ADDRESS]["index"] == 6
+
+    async def test_coordinator_syncs_in_same_connection(
+        self,
+        recorder_hass,
+        config_entry_data,
+        simulated_device,
+        mock_statistics,
+    ):
+        """Test polled read downloads history without reconnecting."""
+        simulated_device.history = [(20.0, 50.0)] * 20
+
+        coordinator = VivosunThermoSensorCoordinator(recorder_hass, config_entry_data)
+        data = await coordinator._read_sensor_data()
+        await finish_history(coordinator)
+
+        assert data["main"]["temperature_c"] is not None
+        assert simulated_device.connections == 1
+        assert bytes([0x07, 0, 0, 0, 20]) in simulated_device.commands
+        assert not coordinator.history.due
+        assert coordinator._history_task is None
+        assert simulated_device.active_connections == 0
+
+    async def test_coordinator_publishes_before_history(
+        self,
+        recorder_hass,
+        config_entry_data,
+        mock_bleak_client,
+        mock_establish_connection,
+        valid_sensor_data_main_only,
+    ):
+        """Test the reading is returned while history downloads on the same connection."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+        release = Event()
+        coordinator = VivosunThermoSensorCoordinator(recorder_hass, config_entry_data)
+
+        async def blocked_sync(session):
+            coordinator.history.last_sync = monotonic()
+            await release.wait()
+
+        coordinator.history.async_sync = AsyncMock(side_effect=blocked_sync)
+
+        data = await coordinator._read_sensor_data()
+
+        assert data["main"]["temperature_c"] == 22.5
+        assert PHASE_CYCLE in coordinator.telemetry.phases
+        assert coordinator._history_task is not None
+        mock_bleak_client.disconnect.assert_not_awaited()
+
+        # Next poll reads over the connection the download still holds
+        data = await coordinator._read_sensor_data()
+        assert data["main"]["temperature_c"] == 22.5
+        assert mock_establish_connection.call_count == 1
+        assert mock_bleak_client.write_gatt_char.call_count == 2
+
+        release.set()
+        await finish_history(coordinator)
+        mock_bleak_client.disconnect.assert_awaited_once()
+        coordinator.history.async_sync.assert_awaited_once()
+
+    async def test_coordinator_history_failure_keeps_reading(
+        self,
+        recorder_hass,
+        config_entry_data,
+        simulated_device,
+        mock_statistics,
+    ):
+        """Test failed history download does not fail the update."""
+        # Device answers sensor reads but never answers history commands
+        simulated_device.responses = lambda command: (
+            [simulated_device.status_frame()] if command == bytes(_BLE_SENSOR_COMMAND) else []
+        )
+
+        coordinator = VivosunThermoSensorCoordinator(recorder_hass, config_entry_data)
+        with patch("custom_components.vivosun_thermo.history._HISTORY_FRAME_TIMEOUT", 0.01):
+            data = await coordinator._read_sensor_data()
+            await finish_history(coordinator)
+
+        assert data["main"]["temperature_c"] is not None
+        mock_statistics.assert_not_called()
+        # Unanswered count is asked again next sync
+        assert coordinator.history.supported
+        assert coordinator._history_task is None
@@ -0,0 +1,44 @@
+"""Tests for vivosun_thermo import cost."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).parent.parent / "src"
+
+# Modules that must stay importable without Home Assistant and bleak
+STANDALONE_MODULES = ["protocol", "metrics", "polling", "aggregation"]
+HEAVY_PACKAGES = ("homeassistant", "bleak", "bleak_retry_connector", "habluetooth")
+# Generous bound, importing Home Assistant alone takes several times longer
+IMPORT_BUDGET_US = 200_000
+
+
+def import_times(module):
+    """Import module in a fresh interpreter, returns cumulative import time per module in us."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=SRC,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", STANDALONE_MODULES)
+async def test_standalone_import(module):
+    """Test decoding and metrics code doesn't pull in Home Assistant or BLE stacks."""
+    name = f"custom_components.vivosun_thermo.{module}"
+    times = import_times(name)
+
+    heavy = [imported for imported in times if imported.split(".")[0] in HEAVY_PACKAGES]
+    assert heavy == []
+    assert times[name] < IMPORT_BUDGET_US
@@ -0,0 +1,51 @@
+"""Tests for vivosun_thermo setup."""
+
+from unittest.mock import AsyncMock, patch
+
+from custom_components.vivosun_thermo import async_setup_entry
+from custom_components.vivosun_thermo.const import (
+    ACQUISITION_MODE_POLL,
+    CONF_ACQUISITION_MODE,
+    CONF_CONNECT_TIMEOUT,
+    DOMAIN,
+)
+
+
+async def setup_entry(hass, entry):
+    """Set up the entry without shared stores and bluetooth callbacks."""
+    with (
+        patch(
+            "custom_components.vivosun_thermo.history.async_get_history_store",
+            AsyncMock(return_value=None),
+        ),
+        patch("custom_components.vivosun_thermo.coordinator.async_register_callback"),
+    ):
+        assert await async_setup_entry(hass, entry)
+    entry.async_create_background_task.call_args.args[1].close()
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+async def test_setup_does_not_wait_for_first_refresh(hass, mock_config_entry):
+    """Test setup schedules the first read in the background and forwards platforms."""
+    mock_config_entry.options = {CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL}
+    coordinator = await setup_entry(hass, mock_config_entry)
+
+    assert coordinator.telemetry.cycle_time is None
+    hass.config_entries.async_forward_entry_setups.assert_awaited_once()
+    mock_config_entry.async_create_background_task.assert_called_once()
+
+
+async def test_options_applied_without_reload(hass, mock_config_entry):
+    """Test changed options reach the running coordinator."""
+    mock_config_entry.options = {CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL}
+    coordinator = await setup_entry(hass, mock_config_entry)
+
+    mock_config_entry.options = {
+        CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL,
+        CONF_CONNECT_TIMEOUT: 10,
+    }
+    update_listener = mock_config_entry.add_update_listener.call_args.args[0]
+    await update_listener(hass, mock_config_entry)
+
+    assert hass.data[DOMAIN][mock_config_entry.entry_id] is coordinator
+    assert coordinator.options[CONF_CONNECT_TIMEOUT] == 10
@@ -0,0 +1,112 @@
+"""Tests for vivosun_thermo derived climate metrics."""
+
+from math import isnan
+
+import pytest
+
+from custom_components.vivosun_thermo.const import CONF_LEAF_TEMPERATURE_OFFSET
+from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
+from custom_components.vivosun_thermo.metrics import (
+    calculate_metrics,
+    calculate_metrics_batch,
+    saturation_vapor_pressure,
+)
+from custom_components.vivosun_thermo.protocol import FRAME_SIZE, decode_frames
+
+
+class TestMetrics:
+    """Test derived metrics."""
+
+    async def test_saturation_vapor_pressure(self):
+        """Test saturation vapor pressure at known temperatures."""
+        assert saturation_vapor_pressure(0.0) == pytest.approx(0.611, abs=0.001)
+        assert saturation_vapor_pressure(25.0) == pytest.approx(3.17, abs=0.01)
+
+    async def test_calculate_metrics(self):
+        """Test metrics at 25°C and 50% RH against reference values."""
+        metrics = calculate_metrics(25.0, 50.0)
+
+        assert metrics["vpd"] == pytest.approx(1.58, abs=0.01)
+        assert metrics["dew_point"] == pytest.approx(13.9, abs=0.1)
+        assert metrics["absolute_humidity"] == pytest.approx(11.5, abs=0.1)
+        assert metrics["enthalpy"] == pytest.approx(50.3, abs=0.5)
+        assert metrics["leaf_vpd"] == metrics["vpd"]
+
+    async def test_dew_point_saturated(self):
+        """Test dew point equals air temperature at 100% RH."""
+        assert calculate_metrics(20.0, 100.0)["dew_point"] == pytest.approx(20.0)
+
+    async def test_dew_point_dry(self):
+        """Test dew point is undefined without moisture."""
+        assert calculate_metrics(20.0, 0.0)["dew_point"] is None
+
+    async def test_leaf_offset(self):
+        """Test cooler leaves lower leaf VPD."""
+        metrics = calculate_metrics(25.0, 50.0, -2.0)
+
+        assert metrics["leaf_vpd"] < metrics["vpd"]
+        assert metrics["leaf_vpd"] == pytest.approx(
+            saturation_vapor_pressure(23.0) - saturation_vapor_pressure(25.0) * 0.5
+        )
+
+    async def test_vpd_matches_decoder(self):
+        """Test derived VPD matches the decoder VPD."""
+        assert calculate_metrics(22.5, 65.0)[
+            "vpd"
+        ] == VivosunThermoSensorCoordinator._calculate_vpd(22.5, 65.0)
+
+    async def test_batch_matches_scalar(
+        self, valid_sensor_data_both_probes, valid_sensor_data_main_only
+    ):
+        """Test batch metrics of decoded frames agree with scalar metrics."""
+        frames = decode_frames(
+            valid_sensor_data_both_probes + valid_sensor_data_main_only + bytes(FRAME_SIZE)
+        )
+
+        columns = calculate_metrics_batch(frames["temperature_c"], frames["humidity"], -1.5)
+
+        for index, (temp_c, humidity) in enumerate(
+            zip(frames["temperature_c"], frames["humidity"])
+        ):
+            metrics = calculate_metrics(temp_c, humidity, -1.5)
+            assert columns["vpd"][index] == metrics["vpd"]
+            assert columns["absolute_humidity"][index] == metrics["absolute_humidity"]
+            assert columns["enthalpy"][index] == metrics["enthalpy"]
+            assert columns["leaf_vpd"][index] == metrics["leaf_vpd"]
+            if metrics["dew_point"] is None:
+                assert isnan(columns["dew_point"][index])
+            else:
+                assert columns["dew_point"][index] == metrics["dew_point"]
+        # Zero humidity frame has no dew point
+        assert isnan(columns["dew_point"][2])
+
+    async def test_coordinator_adds_metrics(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_both_probes
+    ):
+        """Test coordinator data includes derived metrics with configured leaf offset."""
+        mock_bleak_client.responses = [valid_sensor_data_both_probes]
+
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_LEAF_TEMPERATURE_OFFSET: -3.0}
+        )
+        data = await coordinator._read_sensor_data()
+
+        for probe in ("main", "external"):
+            values = data[probe]
+            expected = calculate_metrics(values["temperature_c"], values["humidity"], -3.0)
+            assert values["vpd"] == expected["vpd"]
+            assert values["dew_point"] == expected["dew_point"]
+            assert values["absolute_humidity"] == expected["absolute_humidity"]
+            assert values["enthalpy"] == expected["enthalpy"]
+            assert values["leaf_vpd"] == expected["leaf_vpd"]
+
+    async def test_advertisement_adds_metrics(
+        self, hass, config_entry_data, mock_discovery_info, valid_advertisement_data
+    ):
+        """Test advertised readings include derived metrics."""
+        mock_discovery_info.manufacturer_data = {0x0010: valid_advertisement_data}
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        coordinator._async_handle_advertisement(mock_discovery_info, None)
+
+        assert coordinator.data["main"]["dew_point"] == pytest.approx(15.6, abs=0.1)
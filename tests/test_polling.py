@@ -0,0 +1,264 @@
+"""Tests for vivosun_thermo adaptive polling."""
+
+from datetime import timedelta
+from random import Random
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.vivosun_thermo.const import (
+    ACQUISITION_MODE_PERSISTENT,
+    CONF_ACQUISITION_MODE,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    PERSISTENT_SCAN_INTERVAL,
+)
+from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
+from custom_components.vivosun_thermo.polling import (
+    BREAKER_BACKOFF,
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    AdaptiveInterval,
+    CircuitBreaker,
+    poll_phase,
+    staggered_delay,
+)
+
+PRECISIONS = {"temperature_c": 1, "humidity": 0, "vpd": 2}
+
+_MONOTONIC = "custom_components.vivosun_thermo.coordinator.monotonic"
+
+
+def make_data(temp, humidity=50.0, vpd=1.0, external=None):
+    """Create sensor data."""
+    return {"main": {"temperature_c": temp, "humidity": humidity, "vpd": vpd}, "external": external}
+
+
+def make_interval(initial=60):
+    """Create adaptive interval between 30 and 300 seconds."""
+    return AdaptiveInterval(
+        timedelta(seconds=30), timedelta(seconds=300), PRECISIONS, timedelta(seconds=initial)
+    )
+
+
+class TestAdaptiveInterval:
+    """Test AdaptiveInterval."""
+
+    async def test_initial_interval_clamped(self):
+        """Test initial interval stays within bounds."""
+        assert make_interval(10).interval == 30
+        assert make_interval(600).interval == 300
+
+    async def test_backs_off_when_flat(self):
+        """Test interval grows gradually while readings are flat."""
+        interval = make_interval()
+        now = 0.0
+        intervals = []
+        for _ in range(5):
+            intervals.append(interval.update(make_data(22.5), now).total_seconds())
+            now += interval.interval
+
+        assert intervals == [60, 120, 240, 300, 300]
+
+    async def test_speeds_up_on_change(self):
+        """Test interval shrinks when readings change by several display steps."""
+        interval = make_interval(300)
+        interval.update(make_data(22.0), 0)
+
+        assert interval.update(make_data(24.0), 60) == timedelta(seconds=30)
+
+    async def test_sub_step_noise_is_slow(self):
+        """Test changes below display precision don't force fast polling."""
+        interval = make_interval()
+        interval.update(make_data(22.50), 0)
+
+        assert interval.update(make_data(22.52), 60) == timedelta(seconds=120)
+
+    async def test_uses_precision_per_sensor(self):
+        """Test changes are measured in steps of each sensor precision."""
+        interval = make_interval()
+        interval.update(make_data(22.5, vpd=1.00), 0)
+        interval.update(make_data(22.5, vpd=1.05), 60)
+
+        # 5 steps of 0.01 kPa in 60s, smoothed with no prior changes
+        assert interval.rate == pytest.approx(0.5 * 5 / 60)
+
+    async def test_ignores_undefined_values(self):
+        """Test undefined derived values, e.g. dew point at 0% humidity, are skipped."""
+        interval = AdaptiveInterval(
+            timedelta(seconds=30),
+            timedelta(seconds=300),
+            {**PRECISIONS, "dew_point": 1},
+            timedelta(seconds=60),
+        )
+        data = make_data(22.5, humidity=0.0)
+        data["main"]["dew_point"] = None
+        interval.update(data, 0)
+        interval.update(data, 60)
+        changed = make_data(22.7, humidity=0.0)
+        changed["main"]["dew_point"] = None
+
+        assert interval.update(changed, 120) == timedelta(seconds=60)
+
+    async def test_ignores_missing_probe(self):
+        """Test external probe appearing doesn't count as a change."""
+        interval = make_interval()
+        interval.update(make_data(22.5), 0)
+        interval.update(make_data(22.5, external=make_data(18.0)["main"]), 60)
+
+        assert interval.rate == 0
+
+
+class TestStaggeredDelay:
+    """Test poll_phase and staggered_delay."""
+
+    async def test_poll_phase_deterministic(self):
+        """Test phase is stable for an address and spread across addresses."""
+        phases = [poll_phase(f"AA:BB:CC:DD:EE:{index:02X}") for index in range(256)]
+
+        assert phases == [poll_phase(f"AA:BB:CC:DD:EE:{index:02X}") for index in range(256)]
+        assert all(0 <= phase < 1 for phase in phases)
+        # Each quarter of the interval gets about a quarter of the devices
+        for quarter in range(4):
+            assert 32 < sum(quarter / 4 <= phase < (quarter + 1) / 4 for phase in phases) < 96
+
+    async def test_staggered_delay(self):
+        """Test delay reaches the next slot at least half an interval away."""
+        assert staggered_delay(60, 0.5, 0) == 30
+        assert staggered_delay(60, 0.5, 40) == 50
+        assert staggered_delay(60, 0.5, 25) == 65
+        assert staggered_delay(60, 0.0, 121) == 59
+
+
+class TestCoordinatorAdaptiveInterval:
+    """Test coordinator applies adaptive interval."""
+
+    async def test_update_interval_adapts(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test update interval follows readings."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_MIN_SCAN_INTERVAL: 10, CONF_MAX_SCAN_INTERVAL: 3600}
+        )
+        assert coordinator.update_interval == timedelta(seconds=60)
+
+        await coordinator._read_sensor_data()
+        coordinator.adaptive_interval._last_time = -60
+        await coordinator._read_sensor_data()
+
+        assert coordinator.adaptive_interval.interval == 120
+        # Next poll waits for the slot of this device within the interval
+        assert timedelta(seconds=60) <= coordinator.update_interval < timedelta(seconds=180)
+
+    async def test_update_interval_staggered(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test polls land on the phase of the device within the interval."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        with patch(_MONOTONIC, return_value=1000.0):
+            await coordinator._read_sensor_data()
+
+        next_poll = 1000.0 + coordinator.update_interval.total_seconds()
+        assert next_poll % 60 == pytest.approx(coordinator.phase_offset)
+        assert coordinator.phase == poll_phase("AA:BB:CC:DD:EE:FF")
+
+    async def test_dry_air_polls(self, hass, config_entry_data, mock_bleak_client):
+        """Test repeated polls at 0% humidity, where dew point is undefined, keep working."""
+        mock_bleak_client.responses = [
+            bytearray([0, 0x68, 0x01, 0x00, 0x00, 0, 0, 0xFF, 0xFF, 0xFF, 0xFF])
+        ]
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        for _ in range(3):
+            data = await coordinator._read_sensor_data()
+
+        assert data["main"]["humidity"] == 0
+        assert data["main"]["dew_point"] is None
+
+    async def test_persistent_mode_fixed_interval(self, hass, config_entry_data, mock_bleak_client):
+        """Test persistent mode keeps its fixed interval."""
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+        mock_bleak_client.responses = [
+            bytearray([0, 0x68, 0x01, 0x10, 0x04, 0, 0, 0xFF, 0xFF, 0xFF, 0xFF])
+        ]
+
+        await coordinator._read_sensor_data()
+
+        assert coordinator.update_interval == PERSISTENT_SCAN_INTERVAL
+
+
+class TestCircuitBreaker:
+    """Test CircuitBreaker."""
+
+    async def test_backoff_doubles_with_jitter(self):
+        """Test retry delay doubles per failure and is jittered within its upper half."""
+        breaker = CircuitBreaker(base=30, max_delay=100, threshold=10, random=Random(0))
+        delays = []
+        for _ in range(4):
+            breaker.record_failure(0.0)
+            delays.append(breaker.retry_at)
+
+        assert breaker.state == BREAKER_BACKOFF
+        for delay, upper in zip(delays, (30, 60, 100, 100)):
+            assert upper / 2 <= delay <= upper
+        assert not breaker.allow(delays[-1] - 1)
+        assert breaker.allow(delays[-1])
+
+    async def test_success_closes(self):
+        """Test a successful read resets the failure count."""
+        breaker = CircuitBreaker(threshold=2)
+        breaker.record_failure(0.0)
+        breaker.record_success()
+
+        assert breaker.state == BREAKER_CLOSED
+        assert breaker.failures == 0
+        assert breaker.allow(0.0)
+
+    async def test_opens_after_threshold_until_rearmed(self):
+        """Test repeated failures stop attempts until an advertisement re-arms the breaker."""
+        breaker = CircuitBreaker(max_delay=1800, threshold=2)
+        breaker.record_failure(0.0)
+        breaker.record_failure(0.0)
+
+        assert breaker.state == BREAKER_OPEN
+        assert not breaker.allow(1e9)
+
+        breaker.rearm()
+        assert breaker.state == BREAKER_HALF_OPEN
+        assert breaker.allow(1800.0)
+
+        # A failed attempt after re-arming opens the breaker right away
+        breaker.record_failure(1800.0)
+        assert breaker.state == BREAKER_OPEN
+
+    async def test_rearm_keeps_max_backoff(self):
+        """Test a device advertising between failed attempts is retried at most per max delay."""
+        breaker = CircuitBreaker(base=30, max_delay=1800, threshold=2, random=Random(0))
+        now = 0.0
+        attempts = []
+        while now < 3600:
+            # Advertises every 5 seconds but every connection attempt fails
+            breaker.rearm()
+            if breaker.allow(now):
+                attempts.append(now)
+                breaker.record_failure(now)
+            now += 5
+
+        assert breaker.state == BREAKER_HALF_OPEN
+        assert len(attempts) <= 2 + 3600 / 900
+        for previous, current in zip(attempts[2:], attempts[3:]):
+            assert current - previous >= 900
+
+    async def test_rearm_ignored_while_closed(self):
+        """Test advertisements don't change a healthy breaker."""
+        breaker = CircuitBreaker()
+        breaker.rearm()
+
+        assert breaker.as_dict(0.0) == {"state": BREAKER_CLOSED, "failures": 0, "retry_in": None}
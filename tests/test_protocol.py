@@ -0,0 +1,92 @@
+"""Tests for vivosun_thermo frame protocol."""
+
+from math import isnan
+from random import Random
+
+import pytest
+
+from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
+from custom_components.vivosun_thermo.protocol import (
+    FRAME,
+    FRAME_SIZE,
+    battery_percentage,
+    decode_frames,
+)
+
+
+def make_frame(temp, humidity, external_temp=-1, external_humidity=-1):
+    """Encode a status frame from raw 1/16 unit values."""
+    return FRAME.pack(temp, humidity, external_temp, external_humidity)
+
+
+class TestDecodeFrames:
+    """Test batch frame decoding."""
+
+    async def test_decode_frames(self, valid_sensor_data_both_probes, valid_sensor_data_main_only):
+        """Test columns are filled per frame."""
+        frames = decode_frames(valid_sensor_data_both_probes + valid_sensor_data_main_only)
+
+        assert list(frames["temperature_c"]) == [22.5, 22.5]
+        assert list(frames["humidity"]) == [65.0, 65.0]
+        assert list(frames["external"]) == [1, 0]
+        assert frames["external_temperature_c"][0] == 18.0
+        assert frames["external_humidity"][0] == 70.0
+        assert isnan(frames["external_temperature_c"][1])
+        assert isnan(frames["external_humidity"][1])
+
+    async def test_decode_frames_empty(self):
+        """Test empty buffer decodes to empty columns."""
+        frames = decode_frames(b"")
+
+        assert len(frames["temperature_c"]) == 0
+        assert len(frames["external"]) == 0
+
+    async def test_decode_frames_partial(self, valid_sensor_data_main_only):
+        """Test trailing partial frame is ignored."""
+        frames = decode_frames(valid_sensor_data_main_only + bytes(3))
+
+        assert list(frames["temperature_c"]) == [22.5]
+        assert len(decode_frames(bytes(FRAME_SIZE - 1))["humidity"]) == 0
+
+    async def test_matches_single_frame_path(self):
+        """Test batch decoder agrees with per-frame decoding."""
+        random = Random(42)
+        raw = [
+            make_frame(
+                random.randint(-400, 1000),
+                random.randint(0, 1600),
+                *(
+                    (random.randint(-400, 1000), random.randint(0, 1600))
+                    if random.random() < 0.5
+                    else (-1, -1)
+                ),
+            )
+            for _ in range(500)
+        ]
+
+        frames = decode_frames(b"".join(raw))
+
+        for index, frame in enumerate(raw):
+            expected = VivosunThermoSensorCoordinator._decode_raw_data(bytearray(frame))
+            main = VivosunThermoSensorCoordinator._decode_probe_data(frame, 1, 3)
+            assert expected["main"] == main
+            assert frames["temperature_c"][index] == main["temperature_c"]
+            assert frames["humidity"][index] == main["humidity"]
+            if expected["external"] is None:
+                assert not frames["external"][index]
+            else:
+                external = VivosunThermoSensorCoordinator._decode_probe_data(frame, 7, 9)
+                assert expected["external"] == external
+                assert frames["external_temperature_c"][index] == external["temperature_c"]
+                assert frames["external_humidity"][index] == external["humidity"]
+
+
+class TestBatteryPercentage:
+    """Test battery_percentage."""
+
+    @pytest.mark.parametrize(
+        ("millivolts", "percentage"), [(3300, 100), (3000, 100), (2600, 50), (2200, 0), (1800, 0)]
+    )
+    async def test_battery_percentage(self, millivolts, percentage):
+        """Test voltage is mapped linearly and clamped to the usable range."""
+        assert battery_percentage(millivolts) == percentage
@@ -0,0 +1,162 @@
+"""Tests for vivosun_thermo connection scheduler."""
+
+from asyncio import Event, gather, sleep
+
+from custom_components.vivosun_thermo.const import (
+    ACQUISITION_MODE_PERSISTENT,
+    CONF_ACQUISITION_MODE,
+    DATA_SCHEDULER,
+    DOMAIN,
+)
+from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
+from custom_components.vivosun_thermo.scheduler import (
+    VivosunThermoConnectionScheduler,
+    async_get_scheduler,
+)
+
+
+class TestVivosunThermoConnectionScheduler:
+    """Test VivosunThermoConnectionScheduler."""
+
+    async def test_limits_concurrency_per_source(self):
+        """Test no more than max_connections jobs run on the same source."""
+        scheduler = VivosunThermoConnectionScheduler(max_connections=2, connect_spacing=0)
+        active = 0
+        peak = 0
+
+        async def job():
+            nonlocal active, peak
+            async with scheduler.async_slot("proxy", "device"):
+                active += 1
+                peak = max(peak, active)
+                await sleep(0.01)
+                active -= 1
+
+        await gather(*(job() for _ in range(6)))
+
+        assert peak == 2
+        stats = scheduler.stats()["proxy"]
+        assert stats["jobs"] == 6
+        assert stats["queued"] == 0
+        assert stats["active"] == 0
+        assert stats["max_wait"] > 0
+
+    async def test_sources_are_independent(self):
+        """Test a busy source does not block other sources."""
+        scheduler = VivosunThermoConnectionScheduler(max_connections=1, connect_spacing=0)
+        release = Event()
+
+        async def hold():
+            async with scheduler.async_slot("proxy1", "device1"):
+                await release.wait()
+
+        async def other():
+            async with scheduler.async_slot("proxy2", "device2") as wait:
+                return wait
+
+        holder = gather(hold())
+        await sleep(0)
+        wait = await other()
+        release.set()
+        await holder
+
+        assert wait < 0.01
+
+    async def test_staggers_connection_starts(self):
+        """Test connection starts on the same source are spaced out."""
+        scheduler = VivosunThermoConnectionScheduler(max_connections=3, connect_spacing=0.02)
+
+        async def job():
+            async with scheduler.async_slot("proxy", "device") as wait:
+                return wait
+
+        waits = sorted(await gather(job(), job(), job()))
+
+        assert waits[0] < 0.01
+        assert waits[1] >= 0.015
+        assert waits[2] >= 0.035
+
+    async def test_cancelled_job_leaves_queue(self):
+        """Test a job cancelled while queued is not counted anymore."""
+        scheduler = VivosunThermoConnectionScheduler(max_connections=1, connect_spacing=0)
+        release = Event()
+
+        async def hold():
+            async with scheduler.async_slot("proxy", "device1"):
+                await release.wait()
+
+        async def queued():
+            async with scheduler.async_slot("proxy", "device2"):
+                pass
+
+        holder = gather(hold())
+        waiter = gather(queued())
+        await sleep(0)
+        assert scheduler.stats()["proxy"]["queued"] == 1
+
+        waiter.cancel()
+        await sleep(0)
+        release.set()
+        await holder
+
+        assert scheduler.stats()["proxy"]["queued"] == 0
+
+    async def test_async_get_scheduler_shared(self, hass):
+        """Test scheduler is shared per domain."""
+        hass.data = {}
+
+        scheduler = async_get_scheduler(hass)
+
+        assert async_get_scheduler(hass) is scheduler
+        assert hass.data[DOMAIN][DATA_SCHEDULER] is scheduler
+
+    async def test_coordinator_reports_queue_wait(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test coordinator polls through the shared scheduler."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        await coordinator.async_refresh()
+
+        assert coordinator.scheduler is hass.data[DOMAIN][DATA_SCHEDULER]
+        assert coordinator.last_queue_wait is not None
+        assert coordinator.scheduler.stats()["local"]["jobs"] == 1
+
+    async def test_persistent_connection_holds_slot(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test a kept connection counts against the source until it is disconnected."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+
+        stats = coordinator.scheduler.stats()["local"]
+        assert stats["active"] == 1
+        assert stats["jobs"] == 1
+
+        await coordinator.async_shutdown()
+
+        assert coordinator.scheduler.stats()["local"]["active"] == 0
+
+    async def test_persistent_reconnect_releases_slot(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test a dropped kept connection gives its slot back before reconnecting."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+        )
+        await coordinator.async_refresh()
+        mock_bleak_client.is_connected = False
+        coordinator._handle_disconnect(mock_bleak_client)
+        await hass.async_create_task.call_args[0][0]
+
+        stats = coordinator.scheduler.stats()["local"]
+        assert stats["active"] == 1
+        assert stats["jobs"] == 2
@@ -1,11 +1,38 @@
 """Tests for vivosun_thermo sensor."""
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
-
-from custom_components.vivosun_thermo.const import DOMAIN
+from time import monotonic
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bleak.exc import BleakError
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
+    SensorExtraStoredData,
+    SensorStateClass,
+)
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTemperature
+
+from custom_components.vivosun_thermo.const import (
+    CONF_STATE_DEADBAND,
+    CONF_STATE_HEARTBEAT,
+    DIAGNOSTIC_SENSOR_TYPES,
+    DOMAIN,
+    ROLLING_SENSOR_TYPES,
+    SENSOR_TYPES,
+    VITAL_SENSOR_TYPES,
+)
 from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
-from custom_components.vivosun_thermo.sensor import VivosunThermoSensor, async_setup_entry
+from custom_components.vivosun_thermo.sensor import (
+    VivosunThermoDiagnosticSensor,
+    VivosunThermoRollingSensor,
+    VivosunThermoSensor,
+    VivosunThermoVitalSensor,
+    async_setup_entry,
+)
+
+PROBE_SENSOR_COUNT = len(SENSOR_TYPES) + len(ROLLING_SENSOR_TYPES)
+DEVICE_SENSOR_COUNT = len(DIAGNOSTIC_SENSOR_TYPES) + len(VITAL_SENSOR_TYPES)
 
 
 class TestVivosunThermoSensor:
@@ -102,6 +129,19 @@ class TestVivosunThermoSensor:
         sensor = VivosunThermoSensor(coordinator, "external", "temperature_c", mock_config_entry)
         assert sensor.available is False
 
+    async def test_sensor_unavailable_when_not_present(
+        self, hass, config_entry_data, mock_config_entry
+    ):
+        """Test sensor is unavailable while the device is not heard."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.data = {
+            "main": {"temperature_c": 22.5, "humidity": 65.0, "vpd": 0.95},
+        }
+        coordinator.present = False
+
+        sensor = VivosunThermoSensor(coordinator, "main", "temperature_c", mock_config_entry)
+        assert sensor.available is False
+
     async def test_sensor_device_info(self, hass, config_entry_data, mock_config_entry):
         """Test sensor device info."""
         coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
@@ -154,8 +194,9 @@ class TestVivosunThermoSensor:
 
         await async_setup_entry(hass, mock_config_entry, mock_add_entities)
 
-        # Should create 6 entities: 3 sensor types × 2 probes
-        assert len(entities) == 6
+        # One entity per sensor type for each of 2 probes plus device diagnostics
+        assert len(entities) == PROBE_SENSOR_COUNT * 2 + DEVICE_SENSOR_COUNT
+        entities = [e for e in entities if type(e) is VivosunThermoSensor]
 
         # Verify we have main and external sensors
         probe_types = {e.probe_type for e in entities}
@@ -163,7 +204,15 @@ class TestVivosunThermoSensor:
 
         # Verify we have all sensor types
         sensor_types = {e.sensor_type for e in entities}
-        assert sensor_types == {"temperature_c", "humidity", "vpd"}
+        assert sensor_types == {
+            "temperature_c",
+            "humidity",
+            "vpd",
+            "leaf_vpd",
+            "dew_point",
+            "absolute_humidity",
+            "enthalpy",
+        }
 
     async def test_async_setup_entry_main_probe_only(
         self, hass, mock_config_entry, config_entry_data, mock_bleak_client
@@ -184,8 +233,9 @@ class TestVivosunThermoSensor:
 
         await async_setup_entry(hass, mock_config_entry, mock_add_entities)
 
-        # Should create 3 entities: 3 sensor types × 1 probe (main only)
-        assert len(entities) == 3
+        # One entity per sensor type for 1 probe (main only) plus device diagnostics
+        assert len(entities) == PROBE_SENSOR_COUNT + DEVICE_SENSOR_COUNT
+        entities = [e for e in entities if isinstance(e, VivosunThermoSensor)]
 
         # Verify all are main probe sensors
         probe_types = {e.probe_type for e in entities}
@@ -207,3 +257,356 @@ class TestVivosunThermoSensor:
 
         unique_ids = [s._attr_unique_id for s in sensors]
         assert len(unique_ids) == len(set(unique_ids))  # All unique
+
+
+class TestVivosunThermoRollingSensor:
+    """Test VivosunThermoRollingSensor."""
+
+    async def test_sensor_initialization(self, hass, config_entry_data, mock_config_entry):
+        """Test rolling sensor attributes."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        sensor = VivosunThermoRollingSensor(
+            coordinator, "main", "temperature_c_trend", mock_config_entry
+        )
+
+        assert sensor._attr_name == "VIVOSUN AeroLab THB1S Main Temperature 1h Trend"
+        assert sensor._attr_unique_id == "ThermoBeacon2-AA:BB:CC:DD:EE:FF-main-temperature_c_trend"
+        assert sensor._attr_native_unit_of_measurement == "°C/h"
+        assert sensor._attr_entity_registry_enabled_default is False
+
+    async def test_values(self, hass, config_entry_data, mock_config_entry):
+        """Test rolling sensors report statistics of their probe."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.data = {
+            "main": {"temperature_c": 22.0, "humidity": 60.0, "vpd": 1.06},
+            "external": None,
+        }
+        coordinator.rolling["main"].add(0.0, {"temperature_c": 20.0, "humidity": 50.0})
+        coordinator.rolling["main"].add(60.0, {"temperature_c": 22.0, "humidity": 60.0})
+
+        def sensor(probe_type, sensor_type):
+            return VivosunThermoRollingSensor(
+                coordinator, probe_type, sensor_type, mock_config_entry
+            )
+
+        assert sensor("main", "temperature_c_min").native_value == 20.0
+        assert sensor("main", "humidity_max").native_value == 60.0
+        assert sensor("main", "humidity_mean").native_value == 55.0
+        assert sensor("main", "temperature_c_trend").native_value == pytest.approx(120.0)
+        assert sensor("main", "humidity_mean").available
+        assert not sensor("external", "humidity_mean").available
+
+
+class TestVivosunThermoDiagnosticSensor:
+    """Test VivosunThermoDiagnosticSensor."""
+
+    async def test_sensor_initialization(self, hass, config_entry_data):
+        """Test diagnostic sensor attributes."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        sensor = VivosunThermoDiagnosticSensor(coordinator, "connect_time")
+
+        assert sensor._attr_name == "VIVOSUN AeroLab THB1S Connect Time"
+        assert sensor._attr_unique_id == "ThermoBeacon2-AA:BB:CC:DD:EE:FF-connect_time"
+        assert sensor._attr_entity_category == EntityCategory.DIAGNOSTIC
+        assert sensor._attr_device_class == SensorDeviceClass.DURATION
+
+    async def test_unavailable_without_telemetry(self, hass, config_entry_data):
+        """Test diagnostic sensors are unavailable before the first poll."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        for sensor_type in DIAGNOSTIC_SENSOR_TYPES:
+            sensor = VivosunThermoDiagnosticSensor(coordinator, sensor_type)
+            assert sensor.native_value is None
+            assert not sensor.available
+
+    async def test_values_after_poll(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test diagnostic sensors report telemetry of the last poll."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        await coordinator._read_sensor_data()
+
+        cycle_time = VivosunThermoDiagnosticSensor(coordinator, "cycle_time")
+        assert cycle_time.native_value >= 0
+        assert cycle_time.extra_state_attributes["count"] == 1
+        assert VivosunThermoDiagnosticSensor(coordinator, "connect_time").native_value >= 0
+        assert VivosunThermoDiagnosticSensor(coordinator, "failure_rate").native_value == 0
+        assert VivosunThermoVitalSensor(coordinator, "rssi").native_value == -60
+        assert VivosunThermoVitalSensor(coordinator, "rssi").extra_state_attributes is None
+
+    async def test_breaker_state_attributes(self, hass, config_entry_data):
+        """Test failure rate sensor exposes the circuit breaker state."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        sensor = VivosunThermoDiagnosticSensor(coordinator, "failure_rate")
+
+        assert sensor.extra_state_attributes == {
+            "breaker_state": "closed",
+            "breaker_failures": 0,
+            "breaker_retry_in": None,
+        }
+
+        coordinator.breaker.record_failure(monotonic())
+        attributes = sensor.extra_state_attributes
+        assert attributes["breaker_state"] == "backoff"
+        assert attributes["breaker_failures"] == 1
+        assert 0 < attributes["breaker_retry_in"] <= 30
+
+
+class TestVivosunThermoVitalSensor:
+    """Test VivosunThermoVitalSensor."""
+
+    async def test_sensor_initialization(self, hass, config_entry_data):
+        """Test vital sensor attributes keep the unique id of the former diagnostic sensor."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        rssi = VivosunThermoVitalSensor(coordinator, "rssi")
+        battery = VivosunThermoVitalSensor(coordinator, "battery")
+
+        assert rssi._attr_name == "VIVOSUN AeroLab THB1S Signal Strength"
+        assert rssi._attr_unique_id == "ThermoBeacon2-AA:BB:CC:DD:EE:FF-rssi"
+        assert rssi._attr_device_class == SensorDeviceClass.SIGNAL_STRENGTH
+        assert battery._attr_unique_id == "ThermoBeacon2-AA:BB:CC:DD:EE:FF-battery"
+        assert battery._attr_device_class == SensorDeviceClass.BATTERY
+        assert battery._attr_entity_category == EntityCategory.DIAGNOSTIC
+
+    async def test_battery_values(self, hass, config_entry_data):
+        """Test battery sensor reports level with voltage as attribute."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        sensor = VivosunThermoVitalSensor(coordinator, "battery")
+        assert not sensor.available
+
+        coordinator.battery = 80
+        coordinator.battery_voltage = 2.84
+
+        assert sensor.available
+        assert sensor.native_value == 80
+        assert sensor.extra_state_attributes == {"voltage": 2.84}
+
+    async def test_writes_throttled(self, hass, config_entry_data):
+        """Test vital changes are written at most once per vitals interval."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        sensor = VivosunThermoVitalSensor(coordinator, "rssi")
+        sensor.async_write_ha_state = MagicMock()
+        now = monotonic()
+
+        for offset, rssi, writes in ((0, -60, 1), (1, -65, 1), (2, -65, 1), (301, -70, 2)):
+            coordinator.telemetry.rssi = rssi
+            with patch(
+                "custom_components.vivosun_thermo.sensor.monotonic", return_value=now + offset
+            ):
+                sensor._handle_coordinator_update()
+            assert sensor.async_write_ha_state.call_count == writes
+
+        # Becoming unavailable is written right away
+        coordinator.telemetry.rssi = None
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 3
+
+
+class TestVivosunThermoSensorStateWrites:
+    """Test suppression of no-op state writes."""
+
+    @pytest.fixture
+    def coordinator(self, hass, config_entry_data):
+        """Coordinator with main probe data."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.data = {
+            "main": {"temperature_c": 22.5, "humidity": 65.0, "vpd": 0.95},
+            "external": None,
+        }
+        return coordinator
+
+    def make_sensor(self, coordinator, mock_config_entry, sensor_type="temperature_c"):
+        """Create sensor with state writes mocked."""
+        sensor = VivosunThermoSensor(coordinator, "main", sensor_type, mock_config_entry)
+        sensor.async_write_ha_state = MagicMock()
+        return sensor
+
+    def update(self, coordinator, sensor, **values):
+        """Publish new main probe values to the sensor."""
+        coordinator.data = {"main": {**coordinator.data["main"], **values}, "external": None}
+        sensor._handle_coordinator_update()
+
+    async def test_same_at_precision_not_written(self, coordinator, mock_config_entry):
+        """Test changes hidden by display precision don't write state."""
+        sensor = self.make_sensor(coordinator, mock_config_entry)
+
+        self.update(coordinator, sensor)
+        self.update(coordinator, sensor, temperature_c=22.52)
+        self.update(coordinator, sensor, temperature_c=22.48)
+
+        assert sensor.async_write_ha_state.call_count == 1
+
+    async def test_visible_change_written(self, coordinator, mock_config_entry):
+        """Test changes visible at display precision write state."""
+        sensor = self.make_sensor(coordinator, mock_config_entry)
+
+        self.update(coordinator, sensor)
+        self.update(coordinator, sensor, temperature_c=22.6)
+
+        assert sensor.async_write_ha_state.call_count == 2
+
+    async def test_availability_change_written(self, coordinator, mock_config_entry):
+        """Test probe disappearing writes state."""
+        sensor = VivosunThermoSensor(coordinator, "external", "humidity", mock_config_entry)
+        sensor.async_write_ha_state = MagicMock()
+
+        sensor._handle_coordinator_update()
+        coordinator.data = {**coordinator.data, "external": {"humidity": 70.0}}
+        sensor._handle_coordinator_update()
+        coordinator.data = {**coordinator.data, "external": None}
+        sensor._handle_coordinator_update()
+
+        assert sensor.async_write_ha_state.call_count == 3
+
+    async def test_deadband(self, coordinator, mock_config_entry):
+        """Test changes within deadband are not written."""
+        coordinator.options[CONF_STATE_DEADBAND] = 2
+        sensor = self.make_sensor(coordinator, mock_config_entry, "humidity")
+
+        self.update(coordinator, sensor)
+        self.update(coordinator, sensor, humidity=67.0)
+        self.update(coordinator, sensor, humidity=63.0)
+        self.update(coordinator, sensor, humidity=68.0)
+
+        assert sensor.async_write_ha_state.call_count == 2
+
+    async def test_heartbeat(self, coordinator, mock_config_entry):
+        """Test unchanged state is written again after heartbeat."""
+        coordinator.options[CONF_STATE_HEARTBEAT] = 60
+        sensor = self.make_sensor(coordinator, mock_config_entry)
+
+        with patch("custom_components.vivosun_thermo.sensor.monotonic", return_value=1000):
+            self.update(coordinator, sensor)
+        with patch("custom_components.vivosun_thermo.sensor.monotonic", return_value=1030):
+            self.update(coordinator, sensor)
+        with patch("custom_components.vivosun_thermo.sensor.monotonic", return_value=1060):
+            self.update(coordinator, sensor)
+
+        assert sensor.async_write_ha_state.call_count == 2
+
+    async def test_heartbeat_disabled(self, coordinator, mock_config_entry):
+        """Test zero heartbeat never forces writes."""
+        coordinator.options[CONF_STATE_HEARTBEAT] = 0
+        sensor = self.make_sensor(coordinator, mock_config_entry)
+
+        with patch("custom_components.vivosun_thermo.sensor.monotonic", return_value=1000):
+            self.update(coordinator, sensor)
+        with patch("custom_components.vivosun_thermo.sensor.monotonic", return_value=100000):
+            self.update(coordinator, sensor)
+
+        assert sensor.async_write_ha_state.call_count == 1
+
+
+class TestVivosunThermoSensorStartup:
+    """Test entities created before the first reading."""
+
+    async def setup_entities(self, hass, coordinator, mock_config_entry):
+        """Set up the platform, returns the list entities are added to."""
+        hass.data.setdefault(DOMAIN, {})[mock_config_entry.entry_id] = coordinator
+        entities = []
+        await async_setup_entry(hass, mock_config_entry, entities.extend)
+        return entities
+
+    async def test_main_probe_without_data(self, hass, config_entry_data, mock_config_entry):
+        """Test main probe entities are created before the first reading."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.data = None
+
+        entities = await self.setup_entities(hass, coordinator, mock_config_entry)
+
+        sensors = [e for e in entities if isinstance(e, VivosunThermoSensor)]
+        assert {e.probe_type for e in sensors} == {"main"}
+        assert len(sensors) == PROBE_SENSOR_COUNT
+        assert sensors[0].native_value is None
+        assert not sensors[0].available
+
+    async def test_external_probe_from_registry(
+        self, hass, config_entry_data, mock_config_entry, mock_entity_registry
+    ):
+        """Test external probe entities are created when registered before."""
+        mock_entity_registry.append(
+            MagicMock(unique_id="ThermoBeacon2-AA:BB:CC:DD:EE:FF-external-temperature_c")
+        )
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.data = None
+
+        entities = await self.setup_entities(hass, coordinator, mock_config_entry)
+
+        sensors = [e for e in entities if isinstance(e, VivosunThermoSensor)]
+        assert {e.probe_type for e in sensors} == {"main", "external"}
+
+    async def test_external_probe_added_on_first_reading(
+        self, hass, config_entry_data, mock_config_entry
+    ):
+        """Test external probe entities are added once the probe shows up."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.data = None
+        entities = await self.setup_entities(hass, coordinator, mock_config_entry)
+        count = len(entities)
+
+        probe = {"temperature_c": 18.0, "humidity": 70.0, "vpd": 0.62}
+        coordinator.async_set_updated_data({"main": probe, "external": probe})
+        coordinator.async_set_updated_data({"main": probe, "external": probe})
+
+        assert len(entities) == count + PROBE_SENSOR_COUNT
+        assert {e.probe_type for e in entities[count:]} == {"external"}
+
+    async def test_restored_value_until_first_reading(
+        self, hass, config_entry_data, mock_config_entry
+    ):
+        """Test last known value is shown until the coordinator has data."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.data = None
+        sensor = VivosunThermoSensor(coordinator, "main", "temperature_c", mock_config_entry)
+
+        with (
+            patch.object(RestoreSensor, "async_added_to_hass", AsyncMock()),
+            patch.object(
+                sensor,
+                "async_get_last_sensor_data",
+                AsyncMock(return_value=SensorExtraStoredData(21.3, UnitOfTemperature.CELSIUS)),
+            ),
+        ):
+            await sensor.async_added_to_hass()
+
+        assert sensor.native_value == 21.3
+        assert sensor.available
+
+        coordinator.data = {
+            "main": {"temperature_c": 22.5, "humidity": 65.0, "vpd": 0.95},
+            "external": None,
+        }
+        assert sensor.native_value == 22.5
+
+    async def test_restored_value_dropped_after_failed_refresh(
+        self, hass, config_entry_data, mock_config_entry, mock_establish_connection
+    ):
+        """Test restored value stops standing in once the first refresh attempt failed."""
+        mock_establish_connection.side_effect = BleakError("Out of range")
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.data = None
+        sensor = VivosunThermoSensor(coordinator, "main", "temperature_c", mock_config_entry)
+        sensor._restored_value = 21.3
+        assert sensor.available
+
+        await coordinator.async_refresh()
+
+        assert not coordinator.last_update_success
+        assert not sensor.available
+
+    async def test_sensor_unavailable_after_failed_update(
+        self, hass, config_entry_data, mock_config_entry, mock_establish_connection
+    ):
+        """Test sensor with earlier data is unavailable while updates fail."""
+        mock_establish_connection.side_effect = BleakError("Out of range")
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+        coordinator.data = {
+            "main": {"temperature_c": 22.5, "humidity": 65.0, "vpd": 0.95},
+        }
+        sensor = VivosunThermoSensor(coordinator, "main", "temperature_c", mock_config_entry)
+
+        await coordinator.async_refresh()
+
+        assert coordinator.data
+        assert not sensor.available
@@ -0,0 +1,197 @@
+"""Tests for vivosun_thermo request/response session."""
+
+from asyncio import gather, get_running_loop, sleep
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bleak.exc import BleakError
+
+from custom_components.vivosun_thermo.session import VivosunThermoSession
+from custom_components.vivosun_thermo.telemetry import VivosunThermoTelemetry
+
+STATUS = bytearray([0x00, 0x68, 0x01, 0x10, 0x04, 0x00, 0x00, 0xFF, 0xFF, 0xFF, 0xFF])
+COUNT = bytearray([0x01, 0x05, 0x00, 0x00, 0x00])
+
+
+class FakeClient:
+    """Client answering commands with frames delivered on the next loop iteration."""
+
+    def __init__(self, answers=None):
+        self.answers = answers or {}
+        self.handler = None
+        self.mock = MagicMock(is_connected=True)
+        self.mock.start_notify = AsyncMock(side_effect=self._start_notify)
+        self.mock.stop_notify = AsyncMock()
+        self.mock.write_gatt_char = AsyncMock(side_effect=self._write)
+
+    async def _start_notify(self, char, handler):
+        self.handler = handler
+
+    async def _write(self, char, data):
+        for frame in self.answers.get(bytes(data), []):
+            get_running_loop().call_soon(self.handler, None, frame)
+
+    def notify(self, frame):
+        """Send a notification the device was not asked for."""
+        self.handler(None, frame)
+
+
+class TestVivosunThermoSession:
+    """Test VivosunThermoSession."""
+
+    async def test_request(self):
+        """Test a request is answered through a single subscription."""
+        client = FakeClient({b"\x0d": [STATUS]})
+        telemetry = VivosunThermoTelemetry()
+
+        async with VivosunThermoSession(client.mock, "command", "status", telemetry) as session:
+            assert await session.request(b"\x0d") == STATUS
+
+        client.mock.start_notify.assert_called_once()
+        client.mock.write_gatt_char.assert_called_once_with("command", b"\x0d")
+        client.mock.stop_notify.assert_called_once_with("status")
+        assert set(telemetry.phases) == {"subscribe", "write", "notify"}
+
+    async def test_timeout_cleans_up(self):
+        """Test an unanswered request times out and the subscription is still removed."""
+        client = FakeClient()
+
+        with pytest.raises(TimeoutError):
+            async with VivosunThermoSession(client.mock, "command", "status") as session:
+                await session.request(b"\x0d", timeout=0.01)
+
+        assert session._pending == []
+        client.mock.stop_notify.assert_called_once()
+
+    async def test_pipelined_requests_matched_by_opcode(self):
+        """Test concurrent requests get their own responses regardless of arrival order."""
+        client = FakeClient()
+        async with VivosunThermoSession(client.mock, "command", "status") as session:
+            requests = gather(session.request(b"\x0d"), session.request(b"\x01", opcode=0x01))
+            await sleep(0)
+            # Count answered first although the status command was written first
+            client.notify(COUNT)
+            client.notify(STATUS)
+            status, count = await requests
+
+        assert status == STATUS
+        assert count == COUNT
+        assert client.mock.start_notify.call_count == 1
+
+    async def test_multi_frame_request(self):
+        """Test a request collects frames until its completion check passes."""
+        frames = [bytearray([0x07, index]) for index in range(3)]
+        client = FakeClient({b"\x07": frames})
+
+        async with VivosunThermoSession(client.mock, "command", "status") as session:
+            received = await session.request_frames(
+                b"\x07", opcode=0x07, complete=lambda received: len(received) == 3
+            )
+
+        assert received == frames
+
+    async def test_stream_timeout_per_frame(self):
+        """Test a stream outlasting its frame timeout completes while frames keep coming."""
+        client = FakeClient()
+
+        async with VivosunThermoSession(client.mock, "command", "status") as session:
+            stream = get_running_loop().create_task(
+                session.request_stream(
+                    b"\x07", 0x07, lambda received: len(received) == 3, frame_timeout=0.05
+                )
+            )
+            for index in range(3):
+                await sleep(0.03)
+                client.notify(bytearray([0x07, index]))
+            received = await stream
+
+        assert len(received) == 3
+
+    async def test_stalled_stream_returns_partial(self):
+        """Test a stream that stalls returns the frames that arrived."""
+        frames = [bytearray([0x07, index]) for index in range(2)]
+        client = FakeClient({b"\x07": frames})
+
+        async with VivosunThermoSession(client.mock, "command", "status") as session:
+            received = await session.request_stream(
+                b"\x07", 0x07, lambda received: len(received) == 3, frame_timeout=0.01
+            )
+
+        assert received == frames
+        assert session._pending == []
+
+    async def test_late_response_dropped(self):
+        """Test a late frame of a known opcode doesn't answer an unrelated request."""
+        client = FakeClient({b"\x01": [], b"\x0d": [COUNT, STATUS]})
+        unsolicited = MagicMock()
+
+        async with VivosunThermoSession(
+            client.mock, "command", "status", unsolicited=unsolicited
+        ) as session:
+            with pytest.raises(TimeoutError):
+                await session.request(b"\x01", opcode=0x01, timeout=0.01)
+            assert await session.request(b"\x0d") == STATUS
+
+        unsolicited.assert_not_called()
+
+    async def test_unsolicited_and_duplicate_frames(self):
+        """Test frames no request asked for, including duplicates, go to the callback."""
+        client = FakeClient({b"\x0d": [STATUS, STATUS]})
+        unsolicited = MagicMock()
+
+        async with VivosunThermoSession(
+            client.mock, "command", "status", unsolicited=unsolicited
+        ) as session:
+            assert await session.request(b"\x0d") == STATUS
+            await sleep(0)
+
+        unsolicited.assert_called_once_with(None, STATUS)
+
+    async def test_abort_fails_pending(self):
+        """Test aborting a session fails pending requests right away."""
+        client = FakeClient()
+        session = VivosunThermoSession(client.mock, "command", "status")
+        await session.start()
+
+        request = get_running_loop().create_task(session.request(b"\x0d", timeout=10))
+        await sleep(0)
+        session.abort()
+
+        with pytest.raises(BleakError):
+            await request
+
+    async def test_abort_fails_pending_stream(self):
+        """Test aborting a session fails a pending stream instead of returning its frames."""
+        client = FakeClient()
+        session = VivosunThermoSession(client.mock, "command", "status")
+        await session.start()
+
+        stream = get_running_loop().create_task(
+            session.request_stream(b"\x07", 0x07, lambda received: False, frame_timeout=10)
+        )
+        await sleep(0)
+        session.abort()
+
+        with pytest.raises(BleakError):
+            await stream
+
+    async def test_close_after_disconnect(self):
+        """Test closing skips unsubscribing from a dropped connection."""
+        client = FakeClient()
+        session = VivosunThermoSession(client.mock, "command", "status")
+        await session.start()
+        client.mock.is_connected = False
+
+        await session.close()
+
+        client.mock.stop_notify.assert_not_called()
+
+    async def test_close_ignores_unsubscribe_failure(self):
+        """Test a failed unsubscribe doesn't hide the result of the session."""
+        client = FakeClient({b"\x0d": [STATUS]})
+        client.mock.stop_notify.side_effect = BleakError("Not connected")
+
+        async with VivosunThermoSession(client.mock, "command", "status") as session:
+            data = await session.request(b"\x0d")
+
+        assert data == STATUS
@@ -0,0 +1,207 @@
+"""Tests for vivosun_thermo against the simulated device."""
+
+from asyncio import gather
+from unittest.mock import patch
+
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.vivosun_thermo.const import (
+    ACQUISITION_MODE_PERSISTENT,
+    ACQUISITION_MODE_POLL,
+    CONF_ACQUISITION_MODE,
+    CONF_READ_TIMEOUT,
+)
+from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
+
+from .simulator import Faults, SimulatedDevice, Trace
+
+POLL = {CONF_ACQUISITION_MODE: ACQUISITION_MODE_POLL}
+_MONOTONIC = "custom_components.vivosun_thermo.coordinator.monotonic"
+PERSISTENT = {CONF_ACQUISITION_MODE: ACQUISITION_MODE_PERSISTENT}
+
+
+class TestSimulatedDevice:
+    """Test coordinator with simulated device."""
+
+    async def test_trace(self):
+        """Test traces follow the day cycle."""
+        device = SimulatedDevice(temperature=Trace(20.0, 5.0), clock=lambda: 21600.0)
+
+        data = VivosunThermoSensorCoordinator._decode_raw_data(device.status_frame())
+
+        assert data["main"]["temperature_c"] == 25.0
+        assert data["external"] is None
+
+    async def test_polled_read(self, hass, config_entry_data, simulated_device):
+        """Test polled read of both probes."""
+        simulated_device.external_temperature = Trace(18.0, 1.0)
+        simulated_device.external_humidity = Trace(70.0, 5.0)
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data, POLL)
+        data = await coordinator._read_sensor_data()
+
+        assert 20.0 < data["main"]["temperature_c"] < 28.0
+        assert 40.0 < data["main"]["humidity"] < 80.0
+        assert 16.0 < data["external"]["temperature_c"] < 20.0
+        assert simulated_device.active_connections == 0
+
+    async def test_polled_read_with_latency(self, hass, config_entry_data, simulated_device):
+        """Test notification latency within read timeout."""
+        simulated_device.faults = Faults(latency=0.05, connect_latency=0.05)
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data, POLL)
+        data = await coordinator._read_sensor_data()
+
+        assert data["main"]["temperature_c"] is not None
+
+    async def test_lost_notification(self, hass, config_entry_data, simulated_device):
+        """Test lost notification fails the update."""
+        simulated_device.faults = Faults(loss=1.0)
+
+        coordinator = VivosunThermoSensorCoordinator(
+            hass, config_entry_data, {**POLL, CONF_READ_TIMEOUT: 0.05}
+        )
+        with pytest.raises(UpdateFailed):
+            await coordinator._read_sensor_data()
+
+    async def test_connect_failure(self, hass, config_entry_data, simulated_device):
+        """Test failed connection fails the update."""
+        simulated_device.faults = Faults(connect_failure=1.0)
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data, POLL)
+        with pytest.raises(UpdateFailed):
+            await coordinator._read_sensor_data()
+
+    async def test_persistent_duplicate_notifications(
+        self, hass, config_entry_data, simulated_device
+    ):
+        """Test duplicate notifications are published without failing reads."""
+        simulated_device.faults = Faults(duplicate=1.0)
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data, PERSISTENT)
+        for _ in range(3):
+            await coordinator._read_sensor_data()
+
+        assert simulated_device.connections == 1
+        assert simulated_device.notifications == 6
+
+    async def test_persistent_disconnect(self, hass, config_entry_data, simulated_device):
+        """Test dropped link reconnects on next read."""
+        hass.async_create_task.side_effect = lambda coro: coro.close()
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data, PERSISTENT)
+        await coordinator._read_sensor_data()
+
+        simulated_device.clients[0].simulate_disconnect()
+        hass.async_create_task.assert_called_once()
+        await coordinator._read_sensor_data()
+
+        assert simulated_device.connections == 2
+        assert simulated_device.active_connections == 1
+
+    async def test_disconnect_during_write(self, hass, config_entry_data, simulated_device):
+        """Test link dropping during write fails the update."""
+        hass.async_create_task.side_effect = lambda coro: coro.close()
+        simulated_device.faults = Faults(disconnect=1.0)
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data, PERSISTENT)
+        with pytest.raises(UpdateFailed):
+            await coordinator._read_sensor_data()
+
+    async def test_many_devices(self, hass, config_entry_data, mock_establish_connection):
+        """Test many simulated devices share connection slots."""
+        devices = {}
+        peak = 0
+
+        async def establish_connection(client_class, device, name, **kwargs):
+            nonlocal peak
+            client = await devices[name].establish_connection(client_class, device, name, **kwargs)
+            # All devices are reached through the single local source
+            peak = max(peak, sum(device.active_connections for device in devices.values()))
+            return client
+
+        mock_establish_connection.side_effect = establish_connection
+
+        coordinators = []
+        for index in range(100):
+            data = {**config_entry_data, "name": f"Device {index}"}
+            devices[data["name"]] = SimulatedDevice(
+                seed=index, faults=Faults(latency=0.001, connect_latency=0.001)
+            )
+            coordinators.append(VivosunThermoSensorCoordinator(hass, data, POLL))
+
+        results = await gather(*(coordinator._read_sensor_data() for coordinator in coordinators))
+
+        assert len(results) == 100
+        assert all(device.connections == 1 for device in devices.values())
+        scheduler = hass.data["vivosun_thermo"]["scheduler"]
+        assert scheduler.stats()["local"]["jobs"] == 100
+        assert peak <= scheduler.max_connections
+
+    async def test_staggered_polls(self, hass, config_entry_data, mock_establish_connection):
+        """Test devices set up together don't keep polling all at once."""
+        devices = {}
+
+        async def establish_connection(client_class, device, name, **kwargs):
+            return await devices[name].establish_connection(client_class, device, name, **kwargs)
+
+        mock_establish_connection.side_effect = establish_connection
+
+        coordinators = []
+        for index in range(100):
+            data = {
+                **config_entry_data,
+                "name": f"Device {index}",
+                "discovery_address": f"AA:BB:CC:DD:EE:{index:02X}",
+            }
+            devices[data["name"]] = SimulatedDevice(seed=index)
+            coordinators.append(VivosunThermoSensorCoordinator(hass, data, POLL))
+
+        # All of them read at startup, next polls follow their update intervals
+        with patch(_MONOTONIC, return_value=0.0):
+            await gather(*(coordinator._read_sensor_data() for coordinator in coordinators))
+
+        def peak_connections(starts, duration=2.0):
+            return max(
+                sum(start <= other < start + duration for other in starts) for start in starts
+            )
+
+        unstaggered = [coordinator.adaptive_interval.interval for coordinator in coordinators]
+        staggered = [coordinator.update_interval.total_seconds() for coordinator in coordinators]
+
+        assert peak_connections(unstaggered) == 100
+        assert peak_connections(staggered) <= 15
+        assert all(30 <= start < 90 for start in staggered)
+
+    @pytest.mark.parametrize("options", [POLL, PERSISTENT])
+    async def test_concurrent_refreshes_single_transaction(
+        self, hass, config_entry_data, simulated_device, options
+    ):
+        """Test simultaneous refresh requests share one BLE transaction."""
+        simulated_device.faults = Faults(latency=0.01, connect_latency=0.01)
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data, options)
+        results = await gather(*(coordinator.async_request_refresh() for _ in range(10)))
+
+        assert len(results) == 10
+        assert simulated_device.connections == 1
+        assert simulated_device.commands == [bytes([0x0D])]
+        assert coordinator.data["main"]["temperature_c"] is not None
+
+    async def test_sequential_refreshes_read_again(self, hass, config_entry_data, simulated_device):
+        """Test a refresh after the read in flight finished starts a new transaction."""
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data, POLL)
+        await coordinator._read_sensor_data()
+        await coordinator._read_sensor_data()
+
+        assert simulated_device.connections == 2
+
+    async def test_polled_duplicate_notifications(self, hass, config_entry_data, simulated_device):
+        """Test repeated notifications don't fail a polled read."""
+        simulated_device.faults = Faults(duplicate=1.0)
+
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data, POLL)
+        data = await coordinator._read_sensor_data()
+
+        assert data["main"]["temperature_c"] is not None
+        assert simulated_device.notifications == 2
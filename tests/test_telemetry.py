@@ -0,0 +1,156 @@
+"""Tests for vivosun_thermo telemetry."""
+
+from asyncio import TimeoutError as AsyncTimeoutError
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.vivosun_thermo.coordinator import VivosunThermoSensorCoordinator
+from custom_components.vivosun_thermo.telemetry import PhaseStats, VivosunThermoTelemetry
+
+
+class TestPhaseStats:
+    """Test PhaseStats."""
+
+    async def test_record(self):
+        """Test counters, percentiles and histogram."""
+        stats = PhaseStats()
+        for duration in (0.005, 0.02, 0.3, 2.0):
+            stats.record(duration, False)
+        stats.record(60.0, True)
+
+        assert stats.count == 5
+        assert stats.failures == 1
+        assert stats.last == 60.0
+        assert stats.failure_rate == 0.2
+        assert stats.percentile(50) == 0.3
+        assert stats.percentile(100) == 60.0
+        histogram = stats.histogram
+        assert histogram["le_0.01"] == 1
+        assert histogram["le_0.025"] == 1
+        assert histogram["le_0.5"] == 1
+        assert histogram["le_2.5"] == 1
+        assert histogram["inf"] == 1
+
+    async def test_rolling_window(self):
+        """Test old samples leave the histogram and failure rate."""
+        stats = PhaseStats(window_size=3)
+        stats.record(20.0, True)
+        for _ in range(3):
+            stats.record(0.1, False)
+
+        assert stats.count == 4
+        assert stats.failures == 1
+        assert stats.failure_rate == 0
+        assert sum(stats.histogram.values()) == 3
+        assert stats.histogram["le_0.1"] == 3
+
+    async def test_empty(self):
+        """Test empty stats."""
+        stats = PhaseStats()
+
+        assert stats.failure_rate is None
+        assert stats.percentile(50) is None
+
+
+class TestVivosunThermoTelemetry:
+    """Test VivosunThermoTelemetry."""
+
+    async def test_phase_records_failure(self):
+        """Test failed phase is recorded and exception propagates."""
+        telemetry = VivosunThermoTelemetry()
+
+        with telemetry.phase("cycle"):
+            pass
+        with pytest.raises(ValueError), telemetry.phase("cycle"):
+            raise ValueError()
+
+        assert telemetry.failure_rate == 50
+        assert telemetry.cycle_time is not None
+        assert telemetry.connect_time is None
+
+    async def test_polled_read_phases(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test polled read records every phase."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        await coordinator._read_sensor_data()
+
+        assert set(coordinator.telemetry.phases) == {
+            "cycle",
+            "connect",
+            "services",
+            "subscribe",
+            "write",
+            "notify",
+        }
+        assert coordinator.telemetry.source == "local"
+        assert coordinator.telemetry.rssi == -60
+
+    async def test_failed_read_phases(self, hass, config_entry_data, mock_bleak_client):
+        """Test failed command write is attributed to its phase."""
+        mock_bleak_client.write_gatt_char = AsyncMock(side_effect=AsyncTimeoutError())
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._read_sensor_data()
+
+        phases = coordinator.telemetry.phases
+        assert phases["write"].failures == 1
+        assert phases["cycle"].failures == 1
+        assert phases["connect"].failures == 0
+        assert coordinator.telemetry.failure_rate == 100
+
+    async def test_traces_bounded(self):
+        """Test frames, cycles and errors keep only the most recent entries."""
+        telemetry = VivosunThermoTelemetry(trace_size=2)
+        for index in range(5):
+            telemetry.record_frame("status", bytes([index]), None)
+            with pytest.raises(ValueError), telemetry.phase("cycle"), telemetry.phase("write"):
+                raise ValueError(index)
+
+        assert [frame["hex"] for frame in telemetry.frames] == ["03", "04"]
+        assert len(telemetry.cycles) == 2
+        assert [error["error"] for error in telemetry.errors] == ["ValueError(3)", "ValueError(4)"]
+        assert telemetry.errors[-1]["phase"] == "write"
+        assert telemetry.cycles[-1]["failed_phase"] == "write"
+
+    async def test_cycle_trace(
+        self, hass, config_entry_data, mock_bleak_client, valid_sensor_data_main_only
+    ):
+        """Test poll records raw frame, decode result and phase timings."""
+        mock_bleak_client.responses = [valid_sensor_data_main_only]
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        await coordinator._read_sensor_data()
+
+        telemetry = coordinator.telemetry.as_dict()
+        frame = telemetry["recent_frames"][0]
+        assert frame["hex"] == valid_sensor_data_main_only.hex()
+        assert frame["decoded"]["main"]["temperature_c"] == 22.5
+        cycle = telemetry["recent_cycles"][0]
+        assert cycle["source"] == "local"
+        assert set(cycle["phases"]) == {
+            "cycle",
+            "connect",
+            "services",
+            "subscribe",
+            "write",
+            "notify",
+        }
+        assert "failed_phase" not in cycle
+        assert telemetry["sources"] == {"local": 1}
+        assert telemetry["recent_errors"] == []
+
+    async def test_unreachable_error_recorded(self, hass, config_entry_data, mock_bluetooth):
+        """Test errors outside of device phases are attributed to the cycle."""
+        mock_bluetooth.return_value = []
+        coordinator = VivosunThermoSensorCoordinator(hass, config_entry_data)
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._read_sensor_data()
+
+        assert coordinator.telemetry.errors[0]["phase"] == "cycle"